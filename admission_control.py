@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Admission Control for MRU Voice Chatbot
+=======================================
+
+Bounds the work the chatbot accepts when serving many users at once.
+
+- Each pipeline stage (classify, generate, speak) sits behind a bounded
+  request queue served by a fixed number of worker threads
+- Every session has a token-bucket rate limit
+- When a queue is past its shed threshold, or a stage does not answer in
+  time, the request is shed: the user gets a cheap pre-rendered general or
+  contact answer instead of waiting in line
+- Sessions idle for `session_ttl` seconds are forgotten, and at most
+  `max_sessions` are tracked (least recently seen evicted first), so a
+  flood of one-off session ids cannot grow memory without bound
+- Queue depth, processed and shed counts are exposed as metrics
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+from chatbot_logging import get_logger
+
+logger = get_logger("admission")
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+
+class StageOverloaded(Exception):
+    """Raised when a stage's queue is past its shed threshold"""
+
+
+class BoundedStage:
+    """A pipeline stage with a bounded queue and its own worker threads"""
+
+    def __init__(self, name: str, func: Callable, workers: int = 2,
+                 max_queue: int = 64, shed_threshold: Optional[int] = None):
+        self.name = name
+        self.func = func
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.shed_threshold = shed_threshold if shed_threshold is not None else max_queue
+        self.processed = 0
+        self.shed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.max_depth_seen = 0
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"{name}-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def submit(self, *args) -> Future:
+        """Enqueue a call; raises StageOverloaded instead of queueing past the threshold"""
+        future = Future()
+        with self._lock:
+            depth = self.queue.qsize()
+            if depth >= self.shed_threshold:
+                self.shed += 1
+                raise StageOverloaded(self.name)
+            try:
+                self.queue.put_nowait((future, args))
+            except queue.Full:
+                self.shed += 1
+                raise StageOverloaded(self.name)
+            self.max_depth_seen = max(self.max_depth_seen, depth + 1)
+        return future
+
+    def call(self, *args, timeout: Optional[float] = None):
+        """Submit and wait; a stage that misses its timeout counts as shed"""
+        future = self.submit(*args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+                self.shed += 1
+            raise StageOverloaded(self.name)
+
+    def _worker(self):
+        while True:
+            future, args = self.queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.func(*args))
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                future.set_exception(e)
+            with self._lock:
+                self.processed += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "max_queue_depth": self.max_depth_seen,
+                "processed": self.processed,
+                "shed": self.shed,
+                "timeouts": self.timeouts,
+                "errors": self.errors
+            }
+
+
+class AdmissionController:
+    """Serves chatbot turns through bounded stages with rate limits and load shedding"""
+
+    def __init__(self, chatbot, stage_workers: int = 2, max_queue: int = 64,
+                 shed_threshold: int = 32, stage_timeout: float = 2.0,
+                 session_rate: float = 1.0, session_burst: float = 5.0,
+                 session_ttl: float = 1800.0, max_sessions: int = 10000):
+        self.chatbot = chatbot
+        self.engine = chatbot.engine
+        self.stage_timeout = stage_timeout
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        # Least recently seen first; a bucket's `updated` is when its session was last seen
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        # One SessionContext per user; the engine itself is shared by all stage workers
+        self.sessions: Dict[str, object] = {}
+        self._buckets_lock = threading.Lock()
+        self.rate_limited = 0
+        self.sessions_evicted = 0
+
+        # Pre-render the cheap answers served while shedding load; the generator's
+        # render cache keeps them current across knowledge-base edits
+        for intent in ("general_info", "contact"):
+            self.engine.response_generator.render_response(intent, "default")
+
+        self.stages = {
+            "classify": BoundedStage("classify", self.engine.intent_classifier.classify_intent,
+                                     stage_workers, max_queue, shed_threshold),
+            "generate": BoundedStage("generate", self._generate,
+                                     stage_workers, max_queue, shed_threshold)
+        }
+        if getattr(chatbot, "voice_enabled", False):
+            self.stages["speak"] = BoundedStage("speak", chatbot.voice_handler.speak,
+                                                1, max_queue, shed_threshold)
+
+    def _client(self, session_id: str) -> Tuple[TokenBucket, object]:
+        """Rate limiter and SessionContext of a session, evicting idle sessions on the way"""
+        with self._buckets_lock:
+            # Before the lookup: a session back from a long silence starts afresh
+            self._evict(time.monotonic(), room=0 if session_id in self._buckets else 1)
+            bucket = self._buckets.get(session_id)
+            if bucket is None:
+                bucket = TokenBucket(self.session_rate, self.session_burst)
+                self._buckets[session_id] = bucket
+                self.sessions[session_id] = self.engine.new_session(session_id)
+            else:
+                self._buckets.move_to_end(session_id)
+            return bucket, self.sessions[session_id]
+
+    def _evict(self, now: float, room: int = 0):
+        """Drop sessions idle past the TTL, then the least recently seen beyond max_sessions - room"""
+        while self._buckets:
+            session_id, oldest = next(iter(self._buckets.items()))
+            if len(self._buckets) + room <= self.max_sessions and now - oldest.updated < self.session_ttl:
+                return
+            del self._buckets[session_id]
+            del self.sessions[session_id]
+            self.sessions_evicted += 1
+
+    def _generate(self, intent: str, user_input: str, session) -> Tuple[str, Tuple[str, str]]:
+        """Generate stage body; leaves the session untouched so a timed-out call cannot add a turn"""
+        return self.engine.response_generator.generate_keyed_response(
+            intent, user_input, session, record_context=False)
+
+    def fallback_response(self, intent: Optional[str]) -> str:
+        """Cached answer used instead of queueing behind an overloaded stage"""
+        template_key = "contact" if intent == "contact" else "general_info"
+        return self.engine.response_generator.render_response(template_key, "default")
+
+    def handle(self, session_id: str, user_input: str) -> str:
+        """Answer one turn, shedding load rather than queueing without bound"""
+        bucket, session = self._client(session_id)
+        if not bucket.try_acquire():
+            with self._buckets_lock:
+                self.rate_limited += 1
+            return "You're sending messages a little too quickly. Please wait a moment and try again."
+
+        intent = None
+        try:
+            intent = self.stages["classify"].call(user_input, timeout=self.stage_timeout)
+            response, response_key = self.stages["generate"].call(intent, user_input, session, timeout=self.stage_timeout)
+        except StageOverloaded:
+            response = self.fallback_response(intent)
+            response_key = ("contact" if intent == "contact" else "general_info", "default")
+            intent = intent or "general_info"
+
+        # Recorded here, once per answered turn, rather than by a stage worker
+        # that may still be running after its caller gave up on it
+        session.conversation_context.append({"user": user_input, "intent": intent})
+        session.conversation_manager.add_interaction(user_input, response, intent, response_key)
+
+        speak_stage = self.stages.get("speak")
+        if speak_stage is not None:
+            try:
+                # Fire and forget: a backed-up speaker must not block the next turn
+                speak_stage.submit(response)
+            except StageOverloaded:
+                # The caller still gets the text; only speaking it is shed
+                logger.info("Speak stage overloaded, answer not spoken", extra={"session": session_id})
+        return response
+
+    def metrics(self) -> dict:
+        """Queue depth and shed counts per stage, for capacity planning"""
+        stages = {name: stage.metrics() for name, stage in self.stages.items()}
+        return {
+            "stages": stages,
+            "rate_limited": self.rate_limited,
+            "shed_total": sum(stage["shed"] for stage in stages.values()),
+            "sessions_tracked": len(self._buckets),
+            "sessions_evicted": self.sessions_evicted
+        }
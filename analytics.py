@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Offline Conversation Analytics for MRU Voice Chatbot
+====================================================
+
+Aggregates the interaction logs written with `--interaction-log` (one JSON
+line per answered turn) across all traffic:
+
+- Daily intent mix and fallback (general_info) rate
+- Peak hours (hour-of-day and weekday x hour histograms)
+- Latency and query-length distributions
+- Most repeated questions
+
+Logs are streamed in fixed-size chunks into NumPy arrays (intent codes,
+timestamps, lengths, latencies, query hashes) and folded into running
+aggregates with vectorized group-bys, so memory stays bounded no matter
+how many millions of turns are read.
+
+Usage:
+    python analytics.py interactions.jsonl [more.jsonl.gz ...] [--utc-offset 5.5] [--json]
+"""
+
+import argparse
+import gzip
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+FALLBACK_INTENT = "general_info"
+
+# Log-spaced latency buckets (ms); percentiles are read off the histogram
+LATENCY_EDGES_MS = np.concatenate([[0.0], np.logspace(-3, 5, 161)])
+LENGTH_EDGES = np.array([0, 5, 10, 20, 40, 80, 160, 320, 640, 1e9])
+
+
+class Chunk:
+    """Column arrays for up to chunk_size log lines"""
+
+    def __init__(self, intents: np.ndarray, timestamps: np.ndarray, lengths: np.ndarray,
+                 latencies: np.ndarray, query_hashes: np.ndarray, queries: List[str]):
+        self.intents = intents
+        self.timestamps = timestamps
+        self.lengths = lengths
+        self.latencies = latencies
+        self.query_hashes = query_hashes
+        self.queries = queries
+
+
+def open_log(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def read_chunks(paths: List[str], intent_codes: Dict[str, int], chunk_size: int = 100_000) -> Iterator[Chunk]:
+    """Stream log files as column chunks; unknown intents get new codes"""
+    intents = np.empty(chunk_size, dtype=np.int16)
+    timestamps = np.empty(chunk_size, dtype=np.float64)
+    lengths = np.empty(chunk_size, dtype=np.int32)
+    latencies = np.empty(chunk_size, dtype=np.float32)
+    query_hashes = np.empty(chunk_size, dtype=np.uint32)
+    queries: List[str] = []
+    n = 0
+
+    def flush():
+        return Chunk(intents[:n].copy(), timestamps[:n].copy(), lengths[:n].copy(),
+                     latencies[:n].copy(), query_hashes[:n].copy(), queries)
+
+    for path in paths:
+        with open_log(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                intent = record.get("intent", FALLBACK_INTENT)
+                code = intent_codes.get(intent)
+                if code is None:
+                    code = intent_codes[intent] = len(intent_codes)
+                query = record.get("query", "")
+
+                intents[n] = code
+                timestamps[n] = record.get("ts", 0.0)
+                lengths[n] = record.get("chars", len(query))
+                latencies[n] = record.get("latency_ms", np.nan)
+                query_hashes[n] = zlib.crc32(query.encode("utf-8"))
+                queries.append(query)
+                n += 1
+
+                if n == chunk_size:
+                    yield flush()
+                    queries = []
+                    n = 0
+    if n:
+        yield flush()
+
+
+class ConversationAnalytics:
+    """Running aggregates over streamed chunks (memory independent of log size)"""
+
+    def __init__(self, utc_offset_hours: float = 5.5, max_tracked_queries: int = 10_000):
+        self.utc_offset = utc_offset_hours * 3600
+        self.max_tracked_queries = max_tracked_queries
+        self.intent_codes: Dict[str, int] = {}
+        self.total = 0
+        self.daily: Dict[int, np.ndarray] = {}  # day number -> counts per intent code
+        self.hour_hist = np.zeros(24, dtype=np.int64)
+        self.weekday_hour = np.zeros((7, 24), dtype=np.int64)
+        self.latency_hist = np.zeros(len(LATENCY_EDGES_MS) - 1, dtype=np.int64)
+        self.length_hist = np.zeros(len(LENGTH_EDGES) - 1, dtype=np.int64)
+        self.query_counts: Dict[int, int] = {}
+        self.query_samples: Dict[int, str] = {}
+
+    def add(self, chunk: Chunk):
+        n = len(chunk.intents)
+        if n == 0:
+            return
+        self.total += n
+        local = chunk.timestamps + self.utc_offset
+        days = np.floor_divide(local, 86400).astype(np.int64)
+        hours = (np.floor_divide(local, 3600) % 24).astype(np.int64)
+        # 1970-01-01 was a Thursday; shift so Monday is 0
+        weekdays = (days + 3) % 7
+
+        # Group by (day, intent) with one unique() over a combined key
+        width = max(len(self.intent_codes), 1)
+        keys, counts = np.unique(days * width + chunk.intents, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            day, code = divmod(key, width)
+            row = self.daily.get(day)
+            if row is None or len(row) < width:
+                grown = np.zeros(width, dtype=np.int64)
+                if row is not None:
+                    grown[:len(row)] = row
+                row = self.daily[day] = grown
+            row[code] += count
+
+        self.hour_hist += np.bincount(hours, minlength=24)
+        self.weekday_hour += np.bincount(weekdays * 24 + hours, minlength=7 * 24).reshape(7, 24)
+        valid = chunk.latencies[~np.isnan(chunk.latencies)]
+        self.latency_hist += np.histogram(valid, bins=LATENCY_EDGES_MS)[0]
+        self.length_hist += np.histogram(chunk.lengths, bins=LENGTH_EDGES)[0]
+        self._count_queries(chunk)
+
+    def _count_queries(self, chunk: Chunk):
+        """Approximate heavy-hitter counting: past the cap, queries below the k-th largest count are dropped"""
+        hashes, first_index, counts = np.unique(chunk.query_hashes, return_index=True, return_counts=True)
+        for query_hash, index, count in zip(hashes.tolist(), first_index.tolist(), counts.tolist()):
+            if query_hash in self.query_counts:
+                self.query_counts[query_hash] += count
+            else:
+                self.query_counts[query_hash] = count
+                self.query_samples[query_hash] = chunk.queries[index]
+
+        if len(self.query_counts) > self.max_tracked_queries:
+            # Drop everything below the k-th largest count to stay bounded
+            values = np.fromiter(self.query_counts.values(), dtype=np.int64)
+            cutoff = np.partition(values, -self.max_tracked_queries)[-self.max_tracked_queries]
+            for query_hash in [h for h, c in self.query_counts.items() if c < cutoff]:
+                del self.query_counts[query_hash]
+                del self.query_samples[query_hash]
+
+    def latency_percentile(self, pct: float) -> float:
+        total = self.latency_hist.sum()
+        if total == 0:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.latency_hist), pct / 100 * total))
+        return float(LATENCY_EDGES_MS[min(bucket + 1, len(LATENCY_EDGES_MS) - 1)])
+
+    def report(self, top_queries: int = 10) -> dict:
+        names = sorted(self.intent_codes, key=self.intent_codes.get)
+        fallback_code = self.intent_codes.get(FALLBACK_INTENT)
+        daily = []
+        for day in sorted(self.daily):
+            counts = self.daily[day]
+            day_total = int(counts.sum())
+            fallback = int(counts[fallback_code]) if fallback_code is not None and fallback_code < len(counts) else 0
+            daily.append({
+                "date": datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d"),
+                "turns": day_total,
+                "fallback_rate": fallback / day_total if day_total else 0.0,
+                "intent_mix": {names[code]: int(c) for code, c in enumerate(counts) if c}
+            })
+        repeated = sorted(self.query_counts.items(), key=lambda item: -item[1])[:top_queries]
+        return {
+            "turns": self.total,
+            "daily": daily,
+            "peak_hours": [int(h) for h in np.argsort(-self.hour_hist, kind="stable")[:3] if self.hour_hist[h] > 0],
+            "hourly_turns": self.hour_hist.tolist(),
+            "weekday_hour_turns": self.weekday_hour.tolist(),
+            "latency_ms": {f"p{p}": self.latency_percentile(p) for p in (50, 90, 99)},
+            "query_length_histogram": {
+                f"{int(LENGTH_EDGES[i])}-{int(LENGTH_EDGES[i + 1]) if LENGTH_EDGES[i + 1] < 1e9 else ''}": int(c)
+                for i, c in enumerate(self.length_hist)
+            },
+            "repeated_questions": [
+                {"query": self.query_samples[h], "count": c} for h, c in repeated if c > 1
+            ]
+        }
+
+
+def analyze(paths: List[str], chunk_size: int = 100_000, utc_offset_hours: float = 5.5) -> ConversationAnalytics:
+    analytics = ConversationAnalytics(utc_offset_hours)
+    for chunk in read_chunks(paths, analytics.intent_codes, chunk_size):
+        analytics.add(chunk)
+    return analytics
+
+
+def print_report(report: dict):
+    print(f"\n📊 {report['turns']} turns analysed")
+    print("\n📅 Daily intent mix")
+    for day in report["daily"]:
+        mix = ", ".join(f"{intent} {count / day['turns']:.0%}" for intent, count
+                        in sorted(day["intent_mix"].items(), key=lambda item: -item[1]))
+        print(f"• {day['date']}: {day['turns']} turns, fallback {day['fallback_rate']:.1%} | {mix}")
+    print(f"\n⏰ Peak hours: {', '.join(f'{h:02d}:00' for h in report['peak_hours'])}")
+    latency = report["latency_ms"]
+    print(f"⏱️ Latency p50/p90/p99: {latency['p50']:.3f} / {latency['p90']:.3f} / {latency['p99']:.3f} ms")
+    print("\n🔁 Most repeated questions")
+    for item in report["repeated_questions"]:
+        print(f"• {item['count']:>6}  {item['query']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate MRU chatbot interaction logs")
+    parser.add_argument("logs", nargs="+", help="Interaction log files (.jsonl or .jsonl.gz)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--utc-offset", type=float, default=5.5, help="Local time offset in hours (IST = 5.5)")
+    parser.add_argument("--top", type=int, default=10, help="Repeated questions to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = analyze(args.logs, args.chunk_size, args.utc_offset).report(args.top)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Spoken-Query Transcript Cache for MRU Voice Chatbot
+===================================================
+
+Kiosks hear the same few phrases all day ("admission process", "hostel
+fees"). This cache remembers what the recognizer said for an utterance and
+answers near-identical utterances without another recognition round trip.
+
+- Fingerprint: silence-trimmed PCM -> log energies in 16 spectral bands
+  over 32 time slots -> one bit per slot and adjacent band pair: is the
+  lower band louder (480 bits). Independent of gain, tolerant of background
+  noise, padding and small tempo changes; compared by Hamming similarity.
+- Only transcripts the recognizer was confident about are stored
+- LRU eviction at a fixed capacity; hit-rate metrics for tuning
+
+Fixtures are WAV files named `<phrase>__<take>.wav`; takes of the same
+phrase should hit each other, different phrases must not.
+
+Usage:
+    python audio_cache.py make-fixtures fixtures/      # synthetic takes
+    python audio_cache.py evaluate fixtures/ [--min-similarity 0.75]
+"""
+
+import argparse
+import os
+import time
+import wave
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_preprocess import pcm_view
+from chatbot_logging import get_logger
+
+logger = get_logger("audio_cache")
+
+BANDS = 16
+TIME_SLOTS = 32
+BAND_RANGE_HZ = (200.0, 4000.0)
+FINGERPRINT_BITS = TIME_SLOTS * (BANDS - 1)
+
+
+def pcm_samples(raw: bytes, sample_width: int) -> np.ndarray:
+    """Signed PCM bytes as a float32 array in [-1, 1)"""
+    samples, full_scale = pcm_view(raw, sample_width)
+    if sample_width == 1:
+        samples = samples.astype(np.float32) - 128  # unsigned 8-bit
+    return np.multiply(samples, 1.0 / full_scale, dtype=np.float32)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold: float = 0.05) -> np.ndarray:
+    """Drop leading/trailing 20 ms frames quieter than threshold x the loudest frame"""
+    frame = max(1, sample_rate // 50)
+    count = len(samples) // frame
+    if count == 0:
+        return samples
+    rms = np.sqrt(np.mean(samples[:count * frame].reshape(count, frame) ** 2, axis=1))
+    active = np.flatnonzero(rms >= rms.max() * threshold)
+    if len(active) == 0:
+        return samples[:0]
+    return samples[active[0] * frame:(active[-1] + 1) * frame]
+
+
+def band_energies(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Log energy per (time slot, band), time axis stretched to TIME_SLOTS"""
+    n_fft = 1 << int(np.ceil(np.log2(sample_rate * 0.032)))
+    hop = n_fft // 2
+    if len(samples) < n_fft:
+        samples = np.pad(samples, (0, n_fft - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, n_fft)[::hop]
+    power = np.abs(np.fft.rfft(frames * np.hanning(n_fft).astype(np.float32), axis=1)) ** 2
+
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = np.geomspace(BAND_RANGE_HZ[0], min(BAND_RANGE_HZ[1], sample_rate / 2), BANDS + 1)
+    bins = np.searchsorted(freqs, edges)
+    bins = np.maximum(bins, np.arange(len(bins)) + bins[0])  # every band gets >= 1 bin
+    energies = np.log(np.add.reduceat(power, bins[:-1], axis=1) + 1e-10)
+
+    positions = np.linspace(0, len(energies) - 1, TIME_SLOTS)
+    index = np.arange(len(energies))
+    return np.stack([np.interp(positions, index, energies[:, b]) for b in range(BANDS)], axis=1)
+
+
+def fingerprint(raw: bytes, sample_rate: int, sample_width: int) -> Tuple[np.ndarray, float]:
+    """Return (packed fingerprint bits, speech duration in seconds)"""
+    samples = trim_silence(pcm_samples(raw, sample_width), sample_rate)
+    duration = len(samples) / sample_rate
+    if len(samples) == 0:
+        return np.zeros((FINGERPRINT_BITS + 7) // 8, dtype=np.uint8), 0.0
+    energies = band_energies(samples, sample_rate)
+    # Spectral tilt between neighbouring bands: unaffected by overall level
+    bits = energies[:, :-1] > energies[:, 1:]
+    return np.packbits(bits.ravel()), duration
+
+
+# Number of set bits for every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+class TranscriptCache:
+    """LRU cache of recognizer transcripts keyed by audio fingerprint"""
+
+    def __init__(self, capacity: int = 256, min_similarity: float = 0.75,
+                 min_confidence: float = 0.8, max_duration_ratio: float = 1.25):
+        self.capacity = capacity
+        self.min_similarity = min_similarity
+        self.min_confidence = min_confidence
+        self.max_duration_ratio = max_duration_ratio
+        # Fingerprints live in one array so a lookup is a single vectorized XOR
+        self.fingerprints = np.zeros((capacity, (FINGERPRINT_BITS + 7) // 8), dtype=np.uint8)
+        self.durations = np.zeros(capacity, dtype=np.float32)
+        self.entries: "OrderedDict[int, dict]" = OrderedDict()  # slot -> entry, oldest first
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.metrics = {"lookups": 0, "hits": 0, "misses": 0, "stored": 0,
+                        "rejected_low_confidence": 0, "evictions": 0, "seconds_saved": 0.0}
+
+    def lookup(self, raw: bytes, sample_rate: int, sample_width: int) -> Optional[str]:
+        """Cached transcript for a near-identical utterance, else None"""
+        return self.lookup_fingerprint(fingerprint(raw, sample_rate, sample_width))
+
+    def lookup_fingerprint(self, key: Tuple[np.ndarray, float]) -> Optional[str]:
+        bits, duration = key
+        self.metrics["lookups"] += 1
+        slot, similarity = self._nearest(bits, duration)
+        if slot is None or similarity < self.min_similarity:
+            self.metrics["misses"] += 1
+            return None
+
+        entry = self.entries[slot]
+        self.entries.move_to_end(slot)
+        entry["hits"] += 1
+        self.metrics["hits"] += 1
+        self.metrics["seconds_saved"] += entry["recognition_seconds"]
+        logger.debug("Transcript cache hit", extra={"similarity": round(similarity, 3)})
+        return entry["text"]
+
+    def _nearest(self, bits: np.ndarray, duration: float) -> Tuple[Optional[int], float]:
+        if not self.entries or duration == 0:
+            return None, 0.0
+        slots = np.fromiter(self.entries.keys(), dtype=np.int64, count=len(self.entries))
+        ratios = self.durations[slots] / duration
+        candidates = slots[(ratios <= self.max_duration_ratio) & (ratios >= 1 / self.max_duration_ratio)]
+        if len(candidates) == 0:
+            return None, 0.0
+        distances = _POPCOUNT[self.fingerprints[candidates] ^ bits].sum(axis=1)
+        best = int(np.argmin(distances))
+        return int(candidates[best]), 1.0 - distances[best] / FINGERPRINT_BITS
+
+    def store(self, raw: bytes, sample_rate: int, sample_width: int, text: str,
+              confidence: Optional[float], recognition_seconds: float = 0.0):
+        self.store_fingerprint(fingerprint(raw, sample_rate, sample_width), text, confidence, recognition_seconds)
+
+    def store_fingerprint(self, key: Tuple[np.ndarray, float], text: str,
+                          confidence: Optional[float], recognition_seconds: float = 0.0):
+        """Remember a transcript, unless the recognizer was unsure of it"""
+        if confidence is None or confidence < self.min_confidence:
+            self.metrics["rejected_low_confidence"] += 1
+            return
+        bits, duration = key
+        if duration == 0:
+            return
+        if not self.free_slots:
+            slot, _ = self.entries.popitem(last=False)
+            self.free_slots.append(slot)
+            self.metrics["evictions"] += 1
+        slot = self.free_slots.pop()
+        self.fingerprints[slot] = bits
+        self.durations[slot] = duration
+        self.entries[slot] = {"text": text, "confidence": confidence, "hits": 0,
+                              "recognition_seconds": recognition_seconds}
+        self.metrics["stored"] += 1
+
+    def hit_rate(self) -> float:
+        return self.metrics["hits"] / self.metrics["lookups"] if self.metrics["lookups"] else 0.0
+
+    def report(self) -> dict:
+        return dict(self.metrics, hit_rate=round(self.hit_rate(), 4), size=len(self.entries))
+
+
+def recognize_google_with_confidence(recognizer, audio) -> Tuple[str, Optional[float]]:
+    """recognize_google returning (transcript, confidence of the top alternative)"""
+    import speech_recognition as sr
+    result = recognizer.recognize_google(audio, show_all=True)
+    if not result or not result.get("alternative"):
+        raise sr.UnknownValueError()
+    best = result["alternative"][0]
+    return best["transcript"], best.get("confidence")
+
+
+def read_wav(path: str) -> Tuple[bytes, int, int]:
+    """Return (mono PCM bytes, sample rate, sample width); stereo keeps the left channel"""
+    with wave.open(path, "rb") as f:
+        raw = f.readframes(f.getnframes())
+        width, channels = f.getsampwidth(), f.getnchannels()
+        if channels > 1:
+            raw = np.frombuffer(raw, dtype=np.uint8).reshape(-1, channels, width)[:, 0].tobytes()
+        return raw, f.getframerate(), width
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int):
+    pcm = (np.clip(samples, -1, 0.9999) * 32768).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+
+FIXTURE_PHRASES = ["admission_process", "hostel_fees", "btech_fees", "placements",
+                   "contact_number", "mrnat_dates", "scholarships", "campus_tour"]
+
+
+def synthesize_phrase(phrase: str, take: int, sample_rate: int = 44100) -> np.ndarray:
+    """Voice-like test signal for a phrase: fixed syllable pattern, varied per take
+
+    Syllables are harmonic tones shaped by two formants that depend only on
+    the phrase; takes differ in gain, noise, padding and tempo.
+    """
+    # Seeded from the phrase text (not hash(), which varies per process)
+    shape = np.random.default_rng(sum(ord(c) * 31 ** i for i, c in enumerate(phrase)) % 2 ** 32)
+    variation = np.random.default_rng(take * 104729 + len(phrase))
+    tempo = 1.0 + variation.uniform(-0.04, 0.04) if take else 1.0
+    parts = [np.zeros(int(sample_rate * variation.uniform(0.05, 0.3)))]
+    for _ in range(shape.integers(3, 7)):
+        length = int(sample_rate * shape.uniform(0.12, 0.25) * tempo)
+        t = np.arange(length) / sample_rate
+        pitch = shape.uniform(110, 220)
+        formants = shape.uniform([300, 900], [900, 2600])
+        syllable = np.zeros(length)
+        for harmonic in range(1, 30):
+            frequency = pitch * harmonic
+            gain = sum(np.exp(-((frequency - f) / 150) ** 2) for f in formants) + 0.02
+            syllable += gain * np.sin(2 * np.pi * frequency * t)
+        parts.append(syllable * np.hanning(length))
+        parts.append(np.zeros(int(sample_rate * 0.04 * tempo)))
+    parts.append(np.zeros(int(sample_rate * variation.uniform(0.05, 0.3))))
+    signal = np.concatenate(parts)
+    signal *= 0.3 / np.abs(signal).max() * (variation.uniform(0.4, 1.2) if take else 1.0)
+    if take:
+        signal += variation.normal(0, np.sqrt(np.mean(signal ** 2)) / 10 ** (20 / 20), len(signal))
+    return signal
+
+
+def make_fixtures(directory: str, takes: int = 5, sample_rate: int = 44100) -> int:
+    os.makedirs(directory, exist_ok=True)
+    for phrase in FIXTURE_PHRASES:
+        for take in range(takes):
+            write_wav(os.path.join(directory, f"{phrase}__{take}.wav"),
+                      synthesize_phrase(phrase, take, sample_rate), sample_rate)
+    return len(FIXTURE_PHRASES) * takes
+
+
+def evaluate(directory: str, min_similarity: float, unseen_fraction: float = 0.25) -> dict:
+    """Seed the cache with the first take of most phrases, then look up every other take
+
+    Takes of seeded phrases should hit with the right transcript; phrases that
+    were never seeded must miss (any hit on them is a false hit).
+    """
+    takes: Dict[str, List[str]] = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".wav") and "__" in name:
+            takes.setdefault(name.split("__", 1)[0], []).append(os.path.join(directory, name))
+    phrases = sorted(takes)
+    unseen = set(phrases[:max(1, int(len(phrases) * unseen_fraction))])
+
+    cache = TranscriptCache(min_similarity=min_similarity)
+    for phrase in phrases:
+        if phrase not in unseen:
+            cache.store(*read_wav(takes[phrase][0]), phrase.replace("_", " "), confidence=0.95)
+
+    results = {"correct_hits": 0, "missed": 0, "wrong_transcript": 0, "false_hits": 0, "true_misses": 0}
+    timings = []
+    for phrase in phrases:
+        for path in takes[phrase][0 if phrase in unseen else 1:]:
+            raw, rate, width = read_wav(path)
+            start = time.perf_counter()
+            text = cache.lookup(raw, rate, width)
+            timings.append((time.perf_counter() - start) * 1000)
+            if phrase in unseen:
+                results["false_hits" if text else "true_misses"] += 1
+            elif text is None:
+                results["missed"] += 1
+            else:
+                results["correct_hits" if text == phrase.replace("_", " ") else "wrong_transcript"] += 1
+
+    results["lookup_ms_mean"] = round(float(np.mean(timings)), 3) if timings else 0.0
+    results["cache"] = cache.report()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio-fingerprint transcript cache tools")
+    parser.add_argument("command", choices=["make-fixtures", "evaluate"])
+    parser.add_argument("directory")
+    parser.add_argument("--takes", type=int, default=5)
+    parser.add_argument("--min-similarity", type=float, default=0.75)
+    args = parser.parse_args()
+
+    if args.command == "make-fixtures":
+        count = make_fixtures(args.directory, args.takes)
+        print(f"✅ Wrote {count} fixture WAVs to {args.directory}")
+        return
+
+    results = evaluate(args.directory, args.min_similarity)
+    print(f"📊 Transcript cache on {args.directory} (min similarity {args.min_similarity})")
+    for key in ("correct_hits", "missed", "wrong_transcript", "false_hits", "true_misses", "lookup_ms_mean"):
+        print(f"• {key.replace('_', ' '):<18} {results[key]}")
+    print(f"• cache              {results['cache']}")
+    if results["false_hits"] or results["wrong_transcript"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Audio Preprocessing for MRU Voice Chatbot
+=========================================
+
+Prepares captured audio before it is uploaded for recognition. Microphones
+deliver 44.1/48 kHz, sometimes stereo or 24-bit; speech recognition needs
+16 kHz mono 16-bit, and every extra byte is upload latency.
+
+Stages (timed individually):
+- view:      raw buffer -> integer samples via memoryview/numpy.frombuffer (no copy)
+- downmix:   channels averaged into one float32 signal
+- resample:  FFT band-limited resampling to 16 kHz (ideal low-pass, no scipy needed)
+- normalize: in-place gain to a target RMS level, capped to avoid boosting noise
+- encode:    16-bit PCM
+
+recognize_google FLAC-compresses whatever it is given, so a 16 kHz input
+directly shrinks the upload; `--flac` reports that compressed size too.
+
+Usage:
+    python audio_preprocess.py report fixtures/*.wav [--channels 2] [--flac]
+"""
+
+import argparse
+import time
+import wave
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from chatbot_logging import get_logger
+
+logger = get_logger("audio_preprocess")
+
+TARGET_RATE = 16000
+
+_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+def pcm_view(raw, sample_width: int) -> Tuple[np.ndarray, float]:
+    """Integer samples over the raw buffer plus their full-scale value
+
+    8/16/32-bit audio is viewed in place; 24-bit has no numpy dtype and is
+    unpacked into a new int32 array.
+    """
+    buffer = memoryview(raw).cast("B")
+    if sample_width in _DTYPES:
+        samples = np.frombuffer(buffer, dtype=_DTYPES[sample_width])
+        if sample_width == 1:
+            return samples, 128.0
+        return samples, float(1 << (8 * sample_width - 1))
+    if sample_width == 3:
+        triples = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+        values -= (values & 0x800000) << 1
+        return values, 8388608.0
+    raise ValueError(f"Unsupported sample width {sample_width}")
+
+
+def downmix(samples: np.ndarray, channels: int, full_scale: float, sample_width: int) -> np.ndarray:
+    """Interleaved integer samples -> mono float32 in [-1, 1)"""
+    if sample_width == 1:
+        samples = samples.astype(np.float32) - 128  # unsigned 8-bit
+    if channels == 1:
+        return np.multiply(samples, 1.0 / full_scale, dtype=np.float32)
+    frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)  # a view
+    return np.multiply(frames.sum(axis=1, dtype=np.float32), 1.0 / (full_scale * channels), dtype=np.float32)
+
+
+def resample(signal: np.ndarray, from_rate: int, to_rate: int = TARGET_RATE) -> np.ndarray:
+    """Band-limited resampling by truncating (or zero-padding) the spectrum"""
+    if from_rate == to_rate or len(signal) == 0:
+        return signal
+    out_length = max(1, int(round(len(signal) * to_rate / from_rate)))
+    spectrum = np.fft.rfft(signal)
+    out_bins = out_length // 2 + 1
+    if out_bins <= len(spectrum):
+        spectrum = spectrum[:out_bins]
+    else:
+        spectrum = np.concatenate([spectrum, np.zeros(out_bins - len(spectrum), dtype=spectrum.dtype)])
+    return np.fft.irfft(spectrum, out_length).astype(np.float32) * np.float32(out_length / len(signal))
+
+
+def normalize_gain(signal: np.ndarray, target_dbfs: float = -20.0, max_gain_db: float = 24.0) -> float:
+    """Scale signal in place towards target RMS; returns the gain applied in dB"""
+    rms = float(np.sqrt(np.mean(np.square(signal)))) if len(signal) else 0.0
+    if rms == 0.0:
+        return 0.0
+    gain_db = min(target_dbfs - 20 * np.log10(rms), max_gain_db)
+    # Never push peaks past full scale
+    peak = float(np.abs(signal).max())
+    gain_db = min(gain_db, -20 * np.log10(peak) - 0.1)
+    np.multiply(signal, np.float32(10 ** (gain_db / 20)), out=signal)
+    return gain_db
+
+
+def encode_pcm16(signal: np.ndarray) -> bytes:
+    pcm = np.empty(len(signal), dtype="<i2")
+    np.multiply(np.clip(signal, -1.0, 32767 / 32768, out=signal), 32768, out=pcm, casting="unsafe")
+    return pcm.tobytes()
+
+
+class Preprocessor:
+    """Downmix, resample, normalize and encode captured audio for recognition"""
+
+    STAGES = ("view", "downmix", "resample", "normalize", "encode")
+
+    def __init__(self, target_rate: int = TARGET_RATE, target_dbfs: float = -20.0):
+        self.target_rate = target_rate
+        self.target_dbfs = target_dbfs
+        self.totals = {stage: 0.0 for stage in self.STAGES}
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def process(self, raw, sample_rate: int, sample_width: int, channels: int = 1) -> Tuple[bytes, Dict[str, float]]:
+        """Return (16-bit mono PCM at target_rate, per-stage microseconds)"""
+        clock = time.perf_counter
+        marks = [clock()]
+        samples, full_scale = pcm_view(raw, sample_width)
+        marks.append(clock())
+        signal = downmix(samples, channels, full_scale, sample_width)
+        marks.append(clock())
+        signal = resample(signal, sample_rate, self.target_rate)
+        marks.append(clock())
+        normalize_gain(signal, self.target_dbfs)
+        marks.append(clock())
+        pcm = encode_pcm16(signal)
+        marks.append(clock())
+
+        timings = {stage: (marks[i + 1] - marks[i]) * 1e6 for i, stage in enumerate(self.STAGES)}
+        self.calls += 1
+        self.bytes_in += memoryview(raw).nbytes
+        self.bytes_out += len(pcm)
+        for stage, micros in timings.items():
+            self.totals[stage] += micros
+        return pcm, timings
+
+    def prepare(self, audio):
+        """speech_recognition AudioData in, 16 kHz mono AudioData out"""
+        import speech_recognition as sr
+        pcm, _ = self.process(audio.frame_data, audio.sample_rate, audio.sample_width)
+        return sr.AudioData(pcm, self.target_rate, 2)
+
+    def report(self) -> dict:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "stage_us": {stage: round(total / calls, 1) for stage, total in self.totals.items()},
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out
+        }
+
+
+def flac_size(pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[int]:
+    """Size of the FLAC upload recognize_google would make, if the encoder is available"""
+    try:
+        import speech_recognition as sr
+        return len(sr.AudioData(pcm, sample_rate, sample_width).get_flac_data())
+    except (ImportError, OSError):
+        return None
+
+
+def read_wav_raw(path: str) -> Tuple[bytes, int, int, int]:
+    """Return (interleaved PCM bytes, sample rate, sample width, channels)"""
+    with wave.open(path, "rb") as f:
+        return f.readframes(f.getnframes()), f.getframerate(), f.getsampwidth(), f.getnchannels()
+
+
+def report(paths, channels: Optional[int] = None, flac: bool = False):
+    """Per-stage cost and payload size on fixture audio"""
+    preprocessor = Preprocessor()
+    flac_in = flac_out = 0
+    print(f"{'file':<26} {'bytes in':>9} {'bytes out':>9}  " +
+          " ".join(f"{stage:>9}" for stage in Preprocessor.STAGES) + "   (µs)")
+    for path in paths:
+        raw, rate, width, file_channels = read_wav_raw(path)
+        if channels and channels != file_channels:
+            # Simulate a multi-channel capture of the same recording
+            raw = np.repeat(np.frombuffer(raw, dtype=np.uint8).reshape(-1, width), channels, axis=0).tobytes()
+            file_channels = channels
+        pcm, timings = preprocessor.process(raw, rate, width, file_channels)
+        if flac and file_channels == 1:
+            # What recognize_google would upload without preprocessing vs with it
+            flac_in += flac_size(raw, rate, width) or 0
+            flac_out += flac_size(pcm, preprocessor.target_rate) or 0
+        print(f"{path.rsplit('/', 1)[-1][:26]:<26} {len(raw):>9} {len(pcm):>9}  " +
+              " ".join(f"{timings[stage]:9.0f}" for stage in Preprocessor.STAGES))
+
+    summary = preprocessor.report()
+    print(f"\n• Mean stage cost (µs): {summary['stage_us']}")
+    print(f"• Raw payload: {summary['bytes_in']} -> {summary['bytes_out']} bytes "
+          f"({summary['bytes_in'] / max(summary['bytes_out'], 1):.1f}x smaller)")
+    if flac:
+        if flac_out:
+            print(f"• FLAC upload: {flac_in} -> {flac_out} bytes")
+        else:
+            print("• FLAC sizes unavailable (needs speech_recognition and its flac encoder)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio preprocessing before recognition")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("paths", nargs="+", help="WAV files")
+    parser.add_argument("--channels", type=int, default=None, help="Simulate an N-channel capture")
+    parser.add_argument("--flac", action="store_true", help="Also measure the FLAC upload size")
+    args = parser.parse_args()
+    report(args.paths, args.channels, args.flac)
+
+
+if __name__ == "__main__":
+    main()
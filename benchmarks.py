@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+MRU Voice Chatbot Benchmarks
+============================
+
+Micro-benchmarks for the chatbot pipeline. Run one suite at a time:
+
+    python benchmarks.py sessions
+    python benchmarks.py records
+    python benchmarks.py logging
+    python benchmarks.py regex
+    python benchmarks.py threads
+    python benchmarks.py knowledge
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from mru_chatbot_system import MRUVoiceChatbot
+
+SAMPLE_QUERIES = [
+    "Hello",
+    "Tell me about admissions",
+    "What courses are available?",
+    "How much are the fees?",
+    "Tell me about placements",
+    "Do you have hostel facilities?",
+    "How can I contact you?",
+    "Thank you"
+]
+
+
+def print_header(title):
+    print("\n" + "="*60)
+    print(f"📊 {title}")
+    print("="*60)
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Average wall time of func() in microseconds"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_sessions(args):
+    """Per-turn overhead of the shared session backends vs the in-memory path"""
+    from session_store import InMemorySessionStore, SQLiteSessionStore, process_turn, run_prefork
+
+    print_header("Session Backends: Per-Turn Overhead")
+    chatbot = MRUVoiceChatbot(voice_enabled=False)
+    turns = args.turns
+    sessions = args.sessions
+
+    def in_process(i):
+        chatbot.respond(SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)])
+
+    results = {"in-process (no store)": time_per_call(in_process, turns)}
+
+    memory_store = InMemorySessionStore()
+    results["InMemorySessionStore"] = time_per_call(
+        lambda i: process_turn(chatbot.engine, memory_store, f"user-{i % sessions}",
+                               SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]),
+        turns
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_store = SQLiteSessionStore(os.path.join(tmp, "sessions.db"))
+        results["SQLiteSessionStore (WAL)"] = time_per_call(
+            lambda i: process_turn(chatbot.engine, sqlite_store, f"user-{i % sessions}",
+                                   SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]),
+            turns
+        )
+        sqlite_store.close()
+
+        baseline = results["in-process (no store)"]
+        for name, micros in results.items():
+            print(f"• {name:<28} {micros:9.1f} µs/turn  (+{micros - baseline:.1f} µs)")
+
+        print_header(f"Pre-forked Workers: {args.workers} processes sharing SQLite")
+        shared_store = SQLiteSessionStore(os.path.join(tmp, "prefork.db"))
+
+        def worker(index):
+            # Turn i of every session goes to worker i % workers, so each
+            # user's consecutive turns deliberately hop between processes
+            for i in range(index, turns, args.workers):
+                process_turn(chatbot.engine, shared_store, f"user-{i % sessions}",
+                             SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)])
+
+        start = time.perf_counter()
+        exit_codes = run_prefork(worker, args.workers)
+        elapsed = time.perf_counter() - start
+
+        total_history = 0
+        for s in range(sessions):
+            state, _ = shared_store.load(f"user-{s}")
+            total_history += len(state["conversation"]["conversation_history"])
+        shared_store.close()
+
+        print(f"• Worker exit codes: {exit_codes}")
+        print(f"• Throughput: {turns / elapsed:.0f} turns/s")
+        print(f"• Turns recorded across sessions: {total_history}/{turns}")
+
+
+def bench_records(args):
+    """Per-session memory of conversation history: legacy dicts vs compact records"""
+    import tracemalloc
+    from datetime import datetime
+
+    print_header(f"Interaction Records: {args.sessions} sessions x {args.turns_per_session} turns")
+    chatbot = MRUVoiceChatbot(voice_enabled=False)
+    generator = chatbot.response_generator
+    classifier = chatbot.intent_classifier
+    turns = []
+    for i in range(args.turns_per_session):
+        query = SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]
+        intent = classifier.classify_intent(query)
+        response, response_key = generator.generate_keyed_response(intent, query)
+        # Fresh copies, as every real turn produces new strings
+        turns.append((query, intent, response, response_key))
+
+    def measure(build):
+        tracemalloc.start()
+        sessions = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del sessions
+        return current / args.sessions
+
+    def legacy_sessions():
+        # The per-turn dict that ConversationManager used to keep
+        return [
+            [{"timestamp": datetime.now(), "user_input": "".join(query),
+              "bot_response": "".join(response), "intent": intent}
+             for query, intent, response, _ in turns]
+            for _ in range(args.sessions)
+        ]
+
+    def compact_sessions():
+        managers = []
+        for _ in range(args.sessions):
+            manager = type(chatbot.conversation_manager)(generator)
+            for query, intent, response, response_key in turns:
+                manager.add_interaction(query, response, intent, response_key)
+            managers.append(manager)
+        return managers
+
+    before = measure(legacy_sessions)
+    after = measure(compact_sessions)
+    print(f"• Legacy dict records:  {before / 1024:8.1f} KiB per session")
+    print(f"• Compact records:      {after / 1024:8.1f} KiB per session")
+    print(f"• Reduction:            {before / after:8.1f}x")
+
+    manager = compact_sessions()[0]
+    record = manager.conversation_history[3]
+    iterations = 10000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        manager.get_response_text(record)
+    print(f"• On-demand text reconstruction: {(time.perf_counter() - start) / iterations * 1e6:.1f} µs")
+
+
+class SlowStream:
+    """Stand-in for a congested pipe or journald socket"""
+
+    def __init__(self, write_delay: float):
+        self.write_delay = write_delay
+        self.lines = 0
+
+    def write(self, text):
+        time.sleep(self.write_delay)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def bench_logging(args):
+    """Request-thread cost of per-turn diagnostics: print() vs queued logging"""
+    import contextlib
+    import chatbot_logging
+
+    print_header("Diagnostics on the Request Path")
+    turns = args.turns // 4
+    stream = SlowStream(args.write_delay_us / 1e6)
+    logger = chatbot_logging.get_logger("bench")
+
+    def with_prints(i):
+        # What listen()/speak() used to emit on every voice turn
+        with contextlib.redirect_stdout(stream):
+            print("🎤 Listening...")
+            print("🔄 Processing speech...")
+            print(f"👤 User: {SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]}")
+            print(f"🤖 Assistant: response {i}")
+
+    def with_logging(i):
+        with chatbot_logging.turn_context():
+            logger.debug("Listening")
+            logger.debug("Processing speech")
+            logger.info("Speech recognized", extra={"transcript": SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]})
+            logger.info("Speaking response", extra={"chars": i})
+
+    results = {"print() to slow stdout": time_per_call(with_prints, turns)}
+    for label, options in [("queued logging, INFO", {"level": "INFO"}),
+                           ("queued logging, DEBUG + JSON", {"level": "DEBUG", "json_output": True}),
+                           ("queued logging, quiet", {"quiet": True})]:
+        chatbot_logging.setup_logging(stream=stream, **options)
+        results[label] = time_per_call(with_logging, turns)
+        chatbot_logging.shutdown_logging()
+
+    print(f"• Simulated stream write latency: {args.write_delay_us:.0f} µs")
+    for name, micros in results.items():
+        print(f"• {name:<30} {micros:9.1f} µs/turn on the request thread")
+
+
+def bench_regex(args):
+    """Worst-case intent matching time on hostile input, per regex engine"""
+    from mru_chatbot_system import IntentClassifier
+
+    print_header("Intent Patterns: Adversarial Input")
+    # Repeated prefixes of `how much.*cost` that never complete: each
+    # occurrence makes an unbounded `.*` scan to the end of the text and back
+    attacks = {
+        "pasted blob": "lorem ipsum dolor sit amet ",
+        "how much ...": "zz how much ",
+    }
+    engines = {
+        "re, no length guard": IntentClassifier(engine="re", max_input_length=None),
+        "bounded, no length guard": IntentClassifier(engine="bounded", max_input_length=None),
+        "re2, no length guard": IntentClassifier(engine="re2", max_input_length=None),
+        "bounded + 500 char guard": IntentClassifier(engine="bounded"),
+    }
+    sizes = [1_000, 10_000, 50_000]
+
+    print(f"{'input':<18} {'chars':>7}  " + "  ".join(f"{name:>25}" for name in engines))
+    for attack_name, unit in attacks.items():
+        for size in sizes:
+            text = (unit * (size // len(unit) + 1))[:size]
+            timings = []
+            for classifier in engines.values():
+                start = time.perf_counter()
+                classifier.classify_intent(text)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{attack_name:<18} {size:>7}  " + "  ".join(f"{ms:>22.2f} ms" for ms in timings))
+
+
+def bench_threads(args):
+    """One shared ChatEngine serving many sessions from a thread pool"""
+    import tracemalloc
+    from concurrent.futures import ThreadPoolExecutor
+    from mru_chatbot_system import ChatEngine
+
+    print_header(f"Shared Engine: {args.sessions} sessions x {args.turns_per_session} turns on a thread pool")
+    tracemalloc.start()
+    engine = ChatEngine()
+    engine_bytes = tracemalloc.get_traced_memory()[0]
+    sessions = [engine.new_session(f"user-{s}") for s in range(args.sessions)]
+    session_bytes = (tracemalloc.get_traced_memory()[0] - engine_bytes) / args.sessions
+    tracemalloc.stop()
+    print(f"• Engine (shared once):     {engine_bytes / 1024:8.1f} KiB")
+    print(f"• Each SessionContext:      {session_bytes / 1024:8.1f} KiB")
+    print(f"• {args.sessions} users, shared engine: {(engine_bytes + session_bytes * args.sessions) / 1024:8.1f} KiB"
+          f"  (one full chatbot each: {(engine_bytes + session_bytes) * args.sessions / 1024:.1f} KiB)")
+
+    def serve(session):
+        # A session is only ever served by one thread at a time
+        for i in range(args.turns_per_session):
+            engine.respond(session, SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)])
+
+    total_turns = args.sessions * args.turns_per_session
+    baseline = None
+    for workers in (1, 2, 4, 8, 16):
+        sessions = [engine.new_session(f"user-{s}") for s in range(args.sessions)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(serve, sessions))
+        elapsed = time.perf_counter() - start
+        throughput = total_turns / elapsed
+        baseline = baseline or throughput
+        intact = all(len(session.conversation_manager.conversation_history) == args.turns_per_session
+                     for session in sessions)
+        print(f"• {workers:>2} threads: {throughput:9.0f} turns/s  ({throughput / baseline:4.2f}x)"
+              f"  histories intact: {'yes' if intact else 'NO'}")
+    print("• Turns are CPU-bound under the GIL; extra threads pay off once stages wait on I/O (ASR, TTS)")
+
+
+def bench_knowledge(args):
+    """A one-field knowledge edit applied incrementally vs rebuilding derived structures"""
+    from mru_chatbot_system import ChatEngine, MRUKnowledgeBase, ResponseGenerator
+    from semantic_search import SemanticIndex, knowledge_passages, make_embedder, normalize_rows, passage_context
+    from voice_rendering import branches
+
+    print_header("Knowledge-Base Edit: one fee changed")
+    embedder = make_embedder("hashing")
+
+    def full_index(knowledge):
+        passages = knowledge_passages(knowledge)
+        vectors = normalize_rows(embedder.embed([passage_context(path, text) for path, text in passages]))
+        return SemanticIndex(vectors, [path for path, _ in passages], [text for _, text in passages], embedder)
+
+    knowledge_base = MRUKnowledgeBase()
+    engine = ChatEngine(knowledge_base, semantic_index=full_index(knowledge_base.knowledge))
+    fee_path = "fees.approximate_annual_fees.btech"
+    original = engine.knowledge_base.knowledge["fees"]["approximate_annual_fees"]["btech"]
+    iterations = max(args.turns // 20, 10)
+
+    def warm():
+        generator = engine.response_generator
+        for intent in generator.dispatch.renderers:
+            for branch in branches(generator, intent):
+                generator.render_response(intent, branch)
+
+    def incremental(i):
+        knowledge_base.update({fee_path: f"{original} (rev {i})"})
+
+    def rebuild(i):
+        knowledge_base.knowledge["fees"]["approximate_annual_fees"]["btech"] = f"{original} (rev {i})"
+        full_index(knowledge_base.knowledge)
+        ResponseGenerator(knowledge_base)
+
+    warm()
+    results = {
+        "incremental (change set)": time_per_call(incremental, iterations),
+        "full rebuild": time_per_call(rebuild, iterations),
+    }
+    for name, micros in results.items():
+        print(f"• {name:<26} {micros:10.1f} µs/edit")
+
+    cache = engine.response_generator.render_cache
+    warm()
+    knowledge_base.update({fee_path: original})
+    kept = sorted({key for key, _ in cache})
+    print(f"• Renderings kept after a fee edit: {', '.join(kept)}")
+    hits = engine.semantic_index.search("btech fees", 1)
+    print(f"• Index after edit: {len(engine.semantic_index.paths)} passages, top hit {hits[0].path}")
+
+
+SUITES = {
+    "sessions": bench_sessions,
+    "records": bench_records,
+    "logging": bench_logging,
+    "regex": bench_regex,
+    "threads": bench_threads,
+    "knowledge": bench_knowledge,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MRU Voice Chatbot benchmarks")
+    parser.add_argument("suite", choices=sorted(SUITES))
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--turns-per-session", type=int, default=50)
+    parser.add_argument("--write-delay-us", type=float, default=50.0)
+    args = parser.parse_args()
+    SUITES[args.suite](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Logging Setup for MRU Voice Chatbot
+===================================
+
+Structured, leveled logging for the chatbot. Records are handed to a
+QueueHandler on the request thread and formatted and written by a
+QueueListener thread, so a slow stdout pipe or journald never blocks a turn.
+
+- Every record carries the correlation id of the turn it belongs to
+- Output is either human-readable or one JSON object per line
+- Quiet mode (production) only lets warnings and errors through
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import uuid
+from typing import Optional
+
+LOGGER_NAME = "mru_chatbot"
+INTERACTION_LOGGER_NAME = f"{LOGGER_NAME}.interactions"
+
+# Correlation id of the turn being processed by the current thread/task
+current_turn_id = contextvars.ContextVar("current_turn_id", default="-")
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "turn_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_interaction_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str = "") -> logging.Logger:
+    """Logger under the chatbot's namespace"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def new_turn_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextlib.contextmanager
+def turn_context(turn_id: Optional[str] = None):
+    """Tag every record logged inside the block with a per-turn correlation id"""
+    token = current_turn_id.set(turn_id or new_turn_id())
+    try:
+        yield current_turn_id.get()
+    finally:
+        current_turn_id.reset(token)
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the current turn id (runs on the request thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.turn_id = current_turn_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "turn_id": getattr(record, "turn_id", "-"),
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class InteractionFormatter(logging.Formatter):
+    """Compact JSON line per turn for the interaction log (read by analytics.py)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"ts": round(record.created, 3), "turn": getattr(record, "turn_id", "-")}
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the turn id and any `extra` fields appended"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [%(turn_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+        if extras:
+            line += " " + " ".join(f"{key}={value}" for key, value in extras.items())
+        return line
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler merges args into the message on the calling thread;
+    records only cross threads here (never processes), so that is skipped.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str = "INFO", quiet: bool = False, json_output: bool = False,
+                  stream=None) -> logging.handlers.QueueListener:
+    """Route chatbot logging through a background listener thread
+
+    quiet=True is the production mode: only WARNING and above are emitted.
+    Calling this again replaces the previous configuration.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if json_output else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+
+    logger = get_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.WARNING if quiet else getattr(logging, level.upper()))
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def setup_interaction_log(path: str) -> logging.handlers.QueueListener:
+    """Append one JSON line per answered turn to `path`, off the request thread
+
+    These records are kept separate from diagnostics (they never reach the
+    console) and are what analytics.py aggregates.
+    """
+    global _interaction_listener
+    if _interaction_listener is not None:
+        _interaction_listener.stop()
+
+    output = logging.FileHandler(path, encoding="utf-8")
+    output.setFormatter(InteractionFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+
+    logger = interaction_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+
+    _interaction_listener = logging.handlers.QueueListener(log_queue, output)
+    _interaction_listener.start()
+    return _interaction_listener
+
+
+def interaction_logger() -> logging.Logger:
+    """Logger for per-turn interaction records; silent until setup_interaction_log()"""
+    logger = logging.getLogger(INTERACTION_LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def flush_logging():
+    """Flush the listeners' outputs; records still queued are written by the listener threads"""
+    for listener in (_listener, _interaction_listener):
+        if listener is not None:
+            for handler in listener.handlers:
+                handler.flush()
+
+
+def shutdown_logging():
+    """Flush pending records and stop the listener threads"""
+    global _listener, _interaction_listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _interaction_listener is not None:
+        _interaction_listener.stop()
+        _interaction_listener = None
+
+
+atexit.register(shutdown_logging)
+
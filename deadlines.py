@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Per-Turn Deadlines for MRU Voice Chatbot
+========================================
+
+Without a bound, one slow call (a microphone that never hears silence, a
+recognition request stuck on a bad network, a long answer read aloud)
+stalls the whole conversation. Every voice turn gets one latency budget
+that is passed from stage to stage:
+
+    listen -> recognize -> generate -> speak
+
+- A stage's allowance is the time left in the turn minus what the later
+  stages are guaranteed (STAGE_RESERVES), so an early stage can never eat
+  the whole budget
+- Stages degrade instead of overrunning: listening waits and records
+  for less (at full allowance, the old fixed 5 s wait and 10 s phrase),
+  recognition gives up and the user is asked to repeat, a long spoken
+  answer is cut to the sentences that fit (the rest waits for "more"),
+  and with no time left at all the answer is only printed
+- Generation runs in-process and is not interrupted; an overrun is
+  recorded and the following stages absorb it
+- Deadline misses and degradations are counted per stage
+
+Usage:
+    python mru_chatbot_system.py --turn-budget 20
+    python deadlines.py simulate [--turns 200] [--budget 20]
+"""
+
+import argparse
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from chatbot_logging import get_logger
+from voice_rendering import shorten_to, speaking_seconds
+
+logger = get_logger("deadlines")
+
+STAGES = ("listen", "recognize", "generate", "speak")
+
+# Default budget for one voice turn, from the start of listening to the end of speech
+TURN_BUDGET_S = 30.0
+
+# Time each stage is guaranteed when it starts, taken from earlier stages' allowances
+STAGE_RESERVES = {"listen": 4.0, "recognize": 3.0, "generate": 0.5, "speak": 6.0}
+
+# Upper bounds a stage never exceeds even with budget to spare
+STAGE_CAPS = {"listen": 15.0, "recognize": 8.0}
+
+# Longest wait for speech to start; the rest of the listen allowance bounds the phrase
+LISTEN_WAIT_S = 5.0
+
+PLEASE_REPEAT = "Sorry, I didn't catch that in time. Could you please repeat your question?"
+
+
+class TurnDeadline:
+    """Remaining time of one turn and the allowance of each stage"""
+
+    def __init__(self, budget: float = TURN_BUDGET_S, stats: "DeadlineStats" = None,
+                 reserves: Dict[str, float] = None, clock: Callable[[], float] = time.monotonic):
+        self.budget = budget
+        self.stats = stats
+        self.reserves = STAGE_RESERVES if reserves is None else reserves
+        self.clock = clock
+        self.expires = clock() + budget
+        self.missed = []
+        self.degraded = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - self.clock())
+
+    def allowance(self, stage: str) -> float:
+        """Seconds this stage may take without starving the stages after it"""
+        later = STAGES[STAGES.index(stage) + 1:]
+        allowance = self.remaining() - sum(self.reserves.get(name, 0.0) for name in later)
+        allowance = max(allowance, min(self.reserves.get(stage, 0.0), self.remaining()))
+        return min(allowance, STAGE_CAPS.get(stage, allowance))
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage against its allowance (fixed when the stage starts); yields the allowance"""
+        allowance = self.allowance(name)
+        start = self.clock()
+        try:
+            yield allowance
+        finally:
+            elapsed = self.clock() - start
+            missed = elapsed > allowance
+            if missed:
+                self.missed.append(name)
+                logger.info("Stage missed its deadline", extra={
+                    "stage": name, "elapsed_s": round(elapsed, 3), "allowance_s": round(allowance, 3)
+                })
+            if self.stats is not None:
+                self.stats.record(name, elapsed, missed)
+
+    def degrade(self, stage: str, action: str):
+        """Note that a stage fell back to a cheaper behaviour to stay within budget"""
+        self.degraded.append((stage, action))
+        logger.info("Degraded to meet turn deadline", extra={"stage": stage, "action": action})
+        if self.stats is not None:
+            self.stats.record_degradation(stage, action)
+
+
+def recognize_within(deadline: Optional[TurnDeadline], recognize: Callable[[Optional[float]], str],
+                     request_errors: Tuple[Type[Exception], ...] = ()) -> Optional[str]:
+    """Run `recognize(allowance)` as the recognize stage; None when the request failed
+
+    speech_recognition only wraps URLError/HTTPError in its RequestError: a
+    server that accepts the connection and then stalls raises a bare
+    TimeoutError, so timeouts and other OSErrors are handled here too. A
+    timed-out request, or one that failed after overrunning its allowance,
+    degrades the turn to please_repeat.
+    """
+    try:
+        with deadline.stage("recognize") if deadline else nullcontext() as allowance:
+            return recognize(allowance)
+    except (OSError, *request_errors) as e:
+        logger.warning("Speech recognition service error: %s", e)
+        if deadline is not None and (isinstance(e, TimeoutError) or "recognize" in deadline.missed):
+            deadline.degrade("recognize", "please_repeat")
+        return None
+
+
+def listen_limits(allowance: float) -> Tuple[float, float]:
+    """(wait for speech, phrase time limit) that together fit the listen allowance"""
+    wait = min(LISTEN_WAIT_S, allowance / 3)
+    return wait, allowance - wait
+
+
+class DeadlineStats:
+    """Deadline misses and degradations per stage, across turns"""
+
+    def __init__(self):
+        self.turns = 0
+        self.turns_over_budget = 0
+        self.stages = {name: {"runs": 0, "misses": 0, "seconds": 0.0, "max_seconds": 0.0} for name in STAGES}
+        self.degradations: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, elapsed: float, missed: bool):
+        with self._lock:
+            counts = self.stages.setdefault(stage, {"runs": 0, "misses": 0, "seconds": 0.0, "max_seconds": 0.0})
+            counts["runs"] += 1
+            counts["misses"] += missed
+            counts["seconds"] += elapsed
+            counts["max_seconds"] = max(counts["max_seconds"], elapsed)
+
+    def record_degradation(self, stage: str, action: str):
+        with self._lock:
+            actions = self.degradations.setdefault(stage, {})
+            actions[action] = actions.get(action, 0) + 1
+
+    def finish_turn(self, deadline: TurnDeadline):
+        with self._lock:
+            self.turns += 1
+            self.turns_over_budget += deadline.clock() > deadline.expires
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "turns_over_budget": self.turns_over_budget,
+                "stages": {
+                    name: {"runs": counts["runs"], "misses": counts["misses"],
+                           "mean_s": round(counts["seconds"] / counts["runs"], 3) if counts["runs"] else 0.0,
+                           "max_s": round(counts["max_seconds"], 3)}
+                    for name, counts in self.stages.items()
+                },
+                "degradations": {stage: dict(actions) for stage, actions in self.degradations.items()},
+            }
+
+
+class SimulatedClock:
+    """Manually advanced clock, so simulated turns run instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def simulate_turn(deadline: TurnDeadline, clock: SimulatedClock, rng: random.Random, answer: str) -> str:
+    """One voice turn with random stage latencies; recognition goes through recognize_within like VoiceHandler"""
+    with deadline.stage("listen") as allowance:
+        # Users start speaking after a pause and talk for a few seconds
+        wait_limit, phrase_limit = listen_limits(allowance)
+        wait, phrase = rng.uniform(0.3, 4.0), rng.uniform(1.5, 9.0)
+        if wait > wait_limit:
+            clock.sleep(wait_limit)
+            return ""
+        clock.sleep(wait + min(phrase, phrase_limit))
+        if phrase > phrase_limit:
+            deadline.degrade("listen", "cut_off")
+    latency = rng.lognormvariate(-0.5, 1.0)
+
+    def recognize(allowance: float) -> str:
+        if latency > allowance:
+            # The request timeout fires a little after the allowance, as a bare socket timeout
+            clock.sleep(allowance + rng.uniform(0.0, 0.2))
+            raise TimeoutError("The read operation timed out")
+        clock.sleep(latency)
+        return "simulated transcript"
+
+    if recognize_within(deadline, recognize) is None:
+        return PLEASE_REPEAT
+    with deadline.stage("generate"):
+        clock.sleep(rng.uniform(0.0001, 0.002))
+    with deadline.stage("speak") as allowance:
+        spoken, _ = shorten_to(answer, allowance)
+        if not spoken:
+            deadline.degrade("speak", "text_only")
+        elif spoken != answer:
+            deadline.degrade("speak", "shortened")
+        clock.sleep(speaking_seconds(spoken))
+    return spoken
+
+
+def simulate(turns: int, budget: float, seed: int = 5) -> dict:
+    """Drive simulated voice turns (no audio devices) and report misses and degradations"""
+    from mru_chatbot_system import MRUKnowledgeBase, ResponseGenerator
+    from voice_rendering import branches
+
+    generator = ResponseGenerator(MRUKnowledgeBase())
+    answers = [" ".join(generator.render_voice(key, branch)[:2])
+               for key in generator.dispatch.renderers for branch in branches(generator, key)]
+    rng = random.Random(seed)
+    stats = DeadlineStats()
+    turn_seconds = []
+    for _ in range(turns):
+        clock = SimulatedClock()
+        deadline = TurnDeadline(budget, stats, clock=clock)
+        simulate_turn(deadline, clock, rng, rng.choice(answers))
+        turn_seconds.append(clock.now)
+        stats.finish_turn(deadline)
+    report = stats.report()
+    report["turn_seconds_max"] = round(max(turn_seconds), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn deadline tools")
+    parser.add_argument("command", choices=["simulate"])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=TURN_BUDGET_S)
+    args = parser.parse_args()
+
+    report = simulate(args.turns, args.budget)
+    print(f"📊 {report['turns']} simulated voice turns, {args.budget:.1f}s budget: "
+          f"{report['turns_over_budget']} over budget, longest {report['turn_seconds_max']}s\n")
+    for name, counts in report["stages"].items():
+        actions = ", ".join(f"{action} {count}" for action, count in report["degradations"].get(name, {}).items())
+        print(f"• {name:<10} runs {counts['runs']:>5}  misses {counts['misses']:>4}  "
+              f"mean {counts['mean_s']:6.3f}s  max {counts['max_s']:6.3f}s  {actions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Intent Classification Evaluation for MRU Voice Chatbot
+======================================================
+
+Measures how accurate and how fast each classification engine is on a
+labeled, versioned query corpus, so a faster classifier cannot quietly
+be a worse one.
+
+- `generate` writes the corpus (intent_corpus.v1.jsonl): seed queries for
+  every intent expanded with paraphrases, keyboard typos, code-mixed
+  Hinglish/Hindi and multi-intent questions. Generation is seeded, so a
+  corpus version is reproducible; bump CORPUS_VERSION when seeds change
+- `run` classifies the corpus with each engine and prints accuracy (also
+  per tag), per-intent precision/recall, the confusion matrix and latency
+  percentiles side by side
+- Limits (`--min-accuracy`, `--max-p95-us`) and a saved baseline
+  (`--baseline`) make `run` exit non-zero on regressions
+
+A multi-intent query counts as correct when the prediction is any of its
+labels.
+
+Usage:
+    python evaluate_intents.py generate
+    python evaluate_intents.py run --engines bounded,re,multilingual --confusion bounded
+    python evaluate_intents.py run --baseline intent_baseline.json --save-baseline
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from load_test import paraphrase, percentile
+
+CORPUS_FORMAT = "mru-intent-corpus"
+CORPUS_VERSION = 1
+DEFAULT_CORPUS = f"intent_corpus.v{CORPUS_VERSION}.jsonl"
+
+SEED_QUERIES: Dict[str, List[str]] = {
+    "greeting": [
+        "Hello", "Hi there", "Hey, good morning", "Good afternoon", "Good evening!", "Namaste",
+        "Hello, how are you?", "hey what's up", "Hi, is anyone there?", "Hello MRU assistant"
+    ],
+    "admission_info": [
+        "How do I apply for admission?", "Tell me about admissions", "What is MRNAT?",
+        "When is the MRNAT entrance exam?", "What is the admission process?",
+        "What are the eligibility criteria for B.Tech admission?", "How to get admission at MRU?",
+        "Is there an entrance test?", "What documents are needed for the application?",
+        "What are the admission requirements?", "How can I apply online?",
+        "Tell me about the MRNAT syllabus", "When does the application open?"
+    ],
+    "courses": [
+        "What courses do you offer?", "Which programs are available?", "Do you have B.Tech in computer science?",
+        "Tell me about the MBA program", "What degrees can I study?", "Do you offer law courses?",
+        "Is there a BBA program?", "Which engineering branches are there?", "Do you have an MSc in physics?",
+        "What PhD programs are offered?", "Tell me about mechanical engineering", "Do you teach data science?",
+        "What are the management programs?"
+    ],
+    "fees": [
+        "How much are the fees?", "What is the fee structure?", "What does B.Tech cost per year?",
+        "Tell me the tuition fees", "How much is the BBA fee?", "Is MRU expensive?", "What are the payment options?",
+        "How much does it cost to study here?", "Is the fee affordable?", "What is the annual fee for MBA?",
+        "Fee structure for PhD please"
+    ],
+    "placements": [
+        "Tell me about placements", "What is the highest package?", "Which companies come for recruitment?",
+        "What is the average salary after graduation?", "Do students get jobs?", "How are the placements at MRU?",
+        "Who are the top recruiters?", "What career support do you provide?", "Is there placement assistance?",
+        "What package did students get last year?", "How good is employment after B.Tech?"
+    ],
+    "facilities": [
+        "What facilities do you have?", "Tell me about the hostel", "Is there a library?",
+        "What sports facilities are available?", "Is accommodation available for girls?",
+        "Tell me about the campus infrastructure", "Do you have labs?", "Is there a gym?",
+        "How is the hostel food?", "Is transport available from Delhi?", "Do you have WiFi in hostels?",
+        "What about dining on campus?"
+    ],
+    "contact": [
+        "How can I contact you?", "What is your phone number?", "What is the email address for admissions?",
+        "Where is the university located?", "What is the address of MRU?", "How do I reach the campus?",
+        "Can I visit the campus?", "Give me the admission office number", "What is the location of the university?",
+        "How to contact the admission office?"
+    ],
+    "campus_life": [
+        "What about campus life?", "What clubs are there?", "Tell me about student life",
+        "What events happen on campus?", "Are there extracurricular activities?", "Is there a technical fest?",
+        "What cultural activities are there?", "What do students do after classes?", "Tell me about student clubs"
+    ],
+    "goodbye": [
+        "Thank you", "Thanks a lot", "Bye", "Goodbye!", "See you later", "That's all, thanks",
+        "No more questions", "Thank you for the information", "ok bye", "Thanks, that was helpful"
+    ],
+    "general_info": [
+        "Tell me about MRU", "What is Manav Rachna University?", "Is the university UGC recognized?",
+        "What is the NAAC grade?", "When was the university established?", "What is the university ranking?",
+        "Who runs this university?", "What is the motto of MRU?", "Is MRU a private university?",
+        "Why should I choose MRU?"
+    ]
+}
+
+# Topic words per intent used to build code-mixed queries
+TOPICS: Dict[str, List[str]] = {
+    "admission_info": ["admission", "MRNAT exam", "application", "entrance test"],
+    "courses": ["B.Tech course", "MBA program", "BBA course", "law degree"],
+    "fees": ["fees", "fee structure", "tuition fees"],
+    "placements": ["placement", "salary package", "job"],
+    "facilities": ["hostel", "library", "sports facilities", "campus infrastructure"],
+    "contact": ["contact number", "email address", "campus location"],
+    "campus_life": ["campus life", "student clubs", "cultural events"],
+    "general_info": ["university", "MRU", "ranking"]
+}
+
+CODE_MIXED_TEMPLATES = [
+    "{topic} ke baare mein batao", "mujhe {topic} ki jaankari chahiye", "{topic} kaisa hai?",
+    "bhai {topic} ka kya scene hai", "{topic} ke liye kya karna hoga", "{topic} kitna accha hai yahan"
+]
+
+# Code-mixed and Hindi queries that carry no English keyword at all
+NATIVE_QUERIES: Dict[str, List[str]] = {
+    "greeting": ["namaskar ji", "kaise ho aap", "नमस्ते", "नमस्कार, कैसे हैं आप"],
+    "admission_info": ["dakhila kaise milega", "pravesh ki prakriya kya hai", "प्रवेश कैसे लें", "एडमिशन कब शुरू होगा"],
+    "courses": ["kaunse course hain yahan", "padhai kaisi hai", "कौन से कोर्स हैं", "पाठ्यक्रम की जानकारी दीजिए"],
+    "fees": ["kitni fees lagegi", "kharcha kitna aayega", "फीस कितनी है", "शुल्क कितना है"],
+    "placements": ["naukri milegi kya", "package kitna milta hai", "प्लेसमेंट कैसा है", "नौकरी मिलती है क्या"],
+    "facilities": ["rehne ki suvidha hai kya", "hostel milega kya", "हॉस्टल की सुविधा है", "छात्रावास कैसा है"],
+    "contact": ["university kahan hai", "number kya hai aapka", "संपर्क कैसे करें", "फोन नंबर बताइए"],
+    "goodbye": ["dhanyavaad", "shukriya bhai", "धन्यवाद", "अलविदा"]
+}
+
+# Keys next to each other on a QWERTY keyboard, for substitution typos
+_NEIGHBOURS = {
+    "a": "sq", "b": "vn", "c": "xv", "d": "sf", "e": "wr", "f": "dg", "g": "fh", "h": "gj", "i": "uo",
+    "j": "hk", "k": "jl", "l": "k", "m": "n", "n": "bm", "o": "ip", "p": "o", "q": "w", "r": "et",
+    "s": "ad", "t": "ry", "u": "yi", "v": "cb", "w": "qe", "x": "zc", "y": "tu", "z": "x"
+}
+
+
+def add_typos(text: str, rng: random.Random, count: int = 1) -> str:
+    """Swap, drop, double or mistype a letter in `count` words of 4+ letters"""
+    words = text.split(" ")
+    candidates = [i for i, word in enumerate(words) if sum(c.isalpha() for c in word) >= 4]
+    for index in rng.sample(candidates, min(count, len(candidates))):
+        word = words[index]
+        pos = rng.randrange(1, len(word) - 1)
+        operation = rng.choice(("swap", "drop", "double", "neighbour"))
+        if operation == "swap":
+            word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+        elif operation == "drop":
+            word = word[:pos] + word[pos + 1:]
+        elif operation == "double":
+            word = word[:pos] + word[pos] + word[pos:]
+        elif word[pos].lower() in _NEIGHBOURS:
+            word = word[:pos] + rng.choice(_NEIGHBOURS[word[pos].lower()]) + word[pos + 1:]
+        words[index] = word
+    return " ".join(words)
+
+
+def build_corpus(seed: int = 43, paraphrases: int = 12, typos: int = 8, multi: int = 400) -> List[dict]:
+    """Expand the seed queries into labeled records"""
+    rng = random.Random(seed)
+    records = []
+
+    def add(text: str, labels: List[str], tags: List[str]):
+        records.append({"id": len(records), "text": text, "labels": labels, "tags": tags})
+
+    for intent, queries in SEED_QUERIES.items():
+        for query in queries:
+            add(query, [intent], ["seed"])
+            variants = {paraphrase(query, rng) for _ in range(paraphrases)} - {query}
+            for variant in sorted(variants):
+                add(variant, [intent], ["paraphrase"])
+            for _ in range(typos):
+                add(add_typos(query, rng, rng.choice((1, 1, 2))), [intent], ["typo"])
+
+    for intent, topics in TOPICS.items():
+        for topic in topics:
+            for template in CODE_MIXED_TEMPLATES:
+                add(template.format(topic=topic), [intent], ["code_mixed"])
+    for intent, queries in NATIVE_QUERIES.items():
+        for query in queries:
+            add(query, [intent], ["code_mixed", "native"])
+
+    # Two questions in one breath: either answer is acceptable
+    topical = [intent for intent in SEED_QUERIES if intent not in ("greeting", "goodbye", "general_info")]
+    for _ in range(multi):
+        first, second = rng.sample(topical, 2)
+        opening, follow_up = rng.choice(SEED_QUERIES[first]), rng.choice(SEED_QUERIES[second])
+        if follow_up[1:2].islower():
+            follow_up = follow_up[0].lower() + follow_up[1:]
+        add(f"{opening.rstrip('?!.')} and {follow_up}", [first, second], ["multi"])
+    return records
+
+
+def write_corpus(path: str, records: List[dict], seed: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"format": CORPUS_FORMAT, "version": CORPUS_VERSION, "seed": seed,
+                            "records": len(records)}) + "\n")
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_corpus(path: str) -> Tuple[dict, List[dict]]:
+    """Return (header, records) of a corpus file"""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != CORPUS_FORMAT:
+            raise ValueError(f"{path} is not an MRU intent corpus")
+        records = [json.loads(line) for line in f if line.strip()]
+    return header, records
+
+
+def build_engines(names: List[str], semantic_index_prefix: Optional[str] = None) -> Dict[str, Callable[[str], str]]:
+    """Classification functions by engine name
+
+    bounded / re / re2: IntentClassifier with that regex engine
+    multilingual:       language detection plus Hinglish/Hindi packs
+    semantic:           bounded regex with the semantic-index fallback (needs --semantic-index)
+    """
+    from mru_chatbot_system import ChatEngine, IntentClassifier
+
+    engines = {}
+    for name in names:
+        if name in IntentClassifier.ENGINES:
+            classifier = IntentClassifier(engine=name)
+            if classifier.engine != name:
+                print(f"⚠️ Skipping {name}: not available here")
+                continue
+            engines[name] = classifier.classify_intent
+        elif name == "multilingual":
+            from language import LanguageLayer
+            engine = ChatEngine(language_layer=LanguageLayer(IntentClassifier()))
+            engines[name] = lambda text, engine=engine: engine.classify(text)[0]
+        elif name == "semantic":
+            if not semantic_index_prefix:
+                print("⚠️ Skipping semantic: pass --semantic-index")
+                continue
+            from semantic_search import SemanticIndex
+            engine = ChatEngine(semantic_index=SemanticIndex.load(semantic_index_prefix))
+            engines[name] = lambda text, engine=engine: engine.classify(text)[0]
+        else:
+            raise ValueError(f"Unknown engine {name!r}")
+    return engines
+
+
+class EngineResult:
+    """Predictions and per-query latency of one engine over the corpus"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.correct = 0
+        self.total = 0
+        self.by_tag = defaultdict(lambda: [0, 0])
+        self.confusion = defaultdict(Counter)  # expected -> predicted -> count
+        self.latencies_us: List[float] = []
+
+    def add(self, record: dict, predicted: str, micros: float):
+        labels = record["labels"]
+        hit = predicted in labels
+        # Credit the label that was hit; otherwise the primary label was missed
+        expected = predicted if hit else labels[0]
+        self.confusion[expected][predicted] += 1
+        self.total += 1
+        self.correct += hit
+        for tag in record["tags"]:
+            self.by_tag[tag][0] += hit
+            self.by_tag[tag][1] += 1
+        self.latencies_us.append(micros)
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    def precision_recall(self) -> Dict[str, Tuple[float, float, int]]:
+        """Per intent: (precision, recall, support)"""
+        predicted_totals = Counter()
+        for row in self.confusion.values():
+            predicted_totals.update(row)
+        scores = {}
+        for intent in sorted(set(self.confusion) | set(predicted_totals)):
+            true_positives = self.confusion[intent][intent]
+            support = sum(self.confusion[intent].values())
+            precision = true_positives / predicted_totals[intent] if predicted_totals[intent] else 0.0
+            recall = true_positives / support if support else 0.0
+            scores[intent] = (precision, recall, support)
+        return scores
+
+    def summary(self) -> dict:
+        return {
+            "accuracy": round(self.accuracy, 4),
+            "p50_us": round(percentile(self.latencies_us, 50), 2),
+            "p95_us": round(percentile(self.latencies_us, 95), 2),
+            "p99_us": round(percentile(self.latencies_us, 99), 2)
+        }
+
+
+def evaluate(engines: Dict[str, Callable[[str], str]], records: List[dict], warmup: int = 200) -> List[EngineResult]:
+    clock = time.perf_counter
+    results = []
+    for name, classify in engines.items():
+        for record in records[:warmup]:
+            classify(record["text"])
+        result = EngineResult(name)
+        for record in records:
+            start = clock()
+            predicted = classify(record["text"])
+            result.add(record, predicted, (clock() - start) * 1e6)
+        results.append(result)
+    return results
+
+
+def print_report(results: List[EngineResult], confusion_for: List[str]):
+    names = [result.name for result in results]
+    print(f"\n📊 {'':<22}" + "".join(f"{name:>14}" for name in names))
+    rows = [("accuracy", lambda r: f"{r.accuracy:.1%}")]
+    for tag in sorted({tag for result in results for tag in result.by_tag}):
+        rows.append((f"  {tag}", lambda r, tag=tag: f"{r.by_tag[tag][0] / max(r.by_tag[tag][1], 1):.1%}"))
+    for pct in (50, 95, 99):
+        rows.append((f"p{pct} latency (µs)", lambda r, pct=pct: f"{percentile(r.latencies_us, pct):.1f}"))
+    for label, cell in rows:
+        print(f"   {label:<22}" + "".join(f"{cell(result):>14}" for result in results))
+
+    print(f"\n🎯 Precision / recall per intent")
+    scores = {result.name: result.precision_recall() for result in results}
+    intents = sorted({intent for per_engine in scores.values() for intent in per_engine})
+    print(f"   {'intent':<16}" + "".join(f"{name:>18}" for name in names) + "   support")
+    for intent in intents:
+        cells = []
+        for name in names:
+            precision, recall, _ = scores[name].get(intent, (0.0, 0.0, 0))
+            cells.append(f"{precision:6.2f} / {recall:4.2f}")
+        support = max(scores[name].get(intent, (0, 0, 0))[2] for name in names)
+        print(f"   {intent:<16}" + "".join(f"{cell:>18}" for cell in cells) + f"   {support:7d}")
+
+    for result in results:
+        if result.name not in confusion_for:
+            continue
+        print(f"\n🔀 Confusion matrix: {result.name} (rows expected, columns predicted)")
+        short = {intent: intent[:6] for intent in intents}
+        print(f"   {'':<16}" + "".join(f"{short[intent]:>7}" for intent in intents))
+        for expected in intents:
+            row = result.confusion.get(expected, {})
+            print(f"   {expected:<16}" + "".join(f"{row.get(predicted, 0) or '.':>7}" for predicted in intents))
+
+
+def check_limits(results: List[EngineResult], min_accuracy: Optional[float], max_p95_us: Optional[float],
+                 baseline: Optional[dict], max_accuracy_drop: float, max_latency_growth: float) -> List[str]:
+    """Return a message for every limit an engine breaks"""
+    failures = []
+    for result in results:
+        summary = result.summary()
+        if min_accuracy is not None and summary["accuracy"] < min_accuracy:
+            failures.append(f"{result.name}: accuracy {summary['accuracy']:.1%} below {min_accuracy:.1%}")
+        if max_p95_us is not None and summary["p95_us"] > max_p95_us:
+            failures.append(f"{result.name}: p95 {summary['p95_us']:.1f} µs above {max_p95_us:.1f} µs")
+        previous = (baseline or {}).get(result.name)
+        if previous:
+            if summary["accuracy"] < previous["accuracy"] - max_accuracy_drop:
+                failures.append(f"{result.name}: accuracy fell from {previous['accuracy']:.1%} "
+                                f"to {summary['accuracy']:.1%}")
+            if summary["p95_us"] > previous["p95_us"] * (1 + max_latency_growth):
+                failures.append(f"{result.name}: p95 rose from {previous['p95_us']:.1f} µs "
+                                f"to {summary['p95_us']:.1f} µs")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy and latency of intent classification engines")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = sub.add_parser("generate", help="Write the labeled corpus")
+    generate_parser.add_argument("--out", default=DEFAULT_CORPUS)
+    generate_parser.add_argument("--seed", type=int, default=43)
+
+    run_parser = sub.add_parser("run", help="Evaluate engines on the corpus")
+    run_parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    run_parser.add_argument("--engines", default="bounded,re,re2,multilingual",
+                            help="Comma-separated: bounded, re, re2, multilingual, semantic")
+    run_parser.add_argument("--semantic-index", metavar="PREFIX")
+    run_parser.add_argument("--confusion", default="", help="Comma-separated engines to print a confusion matrix for")
+    run_parser.add_argument("--min-accuracy", type=float, default=None)
+    run_parser.add_argument("--max-p95-us", type=float, default=None)
+    run_parser.add_argument("--baseline", metavar="PATH", help="JSON of per-engine accuracy and p95 to compare with")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Write this run's results to --baseline")
+    run_parser.add_argument("--max-accuracy-drop", type=float, default=0.005)
+    run_parser.add_argument("--max-latency-growth", type=float, default=0.5, help="Allowed relative p95 increase")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        records = build_corpus(args.seed)
+        write_corpus(args.out, records, args.seed)
+        tags = Counter(tag for record in records for tag in record["tags"])
+        print(f"✅ Wrote {len(records)} queries to {args.out}: {dict(tags)}")
+        return
+
+    header, records = load_corpus(args.corpus)
+    print(f"📚 {args.corpus}: corpus v{header['version']}, {len(records)} queries")
+    engines = build_engines([name.strip() for name in args.engines.split(",") if name.strip()], args.semantic_index)
+    results = evaluate(engines, records)
+    print_report(results, args.confusion.split(","))
+
+    baseline = None
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("corpus_version") != header["version"]:
+            print(f"⚠️ Baseline was taken on corpus v{baseline.get('corpus_version')}; not comparing")
+            baseline = None
+    failures = check_limits(results, args.min_accuracy, args.max_p95_us, (baseline or {}).get("engines"),
+                            args.max_accuracy_drop, args.max_latency_growth)
+    if args.save_baseline and args.baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"corpus_version": header["version"],
+                       "engines": {result.name: result.summary() for result in results}}, f, indent=2)
+        print(f"\n💾 Baseline written to {args.baseline}")
+
+    if failures:
+        print("\n❌ Regressions:")
+        for failure in failures:
+            print(f"• {failure}")
+        sys.exit(1)
+    print("\n✅ Within limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Event-Driven Front-End for MRU Voice Chatbot
+============================================
+
+`MRUVoiceChatbot.run` blocks in `input()` or in `VoiceHandler.listen`,
+one at a time. This front-end runs the same conversation on an asyncio
+event loop that watches every source at once:
+
+- Keyboard: stdin is a reader on the loop (a reader thread where the
+  platform cannot select on stdin), so typing works while the microphone
+  is listening
+- Voice: a listener task captures and recognizes on a worker thread,
+  pausing while an answer is being spoken. Whichever input arrives first
+  wins the turn; a voice result that was still in flight when a typed
+  turn or an idle reset started is dropped as stale (it may have heard
+  the reset notice being spoken)
+- Turns run one at a time on a dedicated thread, so speaking an answer
+  never stalls the loop; input arriving meanwhile is queued
+- Timers: a session idle for `idle_timeout` seconds is reset so the next
+  visitor starts fresh, and housekeeping jobs (flushing logs, microphone
+  recalibration, memory polling) run only in idle gaps, never on the
+  request path
+
+Usage:
+    python mru_chatbot_system.py --event-loop [--idle-timeout 300]
+"""
+
+import asyncio
+import codecs
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from chatbot_logging import flush_logging, get_logger, turn_context
+from deadlines import PLEASE_REPEAT
+from mru_chatbot_system import MRUVoiceChatbot
+
+logger = get_logger("event_loop")
+
+IDLE_TIMEOUT_S = 300.0
+# Quiet time after the last input before housekeeping may run
+IDLE_GAP_S = 2.0
+# Housekeeping cadence while idle
+FLUSH_INTERVAL_S = 30.0
+RECALIBRATE_INTERVAL_S = 300.0
+
+IDLE_RESET_NOTICE = "This conversation was idle for a while, so I've started a fresh one. How can I help you?"
+
+
+class HousekeepingJob:
+    """A background task run at most every `interval` seconds, in idle gaps only"""
+
+    __slots__ = ("name", "interval", "func", "last_run", "runs", "seconds")
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.last_run = time.monotonic()
+        self.runs = 0
+        self.seconds = 0.0
+
+
+class EventLoopFrontEnd:
+    """Runs one MRUVoiceChatbot conversation on an asyncio loop over keyboard, voice and timers"""
+
+    def __init__(self, chatbot: MRUVoiceChatbot, idle_timeout: Optional[float] = IDLE_TIMEOUT_S,
+                 idle_gap: float = IDLE_GAP_S, memory_interval: float = 0.0):
+        self.chatbot = chatbot
+        self.idle_timeout = idle_timeout
+        self.idle_gap = idle_gap
+        self.jobs: Dict[str, HousekeepingJob] = {}
+        self.metrics = {"typed_turns": 0, "voice_turns": 0, "stale_voice_dropped": 0, "idle_resets": 0,
+                        "listen_errors": 0}
+        self.last_activity = time.monotonic()
+        # Bumped whenever a turn starts; voice captures begun earlier are stale
+        self.turn_seq = 0
+        self._turn_executor = ThreadPoolExecutor(1, thread_name_prefix="turn")
+        self._stdin_decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")(errors="replace")
+        self._stdin_pending = ""
+        self._recalibrate_due = False
+        self._session_has_turns = False
+
+        self.add_job("flush_logs", FLUSH_INTERVAL_S, flush_logging)
+        self.add_job("recalibrate", RECALIBRATE_INTERVAL_S, self._request_recalibration)
+        if memory_interval and chatbot.memory_monitor is not None:
+            self.add_job("memory", memory_interval, self._log_memory)
+
+    def add_job(self, name: str, interval: float, func: Callable[[], None]):
+        self.jobs[name] = HousekeepingJob(name, interval, func)
+
+    def run(self):
+        self.chatbot.welcome()
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            print("\n\n👋 Chatbot stopped by user. Goodbye!")
+        finally:
+            self._turn_executor.shutdown(wait=False)
+        logger.info("Event loop", extra=self.report())
+        self.chatbot.log_reports()
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.events: asyncio.Queue = asyncio.Queue()
+        # Set while no turn is running: the microphone must not hear our own answers
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.voice_wanted = asyncio.Event()
+        self._voice_taken = asyncio.Event()
+        self._sync_voice()
+
+        self._watch_stdin()
+        tasks = [asyncio.create_task(self._voice_listener()), asyncio.create_task(self._timers())]
+        self._prompt()
+        try:
+            while True:
+                source, text, deadline, seq = await self.events.get()
+                if source == "eof":
+                    break
+                if source == "voice":
+                    self._voice_taken.set()
+                    if seq != self.turn_seq:
+                        # A typed turn or an idle reset came first while this utterance was being captured
+                        self.metrics["stale_voice_dropped"] += 1
+                        continue
+                if await self._turn(source, text, deadline):
+                    break
+                self._prompt()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._unwatch_stdin()
+
+    async def _turn(self, source: str, text: Optional[str], deadline) -> bool:
+        self.turn_seq += 1
+        self.idle.clear()
+        self.last_activity = time.monotonic()
+        try:
+            return await self.loop.run_in_executor(self._turn_executor, self._run_turn, source, text, deadline)
+        finally:
+            self.last_activity = time.monotonic()
+            self._sync_voice()
+            self.idle.set()
+
+    def _run_turn(self, source: str, text: Optional[str], deadline) -> bool:
+        """One turn on the turn thread; returns True when the user asked to quit"""
+        chatbot = self.chatbot
+        with turn_context():
+            try:
+                if text is None:
+                    # Recognition ran out of time: ask again instead of waiting
+                    chatbot.provide_response(PLEASE_REPEAT)
+                    return False
+                self.metrics[f"{source}_turns"] += 1
+                self._session_has_turns = True
+                if source == "voice" and text.lower().strip() == "text":
+                    chatbot.voice_enabled = False
+                    logger.info("Switched to text mode")
+                    return False
+                return chatbot.take_turn(text, deadline)
+            finally:
+                if deadline is not None:
+                    chatbot.deadline_stats.finish_turn(deadline)
+
+    def _prompt(self):
+        if self.chatbot.voice_enabled:
+            print("\n🎤 Speak your question or type it:")
+        print("👤 You: ", end="", flush=True)
+
+    # Keyboard
+
+    def _watch_stdin(self):
+        try:
+            self.loop.add_reader(sys.stdin.fileno(), self._on_stdin)
+            self._stdin_reader = True
+        except (NotImplementedError, ValueError, OSError):
+            # e.g. Windows event loops cannot select on console handles
+            self._stdin_reader = False
+            threading.Thread(target=self._read_stdin_blocking, name="stdin", daemon=True).start()
+
+    def _unwatch_stdin(self):
+        if self._stdin_reader:
+            self.loop.remove_reader(sys.stdin.fileno())
+
+    def _on_stdin(self):
+        # Raw reads: a buffered readline() would hide pasted lines from the selector
+        data = os.read(sys.stdin.fileno(), 4096)
+        if not data:
+            self.loop.remove_reader(sys.stdin.fileno())
+            self._stdin_reader = False
+            self._put_line("")
+            return
+        lines = (self._stdin_pending + self._stdin_decoder.decode(data)).split("\n")
+        self._stdin_pending = lines.pop()
+        for line in lines:
+            self._put_line(line + "\n")
+
+    def _read_stdin_blocking(self):
+        while True:
+            line = sys.stdin.readline()
+            self.loop.call_soon_threadsafe(self._put_line, line)
+            if not line:
+                return
+
+    def _put_line(self, line: str):
+        if not line:
+            self.events.put_nowait(("eof", None, None, None))
+        elif line.strip():
+            self.events.put_nowait(("typed", line.strip(), None, None))
+
+    # Voice
+
+    def _sync_voice(self):
+        if self.chatbot.voice_enabled:
+            self.voice_wanted.set()
+        else:
+            self.voice_wanted.clear()
+
+    async def _voice_listener(self):
+        """Capture and recognize in a loop while voice mode is on and no turn is running"""
+        while True:
+            await self.voice_wanted.wait()
+            await self.idle.wait()
+            seq = self.turn_seq
+            deadline = self.chatbot.new_deadline()
+            try:
+                text = await self._in_daemon_thread(self._listen_once, deadline)
+            except Exception:
+                # A failed capture (e.g. a microphone OSError) must not end voice input for good
+                self.metrics["listen_errors"] += 1
+                logger.exception("Voice capture failed")
+                await asyncio.sleep(1.0)
+                continue
+            if text or (deadline is not None and ("recognize", "please_repeat") in deadline.degraded):
+                # Listen again only once the main loop has taken this utterance (and
+                # started its turn, which clears `idle`)
+                self._voice_taken.clear()
+                self.events.put_nowait(("voice", text, deadline, seq))
+                await self._voice_taken.wait()
+
+    def _in_daemon_thread(self, func: Callable, *args) -> asyncio.Future:
+        """Run a blocking call on a daemon thread, so a capture in progress never holds up exit"""
+        future = self.loop.create_future()
+
+        def deliver(result, error):
+            if not future.done():
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+        def target():
+            try:
+                result, error = func(*args), None
+            except Exception as e:
+                result, error = None, e
+            self.loop.call_soon_threadsafe(deliver, result, error)
+
+        threading.Thread(target=target, name="voice-capture", daemon=True).start()
+        return future
+
+    def _listen_once(self, deadline) -> Optional[str]:
+        handler = self.chatbot.voice_handler
+        if self._recalibrate_due:
+            self._recalibrate_due = False
+            handler.recalibrate()
+        return handler.listen(deadline=deadline)
+
+    def _request_recalibration(self):
+        # The microphone belongs to the voice thread; it recalibrates before its next capture
+        if self.chatbot.voice_enabled:
+            self._recalibrate_due = True
+
+    # Timers
+
+    async def _timers(self):
+        """Idle timeouts and housekeeping, ticking once a second"""
+        while True:
+            await asyncio.sleep(1.0)
+            if not self.idle.is_set():
+                continue
+            quiet = time.monotonic() - self.last_activity
+            if self.idle_timeout and quiet >= self.idle_timeout and self._session_has_turns:
+                await self._reset_idle_session()
+            elif quiet >= self.idle_gap:
+                self._run_due_job()
+
+    async def _reset_idle_session(self):
+        self._session_has_turns = False
+        self.metrics["idle_resets"] += 1
+        # A capture still running overlaps the spoken notice and may hear it: drop it as stale
+        self.turn_seq += 1
+        self.idle.clear()
+        try:
+            await self.loop.run_in_executor(self._turn_executor, self._reset_and_notify)
+        finally:
+            self.idle.set()
+        self._prompt()
+
+    def _reset_and_notify(self):
+        self.chatbot.reset_session()
+        print()
+        self.chatbot.provide_response(IDLE_RESET_NOTICE)
+
+    def _run_due_job(self):
+        """Run the most overdue housekeeping job, if any (one per tick keeps the loop responsive)"""
+        now = time.monotonic()
+        due = [job for job in self.jobs.values() if now - job.last_run >= job.interval]
+        if not due:
+            return
+        job = min(due, key=lambda job: job.last_run + job.interval)
+        start = time.perf_counter()
+        try:
+            job.func()
+        except Exception:
+            logger.exception("Housekeeping job failed", extra={"job": job.name})
+        job.seconds += time.perf_counter() - start
+        job.runs += 1
+        job.last_run = time.monotonic()
+
+    def _log_memory(self):
+        report = self.chatbot.memory_monitor.report(sites=0)
+        logger.info("Memory", extra={"rss_bytes": report["rss_bytes"],
+                                     "rss_growth_bytes": report["rss_growth_bytes"], "took_ms": report["took_ms"]})
+
+    def report(self) -> dict:
+        return dict(self.metrics, housekeeping={
+            job.name: {"runs": job.runs, "ms_total": round(job.seconds * 1000, 2)} for job in self.jobs.values()
+        })
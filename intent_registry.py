@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Intent Registry for MRU Voice Chatbot
+=====================================
+
+Single place where an intent is declared: its match patterns, the keyword
+rules that pick a response branch, and the handlers that render it as
+text and (optionally) as compact speech.
+
+- In code: `INTENTS.declare(...)` plus the `@INTENTS.renderer(...)` and
+  `@INTENTS.voice_renderer(...)` decorators
+- In a JSON config file: template intents whose text is filled in from the
+  knowledge base, so new intents need no code changes
+
+The dispatch table (pattern order, branch rules, renderers) is frozen once
+and reused by every classifier and response generator; nothing is rebuilt
+per turn. Each renderer also records which top-level knowledge sections it
+reads, so cached renderings can be dropped selectively when the knowledge
+base is edited (None means "any section").
+
+Config file format:
+    {"intents": [
+        {"name": "hostel_fees", "before": "fees",
+         "patterns": ["(?i)\\\\bhostel\\\\s*(fees?|charges)\\\\b"],
+         "branches": [["ac", ["ac", "air conditioned"]]],
+         "templates": {"default": "Hostel charges: {fees[hostel]}",
+                       "ac": "AC rooms: {fees[hostel_ac]}"}}
+    ]}
+"""
+
+import json
+import string
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+Renderer = Callable[[object, str], str]
+# Returns sentences to speak, most important first
+VoiceRenderer = Callable[[object, str], List[str]]
+
+
+class IntentConfigError(ValueError):
+    """An intent declaration or config entry is invalid"""
+
+
+class IntentSpec:
+    """Everything the chatbot knows about one intent"""
+
+    __slots__ = ("name", "patterns", "branch_rules", "variants", "renderer", "voice_renderer", "reads")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.patterns: List[str] = []
+        self.branch_rules: List[Tuple[str, List[str]]] = []
+        # Number of interchangeable responses picked at random (greeting, goodbye)
+        self.variants = 0
+        self.renderer: Optional[Renderer] = None
+        self.voice_renderer: Optional[VoiceRenderer] = None
+        # Top-level knowledge sections the renderers use; None if unknown
+        self.reads: Optional[Tuple[str, ...]] = None
+
+
+class DispatchTable:
+    """Frozen view of a registry used on the request path"""
+
+    def __init__(self, specs: List[IntentSpec]):
+        self.intent_patterns: Dict[str, List[str]] = {
+            spec.name: list(spec.patterns) for spec in specs if spec.patterns
+        }
+        self.branch_rules = {spec.name: list(spec.branch_rules) for spec in specs if spec.branch_rules}
+        self.variants = {spec.name: spec.variants for spec in specs if spec.variants}
+        self.renderers: Dict[str, Renderer] = {spec.name: spec.renderer for spec in specs if spec.renderer}
+        self.voice_renderers: Dict[str, VoiceRenderer] = {
+            spec.name: spec.voice_renderer for spec in specs if spec.voice_renderer
+        }
+        self.reads: Dict[str, Optional[frozenset]] = {
+            spec.name: None if spec.reads is None else frozenset(spec.reads) for spec in specs if spec.renderer
+        }
+
+
+def template_renderer(templates: Dict[str, str]) -> Renderer:
+    """Renderer that formats a per-branch template with the knowledge base"""
+    def render(generator, branch: str) -> str:
+        return templates.get(branch, templates["default"]).format(**generator.kb.knowledge)
+    return render
+
+
+def template_reads(templates: Dict[str, str]) -> Tuple[str, ...]:
+    """Knowledge sections referenced by template fields, e.g. {fees[hostel]} -> fees"""
+    sections = set()
+    for template in templates.values():
+        for _, field, _, _ in string.Formatter().parse(template):
+            if field:
+                sections.add(field.split("[", 1)[0].split(".", 1)[0])
+    return tuple(sorted(sections))
+
+
+class IntentRegistry:
+    """Ordered collection of intent declarations
+
+    Order matters: the classifier returns the first intent whose pattern
+    matches, so more specific intents are declared (or inserted) first.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, IntentSpec] = {}
+        self._table: Optional[DispatchTable] = None
+        self._lock = threading.Lock()
+        self.config_entries: List[dict] = []
+
+    def _spec(self, name: str, before: Optional[str] = None) -> IntentSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            spec = IntentSpec(name)
+            if before is None:
+                self._specs[name] = spec
+            elif before not in self._specs:
+                raise IntentConfigError(f"Cannot insert {name!r} before unknown intent {before!r}")
+            else:
+                ordered = list(self._specs.items())
+                index = [key for key, _ in ordered].index(before)
+                ordered.insert(index, (name, spec))
+                self._specs = dict(ordered)
+        self._table = None
+        return spec
+
+    def declare(self, name: str, patterns: List[str] = (), branches: List[Tuple[str, List[str]]] = (),
+                before: Optional[str] = None) -> IntentSpec:
+        """Declare (or extend) an intent's match patterns and branch rules"""
+        with self._lock:
+            spec = self._spec(name, before)
+            spec.patterns.extend(patterns)
+            spec.branch_rules.extend((branch, list(keywords)) for branch, keywords in branches)
+            return spec
+
+    def renderer(self, name: str, variants: int = 0, reads: Optional[Tuple[str, ...]] = None):
+        """Decorator registering `func(generator, branch) -> str` as an intent's handler
+
+        `reads` names the knowledge sections the handler depends on.
+        """
+        def register(func: Renderer) -> Renderer:
+            with self._lock:
+                spec = self._spec(name)
+                spec.renderer = func
+                spec.variants = variants
+                spec.reads = None if reads is None else tuple(reads)
+            return func
+        return register
+
+    def voice_renderer(self, name: str):
+        """Decorator registering `func(generator, branch) -> [sentence, ...]` as an intent's spoken form"""
+        def register(func: VoiceRenderer) -> VoiceRenderer:
+            with self._lock:
+                self._spec(name).voice_renderer = func
+            return func
+        return register
+
+    def add_templates(self, name: str, templates: Dict[str, str]):
+        """Handle an intent with knowledge-base templates, one per branch"""
+        if "default" not in templates:
+            raise IntentConfigError(f"Intent {name!r} needs a 'default' template")
+        with self._lock:
+            spec = self._spec(name)
+            spec.renderer = template_renderer(dict(templates))
+            spec.reads = template_reads(templates)
+
+    def load_entries(self, entries: List[dict]):
+        """Declare intents from config dicts (see module docstring)"""
+        for entry in entries:
+            if "name" not in entry:
+                raise IntentConfigError(f"Intent entry without a name: {entry}")
+            name = entry["name"]
+            if name not in self._specs and not entry.get("patterns"):
+                raise IntentConfigError(f"New intent {name!r} needs at least one pattern")
+            self.declare(name, entry.get("patterns", []), entry.get("branches", []), entry.get("before"))
+            if "templates" in entry:
+                self.add_templates(name, entry["templates"])
+            self.config_entries.append(entry)
+
+    def load_config(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            self.load_entries(json.load(f).get("intents", []))
+
+    def table(self) -> DispatchTable:
+        """The dispatch table, built on first use after any declaration"""
+        table = self._table
+        if table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = DispatchTable(list(self._specs.values()))
+                table = self._table
+        return table
+
+    def validate(self, knowledge: dict):
+        """Render every template branch once so config typos fail at startup"""
+        for entry in self.config_entries:
+            for branch, template in entry.get("templates", {}).items():
+                try:
+                    template.format(**knowledge)
+                except (KeyError, IndexError, AttributeError) as e:
+                    raise IntentConfigError(
+                        f"Template {entry['name']}/{branch} references missing knowledge {e}") from None
+
+
+# Built-in intents are declared in mru_chatbot_system; config files add to these
+INTENTS = IntentRegistry()
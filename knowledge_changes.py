@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Knowledge-Base Change Sets for MRU Voice Chatbot
+================================================
+
+Lets structures derived from `MRUKnowledgeBase.knowledge` (semantic index,
+rendered responses, pre-rendered fallbacks) follow edits incrementally
+instead of being rebuilt from scratch.
+
+- Knowledge is addressed by leaf paths, the same ones the semantic index
+  uses: "fees.approximate_annual_fees.btech",
+  "courses.undergraduate.law[2]"; an empty dict or list is a leaf too
+- Every edit produces a versioned ChangeSet listing the added, removed
+  and modified leaf paths, plus the new values so other worker processes
+  can replay it with `MRUKnowledgeBase.apply_changes`
+- Subscribers receive each change set and update only affected entries
+
+Diffing only walks the edited subtree, so a one-field fee change costs
+microseconds. An edit is applied to copies of the sections it touches and
+swapped in only when every path succeeded, so a bad path in a batch leaves
+the knowledge and its version untouched.
+
+Usage:
+    python knowledge_changes.py check [--edits 3000]
+"""
+
+import argparse
+import copy
+import random
+import re
+from typing import Dict, Iterable, List, Optional, Union
+
+Key = Union[str, int]
+
+_PATH_PART = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+class ChangeSet:
+    """Leaf paths touched by one knowledge-base version"""
+
+    __slots__ = ("version", "added", "removed", "modified", "values")
+
+    def __init__(self, version: int, added: List[str], removed: List[str], modified: List[str],
+                 values: Dict[str, object]):
+        self.version = version
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+        # New leaf values for added and modified paths
+        self.values = values
+
+    @property
+    def paths(self) -> List[str]:
+        return self.added + self.removed + self.modified
+
+    @property
+    def sections(self) -> set:
+        """Top-level knowledge sections touched"""
+        return {path_section(path) for path in self.paths}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def to_dict(self) -> dict:
+        return {"version": self.version, "added": self.added, "removed": self.removed,
+                "modified": self.modified, "values": self.values}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChangeSet":
+        return cls(data["version"], list(data["added"]), list(data["removed"]), list(data["modified"]),
+                   dict(data["values"]))
+
+    def __repr__(self):
+        return (f"ChangeSet(v{self.version}, +{len(self.added)} -{len(self.removed)} "
+                f"~{len(self.modified)})")
+
+
+def parse_path(path: str) -> List[Key]:
+    """'courses.undergraduate.law[2]' -> ['courses', 'undergraduate', 'law', 2]"""
+    keys = []
+    for name, index in _PATH_PART.findall(path):
+        keys.append(int(index) if index else name)
+    if not keys:
+        raise KeyError(f"Empty knowledge path {path!r}")
+    return keys
+
+
+def path_section(path: str) -> str:
+    return path.split(".", 1)[0].split("[", 1)[0]
+
+
+def leaf_paths(node, prefix: str = "") -> Dict[str, object]:
+    """Every scalar under node, keyed by its path, in document order
+
+    An empty dict or list is a leaf too (as a fresh empty container), so
+    emptying a section is an edit that replicas can replay.
+    """
+    leaves = {}
+    stack = [(prefix, node)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, (dict, list)) and not value:
+            if path:
+                leaves[path] = type(value)()
+        elif isinstance(value, dict):
+            stack.extend(reversed([(f"{path}.{key}" if path else key, item) for key, item in value.items()]))
+        elif isinstance(value, list):
+            stack.extend(reversed([(f"{path}[{index}]", item) for index, item in enumerate(value)]))
+        else:
+            leaves[path] = value
+    return leaves
+
+
+def get_path(knowledge: dict, path: str):
+    node = knowledge
+    for key in parse_path(path):
+        node = node[key]
+    return node
+
+
+def set_path(knowledge: dict, path: str, value):
+    """Assign value at path, creating dicts (and appending list items) on the way"""
+    keys = parse_path(path)
+    node = knowledge
+    for key, next_key in zip(keys, keys[1:]):
+        if isinstance(node, list):
+            if key == len(node):
+                node.append([] if isinstance(next_key, int) else {})
+        elif key not in node:
+            node[key] = [] if isinstance(next_key, int) else {}
+        node = node[key]
+    last = keys[-1]
+    if isinstance(node, list) and last == len(node):
+        node.append(value)
+    else:
+        node[last] = value
+
+
+def delete_path(knowledge: dict, path: str):
+    """Delete the value at path, then any containers the deletion left empty"""
+    keys = parse_path(path)
+    nodes = [knowledge]
+    for key in keys[:-1]:
+        nodes.append(nodes[-1][key])
+    for node, key in zip(reversed(nodes), reversed(keys)):
+        del node[key]
+        if node or node is knowledge:
+            break
+
+
+def diff_leaves(old: Dict[str, object], new: Dict[str, object], version: int) -> ChangeSet:
+    added = [path for path in new if path not in old]
+    removed = [path for path in old if path not in new]
+    modified = [path for path, value in new.items() if path in old and old[path] != value]
+    values = {path: new[path] for path in added + modified}
+    return ChangeSet(version, sorted(added), sorted(removed), sorted(modified), values)
+
+
+def removal_order(paths: Iterable[str]) -> List[str]:
+    """Highest list indexes first, so deleting one item never shifts another"""
+    return sorted(paths, key=lambda path: [(-key, "") if isinstance(key, int) else (0, key)
+                                           for key in parse_path(path)])
+
+
+def diff_root(path: str) -> str:
+    """Subtree an edit at path can change: a list item's edits shift its siblings"""
+    return re.sub(r"\[\d+\]$", "", path)
+
+
+def subtree_leaves(knowledge: dict, path: str) -> Dict[str, object]:
+    try:
+        return leaf_paths(get_path(knowledge, path), path)
+    except (KeyError, IndexError, TypeError):
+        return {}
+
+
+def empty_ancestors(knowledge: dict, path: str) -> Dict[str, object]:
+    """Empty containers above path: leaves that an edit at path fills in"""
+    leaves = {}
+    node, prefix = knowledge, ""
+    for key in parse_path(path)[:-1]:
+        try:
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            break
+        prefix = f"{prefix}[{key}]" if isinstance(key, int) else (f"{prefix}.{key}" if prefix else key)
+        if isinstance(node, (dict, list)) and not node:
+            leaves[prefix] = type(node)()
+    return leaves
+
+
+def describe(changeset: Optional[ChangeSet]) -> str:
+    if not changeset:
+        return "no changes"
+    parts = [f"{label} {', '.join(paths)}" for label, paths in
+             (("added", changeset.added), ("removed", changeset.removed), ("modified", changeset.modified)) if paths]
+    return f"v{changeset.version}: " + "; ".join(parts)
+
+
+# Batches in which a later path fails after earlier ones would already have been written
+INVALID_EDITS = [
+    ({"fees.approximate_annual_fees.btech": "INR 9,99,999", "facilities.sports[99]": "Polo"}, []),
+    ({}, ["fees.approximate_annual_fees", "fees.approximate_annual_fees.btech"]),
+    ({"fees.approximate_annual_fees.btech": "INR 9,99,999"}, ["fees.no_such_fee"]),
+]
+
+
+def check(edits: int = 3000, seed: int = 7) -> int:
+    """Apply INVALID_EDITS and random edits to a knowledge base; returns the number of failures
+
+    A failed edit must leave knowledge and version unchanged and publish
+    nothing; a successful one must replay identically on a replica.
+    """
+    from mru_chatbot_system import MRUKnowledgeBase
+
+    kb = MRUKnowledgeBase()
+    replica = MRUKnowledgeBase(knowledge=copy.deepcopy(kb.knowledge))
+    published = []
+    kb.subscribe(published.append)
+    rng = random.Random(seed)
+    cases = list(INVALID_EDITS)
+    for _ in range(edits):
+        paths = list(leaf_paths(kb.knowledge))
+        updates = {rng.choice(paths): f"value {rng.random():.3f}" for _ in range(rng.randint(0, 2))}
+        if rng.random() < 0.3:
+            # A list index past the end, or a key under a scalar
+            updates[f"{rng.choice(paths)}[{rng.randint(5, 99)}]"] = "bad"
+        removals = rng.sample(paths, rng.randint(0, 2))
+        cases.append((updates, removals))
+
+    failures = applied = 0
+    for updates, removals in cases:
+        before, version, count = copy.deepcopy(kb.knowledge), kb.version, len(published)
+        try:
+            changeset = kb.update(updates, removals)
+        except (KeyError, IndexError, TypeError):
+            if kb.knowledge != before or kb.version != version or len(published) != count:
+                failures += 1
+                print(f"✗ half-applied edit: updates {updates}, removals {removals}")
+                kb.knowledge, kb.version = copy.deepcopy(replica.knowledge), replica.version
+            continue
+        applied += 1
+        if changeset:
+            replica.apply_changes(ChangeSet.from_dict(copy.deepcopy(changeset.to_dict())))
+        if replica.knowledge != kb.knowledge:
+            failures += 1
+            print(f"✗ replica differs after {describe(changeset)}")
+            replica.knowledge, replica.version = copy.deepcopy(kb.knowledge), kb.version
+    print(f"📊 {len(cases)} edits ({applied} valid), {failures} failures")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge-base change set tools")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("--edits", type=int, default=3000, help="Random edits to apply after INVALID_EDITS")
+    args = parser.parse_args()
+    raise SystemExit(1 if check(args.edits) else 0)
+
+
+if __name__ == "__main__":
+    main()
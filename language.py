@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Language Support for MRU Voice Chatbot
+======================================
+
+Detects the language of each message and serves per-language resources:
+
+- LanguageDetector: script ranges plus a compact character-trigram model
+  that separates English from romanized Hindi (Hinglish) in microseconds.
+  Latin text is only called Hinglish when it also contains a Hindi
+  function word ("hai", "kya", "mujhe"), so English queries full of
+  Hindi-looking trigrams ("btech fees") stay English
+- LanguagePack: intent patterns, knowledge-base translations and a TTS
+  voice preference for one language
+- LanguageResources: loads each pack lazily on first use and records how
+  long it took and how much memory it added, so English-only workers pay
+  nothing for languages they never see
+
+Usage:
+    python language.py report
+    python language.py detect "fees kitni hai"
+    python language.py check [--corpus intent_corpus.v1.jsonl]
+"""
+
+import argparse
+import math
+import re
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from chatbot_logging import get_logger
+
+logger = get_logger("language")
+
+ENGLISH = "en"
+HINGLISH = "hi-Latn"
+HINDI = "hi"
+PUNJABI = "pa"
+URDU = "ur"
+
+# Unicode blocks that identify a language on their own
+SCRIPT_RANGES = [
+    (0x0900, 0x097F, HINDI),    # Devanagari
+    (0x0A00, 0x0A7F, PUNJABI),  # Gurmukhi
+    (0x0600, 0x06FF, URDU),     # Arabic script
+]
+
+# Seed text for the trigram model. Small on purpose: the model only has to
+# tell English from Hinglish, the two Latin-script languages we serve.
+TRAINING_TEXT = {
+    ENGLISH: [
+        "hello how are you", "i want to apply for admission", "what courses do you offer",
+        "how much are the fees", "tell me about placements", "what facilities do you have",
+        "how can i contact you", "what about campus life", "thank you for the information",
+        "tell me about the entrance exam", "what is the application process",
+        "are scholarships available", "which companies visit for recruitment",
+        "do you have a hostel for girls", "where is the university located",
+        "what is the highest package offered", "is there a library on campus",
+        "what are the eligibility requirements", "goodbye and thanks"
+    ],
+    HINGLISH: [
+        "mujhe admission ke baare mein batao", "fees kitni hai", "hostel ki suvidha hai kya",
+        "placement kaisa hai yahan", "kya aap mujhe courses ke baare mein bata sakte ho",
+        "main btech karna chahta hoon", "college kahan hai", "contact number kya hai",
+        "dhanyavaad", "namaste aap kaise ho", "scholarship milti hai kya", "exam kab hai",
+        "kitne paise lagenge", "hum kab apply kar sakte hain", "mera beta engineering karna chahta hai",
+        "aapka address kya hai", "yahan ka campus life kaisa hai", "bahut accha theek hai shukriya",
+        "kya hostel mein wifi hai", "naukri milegi kya", "padhai kaisi hoti hai", "mujhe bataiye"
+    ]
+}
+
+
+# Romanized Hindi words that do not occur in English queries; Hinglish needs one
+HINGLISH_WORDS = frozenset("""
+    hai hain kya ke ki ka mein mujhe hume humein aap aapka aapke kaise kaisa kaisi kitna kitni kitne
+    kahan kab kaun kaunsa kaunse batao bataiye bata chahiye chahta chahti karna karni hoga hogi liye
+    baare yahan wahan milega milegi milta milti hoon ho ji bhai accha acha theek shukriya dhanyavaad
+    namaskar nahi nahin sakte sakta lagega lagegi lagenge kharcha jaankari padhai naukri
+""".split())
+
+# Regression cases for `language.py check`: (text, expected language)
+DETECTION_CHECKS = [
+    ("can you explain mechanical engineering", ENGLISH),
+    ("btech fees", ENGLISH),
+    ("info on mechanical engineering please", ENGLISH),
+    ("Please explain your phone number please", ENGLISH),
+    ("Why shuold I choose MRU?", ENGLISH),
+    ("namaste", ENGLISH),
+    ("How much are the fees?", ENGLISH),
+    ("fees kitni hai", HINGLISH),
+    ("mujhe BBA course ki jaankari chahiye", HINGLISH),
+    ("admission ke baare mein batao", HINGLISH),
+    ("dakhila kaise milega", HINGLISH),
+    ("फीस कितनी है", HINDI),
+]
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f" {' '.join(re.findall(r'[a-z]+', text.lower()))} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class LanguageDetector:
+    """Script check, then a character-trigram log-odds model for Latin text"""
+
+    def __init__(self, training_text: Dict[str, List[str]] = None):
+        training_text = training_text or TRAINING_TEXT
+        counts = {}
+        for language, sentences in training_text.items():
+            language_counts: Dict[str, int] = {}
+            for sentence in sentences:
+                for gram in trigrams(sentence):
+                    language_counts[gram] = language_counts.get(gram, 0) + 1
+            counts[language] = language_counts
+
+        # Pre-compute one log-odds weight per trigram: positive favours Hinglish
+        vocabulary = set(counts[ENGLISH]) | set(counts[HINGLISH])
+        totals = {language: sum(c.values()) + len(vocabulary) for language, c in counts.items()}
+        self.weights = {
+            gram: math.log((counts[HINGLISH].get(gram, 0) + 1) / totals[HINGLISH])
+            - math.log((counts[ENGLISH].get(gram, 0) + 1) / totals[ENGLISH])
+            for gram in vocabulary
+        }
+
+    def detect(self, text: str) -> str:
+        """Return a language code for text (English when unsure)"""
+        for char in text:
+            code = ord(char)
+            if code >= 0x0600:
+                for low, high, language in SCRIPT_RANGES:
+                    if low <= code <= high:
+                        return language
+
+        if HINGLISH_WORDS.isdisjoint(re.findall(r"[a-z]+", text.lower())):
+            return ENGLISH
+        weights = self.weights
+        score = 0.0
+        for gram in trigrams(text):
+            score += weights.get(gram, 0.0)
+        return HINGLISH if score > 1.0 else ENGLISH
+
+
+class LanguagePack:
+    """Everything the chatbot needs to serve one language"""
+
+    def __init__(self, code: str, intent_patterns: Dict[str, List[str]],
+                 translations: Dict[str, str], voice_hints: List[str]):
+        self.code = code
+        self.intent_patterns = intent_patterns
+        self.compiled_patterns = [
+            (intent, [re.compile(pattern) for pattern in patterns])
+            for intent, patterns in intent_patterns.items()
+        ]
+        self.translations = translations
+        self.voice_hints = voice_hints
+        self._voice_id: Optional[str] = None
+        self._voice_resolved = False
+
+    def classify_intent(self, text: str) -> Optional[str]:
+        lowered = text.lower()
+        for intent, patterns in self.compiled_patterns:
+            for pattern in patterns:
+                if pattern.search(lowered):
+                    return intent
+        return None
+
+    def translate(self, intent: str, knowledge: dict) -> Optional[str]:
+        """Short localized answer for intent, filled in from the knowledge base"""
+        template = self.translations.get(intent)
+        if template is None:
+            return None
+        return template.format(**knowledge)
+
+    def voice_id(self, tts_engine) -> Optional[str]:
+        """TTS voice for this language, looked up on first use"""
+        if not self._voice_resolved:
+            self._voice_resolved = True
+            for voice in tts_engine.getProperty("voices"):
+                labels = " ".join([voice.name or ""] + [str(lang) for lang in (voice.languages or [])]).lower()
+                if any(hint in labels for hint in self.voice_hints):
+                    self._voice_id = voice.id
+                    break
+        return self._voice_id
+
+
+def load_hinglish() -> LanguagePack:
+    return LanguagePack(
+        HINGLISH,
+        intent_patterns={
+            "greeting": [r"\b(namaste|namaskar|kaise\s+ho)\b"],
+            "fees": [r"\b(kitni\s+fees|fees\s+kitni|kitne\s+paise|kharcha)\b"],
+            "admission_info": [r"\b(admission\s+kaise|dakhila|pravesh|apply\s+kaise)\b"],
+            "facilities": [r"\b(rehne|rahne|hostel\s+(hai|milega)|suvidha)\b"],
+            "placements": [r"\b(naukri|placement\s+kaisa|package\s+kitna)\b"],
+            "courses": [r"\b(padhai|kaunse\s+course|course\s+kaunse)\b"],
+            "contact": [r"\b(kahan\s+hai|number\s+kya|sampark)\b"],
+            "goodbye": [r"\b(dhanyavaad|dhanyawad|shukriya|alvida)\b"]
+        },
+        translations={
+            "fees": "B.Tech ki saalana fees lagbhag {fees[approximate_annual_fees][btech]} hai. "
+                    "MRNAT ke basis par 100% tak scholarship mil sakti hai.",
+            "admission_info": "Admission MRNAT exam ke through hota hai. Application fee {fees[application_fee]} hai.",
+            "facilities": "Ladkon aur ladkiyon ke liye alag hostel hain, 24/7 WiFi ke saath.",
+            "placements": "Sabse uncha package {placements[statistics][highest_package]} raha hai.",
+            "contact": "Admissions ke liye call karein: {contact_info[main_numbers][admissions]}."
+        },
+        voice_hints=["hi_in", "hindi", "hi-in"]
+    )
+
+
+def load_hindi() -> LanguagePack:
+    return LanguagePack(
+        HINDI,
+        intent_patterns={
+            "greeting": [r"(नमस्ते|नमस्कार|हेलो)"],
+            "fees": [r"(फीस|शुल्क|कितने\s*पैसे)"],
+            "admission_info": [r"(प्रवेश|दाखिला|एडमिशन)"],
+            "courses": [r"(कोर्स|पाठ्यक्रम|पढ़ाई)"],
+            "facilities": [r"(हॉस्टल|छात्रावास|सुविधा)"],
+            "placements": [r"(प्लेसमेंट|नौकरी|पैकेज)"],
+            "contact": [r"(संपर्क|फोन|पता)"],
+            "goodbye": [r"(धन्यवाद|शुक्रिया|अलविदा)"]
+        },
+        translations={
+            "fees": "बी.टेक की वार्षिक फीस लगभग {fees[approximate_annual_fees][btech]} है।",
+            "admission_info": "प्रवेश MRNAT परीक्षा के माध्यम से होता है। आवेदन शुल्क {fees[application_fee]} है।",
+            "facilities": "लड़कों और लड़कियों के लिए अलग छात्रावास हैं।",
+            "placements": "सबसे ऊँचा पैकेज {placements[statistics][highest_package]} रहा है।",
+            "contact": "प्रवेश के लिए कॉल करें: {contact_info[main_numbers][admissions]}"
+        },
+        voice_hints=["hi_in", "hindi", "hi-in"]
+    )
+
+
+# Loaders are only called the first time a language is actually seen
+PACK_LOADERS: Dict[str, Callable[[], LanguagePack]] = {
+    HINGLISH: load_hinglish,
+    HINDI: load_hindi,
+}
+
+
+class LanguageResources:
+    """Lazily loaded language packs with per-language load cost accounting"""
+
+    def __init__(self, loaders: Dict[str, Callable[[], LanguagePack]] = None, measure_memory: bool = True):
+        self.loaders = loaders or PACK_LOADERS
+        self.measure_memory = measure_memory
+        self.packs: Dict[str, LanguagePack] = {}
+        self.load_stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> Optional[LanguagePack]:
+        pack = self.packs.get(code)
+        if pack is not None or code not in self.loaders:
+            return pack
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            pack = self.packs.get(code)
+            if pack is None:
+                pack = self._load(code)
+        return pack
+
+    def _load(self, code: str) -> LanguagePack:
+        tracing = self.measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        start = time.perf_counter()
+        pack = self.loaders[code]()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        added = tracemalloc.get_traced_memory()[0] - before if tracemalloc.is_tracing() else 0
+        if tracing:
+            tracemalloc.stop()
+
+        self.packs[code] = pack
+        self.load_stats[code] = {"load_ms": round(elapsed_ms, 3), "memory_bytes": added}
+        logger.info("Loaded language pack", extra={"language": code, **self.load_stats[code]})
+        return pack
+
+
+class LanguageLayer:
+    """Detects the language of a message and routes it to the right resources"""
+
+    def __init__(self, base_classifier, detector: LanguageDetector = None,
+                 resources: LanguageResources = None):
+        self.base_classifier = base_classifier
+        self.detector = detector or LanguageDetector()
+        self.resources = resources or LanguageResources()
+
+    def classify(self, text: str) -> Tuple[str, str]:
+        """Return (intent, language); English goes straight to the base classifier"""
+        language = self.detector.detect(text)
+        if language != ENGLISH:
+            pack = self.resources.get(language)
+            if pack is not None:
+                intent = pack.classify_intent(text)
+                if intent is not None:
+                    return intent, language
+        # Code-mixed text usually keeps English keywords ("hostel", "fees")
+        return self.base_classifier.classify_intent(text), language
+
+    def translate(self, intent: str, language: str, knowledge: dict) -> Optional[str]:
+        if language == ENGLISH:
+            return None
+        pack = self.resources.get(language)
+        return pack.translate(intent, knowledge) if pack is not None else None
+
+
+def report():
+    """Detection speed plus per-language startup cost and memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    detector = LanguageDetector()
+    build_ms = (time.perf_counter() - start) * 1000
+    detector_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"• Detector: built in {build_ms:.2f} ms, {detector_bytes / 1024:.1f} KiB, {len(detector.weights)} trigrams")
+
+    samples = ["How much are the fees?", "fees kitni hai bhai", "हॉस्टल की फीस कितनी है",
+               "Tell me about placements at MRU", "mujhe hostel ke baare mein batao"]
+    iterations = 20000
+    start = time.perf_counter()
+    for i in range(iterations):
+        detector.detect(samples[i % len(samples)])
+    print(f"• Detection: {(time.perf_counter() - start) / iterations * 1e6:.1f} µs per message")
+    for sample in samples:
+        print(f"    {detector.detect(sample):<8} {sample}")
+
+    resources = LanguageResources()
+    for code in PACK_LOADERS:
+        resources.get(code)
+        stats = resources.load_stats[code]
+        print(f"• Pack {code:<8} loaded in {stats['load_ms']:.2f} ms, {stats['memory_bytes'] / 1024:.1f} KiB")
+
+
+def check(corpus_path: Optional[str] = None) -> int:
+    """Run DETECTION_CHECKS, plus every record of an intent corpus; returns the number of failures
+
+    Corpus records tagged code_mixed or native are expected to be non-English,
+    all others English.
+    """
+    detector = LanguageDetector()
+    cases = list(DETECTION_CHECKS)
+    if corpus_path:
+        import json
+        with open(corpus_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f][1:]
+        cases += [(record["text"], None if {"code_mixed", "native"} & set(record["tags"]) else ENGLISH)
+                  for record in records]
+    failures = 0
+    for text, expected in cases:
+        detected = detector.detect(text)
+        if (detected != expected) if expected is not None else detected == ENGLISH:
+            failures += 1
+            print(f"✗ {text!r}: detected {detected}, expected {expected or 'not en'}")
+    print(f"📊 {len(cases) - failures}/{len(cases)} detections as expected")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MRU chatbot language layer")
+    parser.add_argument("command", choices=["report", "detect", "check"])
+    parser.add_argument("text", nargs="*")
+    parser.add_argument("--corpus", metavar="PATH", help="With check: also check an intent corpus (JSONL)")
+    args = parser.parse_args()
+
+    if args.command == "report":
+        report()
+    elif args.command == "check":
+        raise SystemExit(1 if check(args.corpus) else 0)
+    else:
+        print(LanguageDetector().detect(" ".join(args.text)))
+
+
+if __name__ == "__main__":
+    main()
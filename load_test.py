@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Load Generator for MRU Voice Chatbot
+====================================
+
+Drives many concurrent virtual users through realistic multi-turn
+conversations and reports throughput, latency percentiles and error rate
+while concurrency ramps up.
+
+Conversation scripts are seeded from the query lists in demo.py and
+expanded with rule-based paraphrases. Users can be driven either
+in-process against the chatbot components or against a server endpoint
+that accepts POST {"session_id": ..., "message": ...} as JSON.
+
+Usage:
+    python load_test.py --ramp 1,4,16,64 --duration 10
+    python load_test.py --url http://localhost:8000/chat --ramp 8,32
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from demo import ADMISSION_QUERIES, COURSE_QUERIES, FEE_QUERIES, PLACEMENT_QUERIES, SAMPLE_SESSION_QUERIES
+
+SEED_SCRIPTS = [
+    ADMISSION_QUERIES,
+    COURSE_QUERIES,
+    PLACEMENT_QUERIES,
+    FEE_QUERIES,
+    SAMPLE_SESSION_QUERIES
+]
+
+# Word-level substitutions used to paraphrase the seed queries
+SYNONYMS = {
+    "fees": ["fee structure", "cost", "tuition"],
+    "courses": ["programs", "degrees"],
+    "programs": ["courses", "degrees"],
+    "placements": ["placement record", "jobs after graduation"],
+    "admissions": ["admission", "the application"],
+    "tell me about": ["what about", "can you explain", "info on"],
+    "what is": ["what's", "explain"],
+    "hello": ["hi", "hey", "namaste"],
+    "thank you": ["thanks", "thanks a lot"],
+    "b.tech": ["btech", "B Tech"]
+}
+
+PREFIXES = ["", "", "Please ", "Hey, ", "Can you tell me: ", "I want to know "]
+SUFFIXES = ["", "", "?", " please", " for 2025"]
+
+
+def paraphrase(query: str, rng: random.Random) -> str:
+    """Produce a surface variant of query with the same intent"""
+    text = query
+    lowered = text.lower()
+    for phrase, options in SYNONYMS.items():
+        index = lowered.find(phrase)
+        if index != -1 and rng.random() < 0.6:
+            replacement = rng.choice(options)
+            text = text[:index] + replacement + text[index + len(phrase):]
+            lowered = text.lower()
+    if rng.random() < 0.3:
+        text = text.lower()
+    prefix, suffix = rng.choice(PREFIXES), rng.choice(SUFFIXES)
+    if prefix:
+        text = text[:1].lower() + text[1:]
+    if suffix:
+        text = text.rstrip("?.!")
+    return f"{prefix}{text}{suffix}".strip()
+
+
+def build_scripts(paraphrases_per_script: int = 10, seed: int = 7) -> List[List[str]]:
+    """Seed scripts plus paraphrased copies of each"""
+    rng = random.Random(seed)
+    scripts = [list(script) for script in SEED_SCRIPTS]
+    for script in SEED_SCRIPTS:
+        for _ in range(paraphrases_per_script):
+            scripts.append([paraphrase(query, rng) for query in script])
+    return scripts
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0 for no samples)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class InProcessTarget:
+    """Virtual users talk directly to one shared ChatEngine in this process
+
+    Each virtual user gets its own SessionContext, like a real session would.
+    """
+
+    def __init__(self):
+        from mru_chatbot_system import ChatEngine
+        self.engine = ChatEngine()
+        self._sessions: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = self.engine.new_session(session_id)
+            return session
+
+    def send(self, session_id: str, message: str) -> str:
+        return self.engine.respond(self._session(session_id), message)[1]
+
+    def end_session(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class HttpTarget:
+    """Virtual users POST JSON messages to a chatbot server endpoint"""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, session_id: str, message: str) -> str:
+        payload = json.dumps({"session_id": session_id, "message": message}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=payload, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as reply:
+            return reply.read().decode("utf-8")
+
+    def end_session(self, session_id: str):
+        pass
+
+
+class StepResult:
+    """Measurements collected for one concurrency level"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.users_started = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            if ok:
+                self.latencies.append(latency)
+            else:
+                self.errors += 1
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    def summary(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "users": self.users_started,
+            "requests": self.requests,
+            "throughput_rps": self.requests / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p90_ms": percentile(self.latencies, 90) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "error_rate": self.errors / self.requests if self.requests else 0.0
+        }
+
+
+class LoadGenerator:
+    """Runs virtual users against a target at increasing concurrency levels"""
+
+    def __init__(self, target, scripts: List[List[str]], think_time: float = 0.5,
+                 arrival_rate: Optional[float] = None, seed: int = 11):
+        self.target = target
+        self.scripts = scripts
+        self.think_time = think_time
+        self.arrival_rate = arrival_rate
+        self.rng = random.Random(seed)
+        self._user_counter = 0
+
+    def _think(self):
+        if self.think_time > 0:
+            # Exponentially distributed pauses, like real users reading answers
+            time.sleep(self.rng.expovariate(1.0 / self.think_time))
+
+    def _run_user(self, user_id: str, script: List[str], result: StepResult, deadline: float):
+        for message in script:
+            if time.perf_counter() >= deadline:
+                break
+            start = time.perf_counter()
+            try:
+                self.target.send(user_id, message)
+                result.record(time.perf_counter() - start, True)
+            except Exception:
+                result.record(time.perf_counter() - start, False)
+            self._think()
+        self.target.end_session(user_id)
+
+    def run_step(self, concurrency: int, duration: float) -> StepResult:
+        """Keep up to `concurrency` users active for `duration` seconds
+
+        With an arrival rate, new users arrive as a Poisson process (open
+        model); without one, a new user starts as soon as a slot frees up.
+        """
+        result = StepResult(concurrency)
+        slots = threading.Semaphore(concurrency)
+        start = time.perf_counter()
+        deadline = start + duration
+
+        def user_done(_future):
+            slots.release()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while time.perf_counter() < deadline:
+                if self.arrival_rate:
+                    time.sleep(self.rng.expovariate(self.arrival_rate))
+                if not slots.acquire(timeout=max(0.0, deadline - time.perf_counter())):
+                    break
+                self._user_counter += 1
+                result.users_started += 1
+                script = self.rng.choice(self.scripts)
+                future = pool.submit(self._run_user, f"vu-{self._user_counter}", script, result, deadline)
+                future.add_done_callback(user_done)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def ramp(self, levels: List[int], duration: float) -> List[StepResult]:
+        return [self.run_step(level, duration) for level in levels]
+
+
+def print_report(results: List[StepResult]):
+    print(f"\n{'users':>6} {'reqs':>7} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for result in results:
+        s = result.summary()
+        print(f"{s['concurrency']:>6} {s['requests']:>7} {s['throughput_rps']:>9.1f} "
+              f"{s['p50_ms']:>8.2f} {s['p90_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['error_rate']:>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-user load generator for the MRU chatbot")
+    parser.add_argument("--url", help="Server endpoint; omit to drive the chatbot in-process")
+    parser.add_argument("--ramp", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between turns (s)")
+    parser.add_argument("--arrival-rate", type=float, default=None, help="New users per second (open model)")
+    parser.add_argument("--paraphrases", type=int, default=10, help="Paraphrased copies per seed script")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    generator = LoadGenerator(target, build_scripts(args.paraphrases),
+                              think_time=args.think_time, arrival_rate=args.arrival_rate)
+    levels = [int(level) for level in args.ramp.split(",") if level.strip()]
+
+    print(f"🚦 Ramping through {levels} concurrent users, {args.duration:.0f}s each...")
+    results = generator.ramp(levels, args.duration)
+
+    if args.json:
+        print(json.dumps([result.summary() for result in results], indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Memory Introspection for MRU Voice Chatbot
+==========================================
+
+Answers "what is this bot holding on to?" for a running chatbot.
+
+- Deep size of each component: knowledge base, classifier, response
+  generator, semantic index, language packs, conversation history and
+  context, paraphrase and transcript caches and voice handler. Objects
+  reachable from several components are counted once, for the first
+  component listed
+- Process RSS, and growth of every figure since the monitor started
+- Top allocation sites by growth (tracemalloc), when tracing is on.
+  Tracing slows every allocation, so it is opt-in (`--memory-trace`);
+  without it a report is a deep walk of the components only, cheap
+  enough to poll
+
+Usage:
+    python mru_chatbot_system.py --memory-trace --memory-log 60   # then say "memory"
+    python memory_report.py --turns 2000 --trace
+"""
+
+import argparse
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from chatbot_logging import get_logger
+
+logger = get_logger("memory")
+
+# Shared code and type objects are not part of any component's footprint
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType, threading.Thread)
+
+# Bound on objects visited per component, so a huge foreign object graph
+# (e.g. a spaCy pipeline) cannot stall a poll
+MAX_OBJECTS = 500_000
+
+
+def deep_size(root, seen: Optional[set] = None, max_objects: int = MAX_OBJECTS) -> Tuple[int, int]:
+    """Bytes reachable from root not already in `seen`; returns (bytes, objects visited)"""
+    seen = set() if seen is None else seen
+    getsizeof = sys.getsizeof
+    total = count = 0
+    stack = [root]
+    while stack and count < max_objects:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        count += 1
+        total += getsizeof(obj, 0)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool, complex, memoryview)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for slot in getattr(type(obj), "__slots__", ()):
+                stack.append(getattr(obj, slot, None))
+    return total, count
+
+
+def chatbot_components(chatbot) -> Dict[str, object]:
+    """Components worth sizing, in counting order (shared data goes to the first)"""
+    engine, session = chatbot.engine, chatbot.session
+    voice_handler = getattr(chatbot, "voice_handler", None)
+    components = {
+        "knowledge_base": engine.knowledge_base,
+        "intent_classifier": engine.intent_classifier,
+        "response_generator": engine.response_generator,
+        "semantic_index": engine.semantic_index,
+        "language_packs": engine.language_layer,
+        "conversation_manager": session.conversation_manager,
+        "conversation_context": session.conversation_context,
+        "paraphrase_cache": engine.paraphrase_cache,
+        "transcript_cache": getattr(voice_handler, "transcript_cache", None),
+        "audio_preprocessor": getattr(voice_handler, "preprocessor", None),
+        "voice_handler": voice_handler,
+    }
+    return {name: component for name, component in components.items() if component is not None}
+
+
+def process_rss() -> int:
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryMonitor:
+    """Per-component footprint of one chatbot, relative to when monitoring started"""
+
+    def __init__(self, chatbot, trace: bool = False, frames: int = 10):
+        self.chatbot = chatbot
+        self.trace = trace
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.started = time.time()
+        self.baseline_rss = process_rss()
+        self.baseline_sizes = self.component_sizes()
+        self.baseline_snapshot = self._snapshot() if trace else None
+        self._poller = None
+
+    def component_sizes(self) -> Dict[str, int]:
+        seen = set()
+        return {name: deep_size(component, seen)[0] for name, component in chatbot_components(self.chatbot).items()}
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+
+    def report(self, sites: int = 10) -> dict:
+        """Sizes now and growth since start; top `sites` allocation sites when tracing"""
+        start = time.perf_counter()
+        sizes = self.component_sizes()
+        rss = process_rss()
+        report = {
+            "uptime_s": round(time.time() - self.started, 1),
+            "rss_bytes": rss,
+            "rss_growth_bytes": rss - self.baseline_rss,
+            "components": {
+                name: {"bytes": size, "growth_bytes": size - self.baseline_sizes.get(name, 0)}
+                for name, size in sizes.items()
+            },
+            "gc_objects": len(gc.get_objects()),
+        }
+        if self.trace and tracemalloc.is_tracing() and sites:
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_bytes"], report["traced_peak_bytes"] = current, peak
+            report["top_sites"] = [
+                {"site": str(stat.traceback[0]), "bytes": stat.size, "growth_bytes": stat.size_diff,
+                 "count": stat.count}
+                for stat in self._snapshot().compare_to(self.baseline_snapshot, "lineno")[:sites]
+            ]
+        report["took_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return report
+
+    def start_polling(self, interval: float):
+        """Log a report (without allocation sites) every `interval` seconds"""
+        def poll():
+            while True:
+                time.sleep(interval)
+                report = self.report(sites=0)
+                logger.info("Memory", extra={
+                    "rss_bytes": report["rss_bytes"],
+                    "rss_growth_bytes": report["rss_growth_bytes"],
+                    "components": {name: sizes["bytes"] for name, sizes in report["components"].items()},
+                    "took_ms": report["took_ms"]
+                })
+        self._poller = threading.Thread(target=poll, name="memory-poller", daemon=True)
+        self._poller.start()
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:,.1f} KiB"
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Memory after {report['uptime_s']:.0f}s: RSS {report['rss_bytes'] / 2 ** 20:.1f} MiB "
+             f"({report['rss_growth_bytes'] / 2 ** 20:+.1f} MiB since start)"]
+    for name, sizes in sorted(report["components"].items(), key=lambda item: -item[1]["bytes"]):
+        lines.append(f"• {name:<22} {_kib(sizes['bytes']):>14}  {sizes['growth_bytes'] / 1024:+,.1f} KiB")
+    if "top_sites" in report:
+        lines.append(f"Top allocation sites by growth (traced {_kib(report['traced_bytes'])}):")
+        for site in report["top_sites"]:
+            lines.append(f"• {site['growth_bytes'] / 1024:+9,.1f} KiB  {site['site']}")
+    lines.append(f"(report took {report['took_ms']:.1f} ms)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Component memory of a chatbot driven through many turns")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--trace", action="store_true", help="Also report allocation sites (tracemalloc)")
+    parser.add_argument("--polls", type=int, default=20, help="Reports timed to measure polling cost")
+    args = parser.parse_args()
+
+    from load_test import build_scripts
+    from mru_chatbot_system import MRUVoiceChatbot
+
+    chatbot = MRUVoiceChatbot(voice_enabled=False)
+    monitor = MemoryMonitor(chatbot, trace=args.trace)
+    queries = [query for script in build_scripts() for query in script]
+    for i in range(args.turns):
+        chatbot.respond(queries[i % len(queries)])
+    print(f"📊 After {args.turns} turns\n")
+    print(format_report(monitor.report()))
+
+    start = time.perf_counter()
+    for _ in range(args.polls):
+        monitor.report(sites=0)
+    print(f"\n⏱️ Poll without allocation sites: {(time.perf_counter() - start) * 1000 / args.polls:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,849 +1,1847 @@
-(cd "$(git rev-parse --show-toplevel)" && git apply --3way <<'EOF'
-diff --git a/mru_chatbot_system.py b/mru_chatbot_system.py
---- a/mru_chatbot_system.py
-+++ b/mru_chatbot_system.py
-@@ -0,0 +1,842 @@
-+#!/usr/bin/env python3
-+"""
-+Voice-Enabled Chatbot for Manav Rachna University
-+==================================================
-+
-+A comprehensive chatbot system that provides information about MRU using voice recognition,
-+natural language processing, and text-to-speech capabilities.
-+
-+Features:
-+- Voice input/output support
-+- Comprehensive MRU knowledge base
-+- Intent classification
-+- Context-aware responses
-+- Multi-turn conversation support
-+- Emergency contact integration
-+"""
-+
-+import json
-+import logging
-+import re
-+import random
-+import sqlite3
-+from datetime import datetime
-+from typing import Dict, List, Tuple, Optional
-+import threading
-+import queue
-+
-+# Core libraries
-+try:
-+    import speech_recognition as sr
-+    import pyttsx3
-+    import spacy
-+    from sklearn.feature_extraction.text import TfidfVectorizer
-+    from sklearn.metrics.pairwise import cosine_similarity
-+    import numpy as np
-+    print("All required libraries imported successfully!")
-+except ImportError as e:
-+    print(f"Missing required library: {e}")
-+    print("Please install with: pip install speechrecognition pyttsx3 spacy scikit-learn numpy")
-+    print("Also run: python -m spacy download en_core_web_sm")
-+
-+
-+class MRUKnowledgeBase:
-+    """Comprehensive knowledge base for Manav Rachna University"""
-+    
-+    def __init__(self):
-+        self.knowledge = {
-+            "university_info": {
-+                "name": "Manav Rachna University",
-+                "type": "State Private University",
-+                "established": "2014 (evolved from Manav Rachna College of Engineering established in 2004)",
-+                "location": "Sector 43, Aravalli Hills, Delhi-Surajkund Road, Faridabad, Haryana 121004",
-+                "recognition": "UGC recognized under Section 2(f), NAAC A++ accredited",
-+                "motto": "Creating a better human being",
-+                "ranking": "Ranked No. 1 for Research and Placement among emerging universities"
-+            },
-+            
-+            "admissions": {
-+                "entrance_test": {
-+                    "name": "MRNAT (Manav Rachna National Aptitude Test)",
-+                    "description": "Entrance cum Scholarship Test for UG and PG programs",
-+                    "duration": "90 minutes",
-+                    "format": "Online objective-type examination",
-+                    "sections_ug": ["Arithmetic & Logical Reasoning (25 MCQs)", "General English (25 MCQs)", "General Awareness (25 MCQs)"],
-+                    "sections_pg": ["Arithmetic & Logical Reasoning (15 MCQs)", "Verbal Ability (15 MCQs)", "General Awareness (15 MCQs)", "Domain Specific (30 Questions)"],
-+                    "dates_2025": "Phase I: January 18, 2025 | Phase II: April 20, 2025"
-+                },
-+                "application_process": [
-+                    "Visit official website and click 'Apply Now'",
-+                    "Fill online application form with accurate information",
-+                    "Upload required documents (photo, certificates)",
-+                    "Pay application fee of INR 1,200",
-+                    "Take MRNAT exam",
-+                    "Attend Vision & Values Round (VVR)",
-+                    "Physical counseling if selected",
-+                    "Fee payment and admission confirmation"
-+                ],
-+                "scholarships": {
-+                    "utkarsh_scheme": "For admissions from 25th January 2025 to 29th April 2025",
-+                    "uttam_scheme": "For admissions from 30th April 2025 to 30th June 2025",
-+                    "percentage": "Up to 100% tuition fee waiver based on MRNAT performance",
-+                    "merit_scholarships": "Available for top performers in each semester"
-+                }
-+            },
-+            
-+            "courses": {
-+                "undergraduate": {
-+                    "engineering": [
-+                        "B.Tech Computer Science & Engineering",
-+                        "B.Tech Electronics & Communication",
-+                        "B.Tech Mechanical Engineering",
-+                        "B.Tech Civil Engineering",
-+                        "B.Tech Biotechnology",
-+                        "B.Tech Robotics and AI (with L&T)",
-+                        "B.Tech Cyber Security (with Quick Heal)",
-+                        "B.Tech Data Science (with Xebia)",
-+                        "B.Tech Cloud Computing (with Microsoft)"
-+                    ],
-+                    "management": [
-+                        "BBA Finance & Accounts",
-+                        "BBA Entrepreneurship & Family Business",
-+                        "BBA Global Operations Management",
-+                        "BBA Health Care Management",
-+                        "BBA Business Analytics (with ISDC)",
-+                        "BBA Banking & Financial Markets"
-+                    ],
-+                    "law": [
-+                        "BA LLB (Hons)",
-+                        "BBA LLB (Hons)",
-+                        "BCom LLB (Hons)",
-+                        "LLB"
-+                    ],
-+                    "sciences": [
-+                        "B.Sc (Hons) Mathematics",
-+                        "B.Sc (Hons) Physics", 
-+                        "B.Sc (Hons) Chemistry",
-+                        "B.Sc (Hons) Microbiology",
-+                        "B.Sc Food Science & Technology"
-+                    ],
-+                    "other": [
-+                        "BCA (with specializations)",
-+                        "B.Ed",
-+                        "Integrated B.A. B.Ed",
-+                        "Integrated B.Sc. B.Ed"
-+                    ]
-+                },
-+                "postgraduate": {
-+                    "engineering": [
-+                        "M.Tech Computer Engineering",
-+                        "M.Tech Electronics & Communication",
-+                        "M.Tech Mechanical Engineering",
-+                        "M.Tech ECE - Embedded System & VLSI"
-+                    ],
-+                    "management": [
-+                        "MBA (various specializations)",
-+                        "MBA Business Analytics (with ISDC)"
-+                    ],
-+                    "law": [
-+                        "LLM",
-+                        "LLM Part Time"
-+                    ],
-+                    "sciences": [
-+                        "M.Sc Mathematics",
-+                        "M.Sc Physics",
-+                        "M.Sc Chemistry"
-+                    ]
-+                },
-+                "doctoral": [
-+                    "Ph.D in Engineering",
-+                    "Ph.D in Management & Commerce",
-+                    "Ph.D in Law",
-+                    "Ph.D in Sciences",
-+                    "Ph.D in Education"
-+                ]
-+            },
-+            
-+            "facilities": {
-+                "academic": [
-+                    "State-of-the-art laboratories",
-+                    "Modern classrooms with smart boards",
-+                    "Digital library with 24/7 access",
-+                    "Research centers",
-+                    "Innovation and incubation center"
-+                ],
-+                "residential": [
-+                    "Separate hostels for boys and girls",
-+                    "805 bed capacity",
-+                    "24/7 WiFi",
-+                    "Hygienic mess with RO water",
-+                    "Power backup with generators"
-+                ],
-+                "sports": [
-+                    "Indoor sports arena",
-+                    "Shooting range",
-+                    "Volleyball courts",
-+                    "Soccer ground",
-+                    "Squash court",
-+                    "Cricket ground",
-+                    "Basketball courts",
-+                    "Sports academy in Faridabad"
-+                ],
-+                "other": [
-+                    "Multiple cafeterias",
-+                    "Medical facilities",
-+                    "Transportation services",
-+                    "Gym facilities"
-+                ]
-+            },
-+            
-+            "placements": {
-+                "statistics": {
-+                    "highest_package": "60 LPA (KPMG Canada)",
-+                    "placements_last_5_years": "5000+",
-+                    "recent_highlights": [
-+                        "Karan Aditya Ghoshal - 60 LPA (KPMG Canada)",
-+                        "Sarthak Rastogi - 55 LPA (Spacetime)",
-+                        "Ananya Kamra - 54 LPA (Paloalto)",
-+                        "Deepanshu Sharma - 30 LPA (Niagra)",
-+                        "Lokdeep Saluja - 23 LPA (Tekion)"
-+                    ]
-+                },
-+                "recruiters": [
-+                    "KPMG Canada", "Spacetime", "Paloalto", "Niagra", "Tekion",
-+                    "TCS", "IBM", "Infosys", "Wipro", "Accenture", "Amazon",
-+                    "Microsoft", "Google", "LinkedIn", "Extramarks",
-+                    "NIIT", "Cognizant", "Nokia", "Indigo", "Federal Bank"
-+                ]
-+            },
-+            
-+            "contact_info": {
-+                "main_numbers": {
-+                    "mru": "+91-129-4268500",
-+                    "admissions": "+91-129-4259000",
-+                    "general_queries": "+91-129-4198200"
-+                },
-+                "email": "admissions@manavrachna.edu.in",
-+                "address": "Sector 43, Aravalli Hills, Delhi-Surajkund Road, Faridabad, Haryana 121004",
-+                "city_offices": "Delhi | Guwahati | Indore | Kota | Lucknow | Varanasi | Patna | Hyderabad",
-+                "website": "https://manavrachna.edu.in"
-+            },
-+            
-+            "fees": {
-+                "application_fee": "INR 1,200",
-+                "approximate_annual_fees": {
-+                    "btech": "INR 1.82 - 2.44 Lakhs",
-+                    "bba": "INR 1.65 Lakhs",
-+                    "bsc_hons": "INR 1.06 Lakhs",
-+                    "msc": "INR 1.06 Lakhs",
-+                    "phd": "INR 1.3 Lakhs",
-+                    "bed": "INR 1.16 Lakhs"
-+                }
-+            },
-+            
-+            "campus_life": {
-+                "clubs": [
-+                    "Technical clubs",
-+                    "Cultural societies",
-+                    "Sports clubs",
-+                    "Literary societies",
-+                    "Entrepreneurship cell",
-+                    "Innovation clubs"
-+                ],
-+                "events": [
-+                    "Annual technical fest",
-+                    "Cultural festivals",
-+                    "Sports tournaments",
-+                    "Industry seminars",
-+                    "Research conferences"
-+                ]
-+            }
-+        }
-+    
-+    def get_info(self, category: str, subcategory: str = None) -> dict:
-+        """Retrieve information from knowledge base"""
-+        if subcategory:
-+            return self.knowledge.get(category, {}).get(subcategory, {})
-+        return self.knowledge.get(category, {})
-+
-+
-+class IntentClassifier:
-+    """Classify user intents using keyword matching and pattern recognition"""
-+    
-+    def __init__(self):
-+        self.intent_patterns = {
-+            "greeting": [
-+                r"(?i)\b(hi|hello|hey|good\s*(morning|afternoon|evening)|namaste)\b",
-+                r"(?i)\b(how\s*are\s*you|what's\s*up)\b"
-+            ],
-+            "admission_info": [
-+                r"(?i)\b(admission|admissions|apply|application|entrance|mrnat)\b",
-+                r"(?i)\b(how\s*to\s*(apply|get\s*admission))\b",
-+                r"(?i)\b(eligibility|requirements|criteria)\b"
-+            ],
-+            "courses": [
-+                r"(?i)\b(courses?|programs?|degrees?|btech|mtech|bba|mba|bsc|msc|phd)\b",
-+                r"(?i)\b(what\s*(courses|programs).*available)\b",
-+                r"(?i)\b(engineering|management|law|science|computer|mechanical)\b"
-+            ],
-+            "fees": [
-+                r"(?i)\b(fees?|fee\s*structure|cost|tuition|payment|scholarship)\b",
-+                r"(?i)\b(how\s*much.*cost|expensive|affordable)\b"
-+            ],
-+            "placements": [
-+                r"(?i)\b(placement|placements|job|career|salary|package|recruiter)\b",
-+                r"(?i)\b(highest\s*package|companies|employment)\b"
-+            ],
-+            "facilities": [
-+                r"(?i)\b(facilities|infrastructure|hostel|library|sports|lab)\b",
-+                r"(?i)\b(campus|accommodation|dining|transport)\b"
-+            ],
-+            "contact": [
-+                r"(?i)\b(contact|phone|email|address|location|visit)\b",
-+                r"(?i)\b(how\s*to\s*(contact|reach))\b"
-+            ],
-+            "campus_life": [
-+                r"(?i)\b(campus\s*life|student\s*life|clubs|activities|events)\b",
-+                r"(?i)\b(extracurricular|cultural|technical\s*fest)\b"
-+            ],
-+            "goodbye": [
-+                r"(?i)\b(bye|goodbye|see\s*you|thanks?|thank\s*you)\b",
-+                r"(?i)\b(that's\s*all|no\s*more\s*questions)\b"
-+            ]
-+        }
-+    
-+    def classify_intent(self, text: str) -> str:
-+        """Classify the intent of user input"""
-+        text = text.lower().strip()
-+        
-+        for intent, patterns in self.intent_patterns.items():
-+            for pattern in patterns:
-+                if re.search(pattern, text):
-+                    return intent
-+        
-+        return "general_info"
-+
-+
-+class VoiceHandler:
-+    """Handle voice input and output"""
-+    
-+    def __init__(self):
-+        self.recognizer = sr.Recognizer()
-+        self.microphone = sr.Microphone()
-+        self.tts_engine = pyttsx3.init()
-+        
-+        # Configure TTS settings
-+        self.tts_engine.setProperty('rate', 150)  # Speed of speech
-+        self.tts_engine.setProperty('volume', 0.8)  # Volume level
-+        
-+        # Adjust for ambient noise
-+        with self.microphone as source:
-+            self.recognizer.adjust_for_ambient_noise(source)
-+    
-+    def listen(self, timeout: int = 5) -> Optional[str]:
-+        """Listen for voice input and convert to text"""
-+        try:
-+            print("🎤 Listening...")
-+            with self.microphone as source:
-+                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
-+            
-+            print("🔄 Processing speech...")
-+            text = self.recognizer.recognize_google(audio)
-+            print(f"👤 User: {text}")
-+            return text
-+            
-+        except sr.WaitTimeoutError:
-+            print("⏰ No speech detected within timeout")
-+            return None
-+        except sr.UnknownValueError:
-+            print("❌ Could not understand audio")
-+            return None
-+        except sr.RequestError as e:
-+            print(f"❌ Speech recognition service error: {e}")
-+            return None
-+    
-+    def speak(self, text: str):
-+        """Convert text to speech"""
-+        print(f"🤖 Assistant: {text}")
-+        self.tts_engine.say(text)
-+        self.tts_engine.runAndWait()
-+
-+
-+class ResponseGenerator:
-+    """Generate contextual responses based on intents and knowledge base"""
-+    
-+    def __init__(self, knowledge_base: MRUKnowledgeBase):
-+        self.kb = knowledge_base
-+        self.conversation_context = []
-+        
-+    def generate_response(self, intent: str, user_input: str) -> str:
-+        """Generate appropriate response based on intent"""
-+        self.conversation_context.append({"user": user_input, "intent": intent})
-+        
-+        response_map = {
-+            "greeting": self._handle_greeting,
-+            "admission_info": self._handle_admissions,
-+            "courses": self._handle_courses,
-+            "fees": self._handle_fees,
-+            "placements": self._handle_placements,
-+            "facilities": self._handle_facilities,
-+            "contact": self._handle_contact,
-+            "campus_life": self._handle_campus_life,
-+            "goodbye": self._handle_goodbye,
-+            "general_info": self._handle_general
-+        }
-+        
-+        handler = response_map.get(intent, self._handle_general)
-+        return handler(user_input)
-+    
-+    def _handle_greeting(self, user_input: str) -> str:
-+        greetings = [
-+            "Hello! Welcome to Manav Rachna University. I'm your virtual assistant.",
-+            "Hi there! I'm here to help you with information about MRU.",
-+            "Namaste! Welcome to Manav Rachna University. How can I assist you today?"
-+        ]
-+        
-+        intro = random.choice(greetings)
-+        info = " I can help you with admissions, courses, fees, placements, facilities, and more. What would you like to know?"
-+        
-+        return intro + info
-+    
-+    def _handle_admissions(self, user_input: str) -> str:
-+        admission_info = self.kb.get_info("admissions")
-+        
-+        if "mrnat" in user_input.lower() or "entrance" in user_input.lower():
-+            mrnat = admission_info["entrance_test"]
-+            return f"""MRNAT (Manav Rachna National Aptitude Test) is our entrance cum scholarship test. Here are the key details:
-+            
-+📅 Exam Dates 2025: {mrnat['dates_2025']}
-+⏱️ Duration: {mrnat['duration']}
-+📝 Format: {mrnat['format']}
-+
-+For UG programs: {', '.join(mrnat['sections_ug'])}
-+For PG programs: {', '.join(mrnat['sections_pg'])}
-+
-+Students can earn scholarships up to 100% based on their MRNAT performance!"""
-+        
-+        elif "process" in user_input.lower() or "apply" in user_input.lower():
-+            process = admission_info["application_process"]
-+            steps = "\n".join([f"{i+1}. {step}" for i, step in enumerate(process)])
-+            return f"Here's the admission process for MRU:\n\n{steps}\n\nApplication fee is {self.kb.get_info('fees')['application_fee']}."
-+        
-+        elif "scholarship" in user_input.lower():
-+            scholarships = admission_info["scholarships"]
-+            return f"""MRU offers excellent scholarship opportunities:
-+
-+🎯 {scholarships['utkarsh_scheme']}
-+🎯 {scholarships['uttam_scheme']}
-+💰 {scholarships['percentage']}
-+🏆 {scholarships['merit_scholarships']}
-+
-+Scholarships are awarded based on MRNAT performance and academic merit."""
-+        
-+        else:
-+            return """MRU admissions are primarily through MRNAT - our entrance cum scholarship test. Key highlights:
-+
-+✅ Online application process
-+✅ Scholarships up to 100% available
-+✅ Multiple intake opportunities
-+✅ Comprehensive support throughout
-+
-+Would you like specific information about MRNAT, application process, or scholarships?"""
-+    
-+    def _handle_courses(self, user_input: str) -> str:
-+        courses = self.kb.get_info("courses")
-+        
-+        if any(word in user_input.lower() for word in ["btech", "engineering", "computer", "mechanical"]):
-+            eng_courses = courses["undergraduate"]["engineering"]
-+            return f"""MRU offers excellent B.Tech programs with industry partnerships:
-+
-+🔧 Core Engineering:
-+{chr(10).join([f"• {course}" for course in eng_courses[:4]])}
-+
-+🤖 Specialized Programs:
-+{chr(10).join([f"• {course}" for course in eng_courses[4:]])}
-+
-+Our engineering programs feature industry collaborations with companies like L&T, Microsoft, Xebia, and Quick Heal!"""
-+        
-+        elif any(word in user_input.lower() for word in ["bba", "mba", "management", "business"]):
-+            mgmt_ug = courses["undergraduate"]["management"]
-+            mgmt_pg = courses["postgraduate"]["management"]
-+            return f"""MRU Management Programs:
-+
-+🎓 Undergraduate (BBA):
-+{chr(10).join([f"• {course}" for course in mgmt_ug])}
-+
-+🎓 Postgraduate (MBA):
-+{chr(10).join([f"• {course}" for course in mgmt_pg])}
-+
-+Our management programs include industry partnerships and practical exposure!"""
-+        
-+        elif any(word in user_input.lower() for word in ["law", "llb", "llm", "legal"]):
-+            law_courses = courses["undergraduate"]["law"] + courses["postgraduate"]["law"]
-+            return f"""MRU Law Programs:
-+
-+⚖️ Undergraduate:
-+{chr(10).join([f"• {course}" for course in courses['undergraduate']['law']])}
-+
-+⚖️ Postgraduate:
-+{chr(10).join([f"• {course}" for course in courses['postgraduate']['law']])}
-+
-+Our law programs are approved by Bar Council of India and focus on practical legal education."""
-+        
-+        else:
-+            return f"""MRU offers 100+ courses across multiple disciplines:
-+
-+🔧 Engineering: B.Tech, M.Tech programs with industry partnerships
-+💼 Management: BBA, MBA with various specializations
-+⚖️ Law: BA LLB, BBA LLB, LLM programs
-+🔬 Sciences: B.Sc, M.Sc in Mathematics, Physics, Chemistry
-+🎓 Education: B.Ed, Integrated programs
-+📚 Computer Applications: BCA, MCA
-+🔬 Research: Ph.D programs in all disciplines
-+
-+Which specific area interests you? I can provide detailed information!"""
-+    
-+    def _handle_fees(self, user_input: str) -> str:
-+        fees = self.kb.get_info("fees")
-+        
-+        return f"""MRU Fee Structure (Approximate Annual Fees):
-+
-+💰 B.Tech: {fees['approximate_annual_fees']['btech']}
-+💰 BBA: {fees['approximate_annual_fees']['bba']}
-+💰 B.Sc (Hons): {fees['approximate_annual_fees']['bsc_hons']}
-+💰 M.Sc: {fees['approximate_annual_fees']['msc']}
-+💰 Ph.D: {fees['approximate_annual_fees']['phd']}
-+💰 B.Ed: {fees['approximate_annual_fees']['bed']}
-+
-+📋 Application Fee: {fees['application_fee']}
-+
-+💡 Great News: Scholarships up to 100% are available based on MRNAT performance!
-+🏦 Educational loans available at low interest rates
-+💳 Flexible payment options
-+
-+Would you like information about scholarships or specific course fees?"""
-+    
-+    def _handle_placements(self, user_input: str) -> str:
-+        placements = self.kb.get_info("placements")
-+        stats = placements["statistics"]
-+        
-+        recent_highlights = "\n".join([f"• {highlight}" for highlight in stats["recent_highlights"]])
-+        
-+        return f"""MRU Placement Highlights:
-+
-+🎯 Highest Package: {stats['highest_package']}
-+📈 Total Placements (Last 5 Years): {stats['placements_last_5_years']}
-+
-+🌟 Recent Top Placements:
-+{recent_highlights}
-+
-+🏢 Top Recruiters include:
-+{', '.join(placements['recruiters'][:10])}... and many more!
-+
-+Our dedicated Career Resource & Career Development Centre (CRCDC) provides:
-+✅ 100% placement assistance
-+✅ Industry training programs
-+✅ Mock interviews and preparation
-+✅ Internship opportunities
-+✅ Career counseling
-+
-+MRU is ranked No. 1 for placements among emerging universities!"""
-+    
-+    def _handle_facilities(self, user_input: str) -> str:
-+        facilities = self.kb.get_info("facilities")
-+        
-+        if "hostel" in user_input.lower() or "accommodation" in user_input.lower():
-+            hostel_info = facilities["residential"]
-+            return f"""MRU Hostel Facilities:
-+
-+🏠 Accommodation:
-+{chr(10).join([f"• {facility}" for facility in hostel_info])}
-+
-+The hostels provide a safe, comfortable environment for students with modern amenities and a homely atmosphere."""
-+        
-+        elif "sports" in user_input.lower():
-+            sports_info = facilities["sports"]
-+            return f"""MRU Sports Facilities:
-+
-+🏃‍♂️ Sports Infrastructure:
-+{chr(10).join([f"• {facility}" for facility in sports_info])}
-+
-+MRU has produced 35 Arjuna Awardees and has a dedicated Sports Academy!"""
-+        
-+        else:
-+            all_facilities = []
-+            for category, items in facilities.items():
-+                all_facilities.extend(items)
-+            
-+            return f"""MRU World-Class Facilities:
-+
-+🎓 Academic Facilities:
-+{chr(10).join([f"• {facility}" for facility in facilities['academic']])}
-+
-+🏠 Residential Facilities:
-+{chr(10).join([f"• {facility}" for facility in facilities['residential']])}
-+
-+🏃‍♂️ Sports Facilities:
-+{chr(10).join([f"• {facility}" for facility in facilities['sports'][:4]])}
-+
-+🍽️ Other Amenities:
-+{chr(10).join([f"• {facility}" for facility in facilities['other']])}
-+
-+Our campus provides a comprehensive environment for holistic development!"""
-+    
-+    def _handle_contact(self, user_input: str) -> str:
-+        contact = self.kb.get_info("contact_info")
-+        
-+        return f"""Contact Manav Rachna University:
-+
-+📞 Main Numbers:
-+• MRU: {contact['main_numbers']['mru']}
-+• Admissions: {contact['main_numbers']['admissions']}
-+• General Queries: {contact['main_numbers']['general_queries']}
-+
-+📧 Email: {contact['email']}
-+
-+📍 Address: {contact['address']}
-+
-+🌐 Website: {contact['website']}
-+
-+🏢 City Offices: {contact['city_offices']}
-+
-+Feel free to contact us for any queries. Our admission counselors are available to guide you!"""
-+    
-+    def _handle_campus_life(self, user_input: str) -> str:
-+        campus_life = self.kb.get_info("campus_life")
-+        
-+        return f"""Life at MRU Campus:
-+
-+🎭 Student Clubs & Societies:
-+{chr(10).join([f"• {club}" for club in campus_life['clubs']])}
-+
-+🎉 Regular Events:
-+{chr(10).join([f"• {event}" for event in campus_life['events']])}
-+
-+MRU believes in holistic development and provides numerous opportunities for students to explore their interests beyond academics. Our vibrant campus life ensures a well-rounded educational experience!
-+
-+Would you like to know more about any specific activities or facilities?"""
-+    
-+    def _handle_goodbye(self, user_input: str) -> str:
-+        goodbyes = [
-+            "Thank you for your interest in Manav Rachna University! Feel free to contact us for any further assistance.",
-+            "It was great helping you learn about MRU. Best wishes for your academic journey!",
-+            "Thank you for connecting with us. We look forward to welcoming you to the MRU family!"
-+        ]
-+        
-+        contact_reminder = "\n\nFor admissions: +91-129-4259000 | Email: admissions@manavrachna.edu.in"
-+        
-+        return random.choice(goodbyes) + contact_reminder
-+    
-+    def _handle_general(self, user_input: str) -> str:
-+        university_info = self.kb.get_info("university_info")
-+        
-+        return f"""About Manav Rachna University:
-+
-+🎓 {university_info['name']} is a leading {university_info['type']}
-+📅 Established: {university_info['established']}
-+🏆 Recognition: {university_info['recognition']}
-+📍 Location: {university_info['location']}
-+🥇 Ranking: {university_info['ranking']}
-+
-+Mission: "{university_info['motto']}"
-+
-+I can help you with:
-+• Admissions and MRNAT information
-+• Course details and specializations
-+• Fee structure and scholarships
-+• Placement statistics and recruiters
-+• Campus facilities and hostel information
-+• Contact details and location
-+
-+What specific information would you like to know about MRU?"""
-+
-+
-+class ConversationManager:
-+    """Manage the conversation flow and context"""
-+    
-+    def __init__(self):
-+        self.conversation_history = []
-+        self.session_start = datetime.now()
-+        self.user_preferences = {}
-+    
-+    def add_interaction(self, user_input: str, bot_response: str, intent: str):
-+        """Add interaction to conversation history"""
-+        self.conversation_history.append({
-+            "timestamp": datetime.now(),
-+            "user_input": user_input,
-+            "bot_response": bot_response,
-+            "intent": intent
-+        })
-+    
-+    def get_conversation_summary(self) -> str:
-+        """Generate a summary of the conversation"""
-+        if not self.conversation_history:
-+            return "No conversation yet."
-+        
-+        intents = [interaction["intent"] for interaction in self.conversation_history]
-+        intent_counts = {intent: intents.count(intent) for intent in set(intents)}
-+        
-+        duration = datetime.now() - self.session_start
-+        
-+        return f"""Conversation Summary:
-+Duration: {duration.total_seconds():.0f} seconds
-+Total interactions: {len(self.conversation_history)}
-+Topics discussed: {', '.join(intent_counts.keys())}
-+Most discussed: {max(intent_counts, key=intent_counts.get)}"""
-+
-+
-+class MRUVoiceChatbot:
-+    """Main chatbot class that orchestrates all components"""
-+    
-+    def __init__(self, voice_enabled: bool = True):
-+        print("🚀 Initializing MRU Voice Chatbot...")
-+        
-+        self.voice_enabled = voice_enabled
-+        self.knowledge_base = MRUKnowledgeBase()
-+        self.intent_classifier = IntentClassifier()
-+        self.response_generator = ResponseGenerator(self.knowledge_base)
-+        self.conversation_manager = ConversationManager()
-+        
-+        if voice_enabled:
-+            try:
-+                self.voice_handler = VoiceHandler()
-+                print("🎤 Voice features enabled")
-+            except Exception as e:
-+                print(f"⚠️ Voice features disabled due to error: {e}")
-+                self.voice_enabled = False
-+        
-+        print("✅ MRU Chatbot initialized successfully!")
-+    
-+    def get_user_input(self) -> Optional[str]:
-+        """Get user input via voice or text"""
-+        if self.voice_enabled:
-+            print("\n🎤 Speak your question or type 'text' to switch to text mode:")
-+            user_input = self.voice_handler.listen()
-+            
-+            if user_input and user_input.lower() == "text":
-+                self.voice_enabled = False
-+                print("📝 Switched to text mode")
-+                return input("👤 You: ")
-+            
-+            return user_input
-+        else:
-+            return input("👤 You: ")
-+    
-+    def provide_response(self, response: str):
-+        """Provide response via voice or text"""
-+        if self.voice_enabled:
-+            self.voice_handler.speak(response)
-+        else:
-+            print(f"🤖 Assistant: {response}")
-+    
-+    def handle_special_commands(self, user_input: str) -> bool:
-+        """Handle special chatbot commands"""
-+        if not user_input:
-+            return False
-+        
-+        command = user_input.lower().strip()
-+        
-+        if command in ["quit", "exit", "stop", "end"]:
-+            response = "Thank you for using MRU Voice Assistant. Have a great day!"
-+            self.provide_response(response)
-+            return True
-+        
-+        elif command == "help":
-+            help_text = """Available commands:
-+• Ask about admissions, courses, fees, placements
-+• Say 'voice' to enable voice mode
-+• Say 'text' to switch to text mode
-+• Say 'summary' for conversation summary
-+• Say 'quit' to exit"""
-+            self.provide_response(help_text)
-+            return False
-+        
-+        elif command == "voice" and not self.voice_enabled:
-+            try:
-+                self.voice_handler = VoiceHandler()
-+                self.voice_enabled = True
-+                self.provide_response("Voice mode enabled! You can now speak your questions.")
-+            except Exception as e:
-+                self.provide_response(f"Could not enable voice mode: {e}")
-+            return False
-+        
-+        elif command == "summary":
-+            summary = self.conversation_manager.get_conversation_summary()
-+            self.provide_response(summary)
-+            return False
-+        
-+        return False
-+    
-+    def run(self):
-+        """Main chatbot loop"""
-+        print("\n" + "="*60)
-+        print("🎓 WELCOME TO MANAV RACHNA UNIVERSITY VOICE ASSISTANT 🎓")
-+        print("="*60)
-+        
-+        # Initial greeting
-+        welcome_message = """Hello! I'm your virtual assistant for Manav Rachna University. 
-+I can help you with information about admissions, courses, fees, placements, facilities, and more.
-+
-+You can speak naturally or type your questions. Say 'help' for commands or 'quit' to exit.
-+
-+How can I assist you today?"""
-+        
-+        self.provide_response(welcome_message)
-+        
-+        while True:
-+            try:
-+                # Get user input
-+                user_input = self.get_user_input()
-+                
-+                if not user_input:
-+                    continue
-+                
-+                # Handle special commands
-+                if self.handle_special_commands(user_input):
-+                    break
-+                
-+                # Classify intent and generate response
-+                intent = self.intent_classifier.classify_intent(user_input)
-+                response = self.response_generator.generate_response(intent, user_input)
-+                
-+                # Provide response
-+                self.provide_response(response)
-+                
-+                # Log interaction
-+                self.conversation_manager.add_interaction(user_input, response, intent)
-+                
-+                # Ask for follow-up
-+                if intent != "goodbye":
-+                    follow_up = "Is there anything else you'd like to know about MRU?"
-+                    if not self.voice_enabled:
-+                        print(f"\n💭 {follow_up}")
-+                
-+            except KeyboardInterrupt:
-+                print("\n\n👋 Chatbot stopped by user. Goodbye!")
-+                break
-+            except Exception as e:
-+                error_message = f"Sorry, I encountered an error: {e}. Please try again."
-+                self.provide_response(error_message)
-+
-+
-+def main():
-+    """Main function to run the chatbot"""
-+    print("🔧 Setting up MRU Voice Chatbot...")
-+    
-+    # Check if voice is available
-+    voice_available = True
-+    try:
-+        import speech_recognition as sr
-+        import pyttsx3
-+        sr.Microphone()
-+    except:
-+        voice_available = False
-+        print("⚠️ Voice features not available. Running in text mode.")
-+    
-+    # Initialize and run chatbot
-+    chatbot = MRUVoiceChatbot(voice_enabled=voice_available)
-+    chatbot.run()
-+
-+
-+if __name__ == "__main__":
-+    main()
-EOF
-)
+#!/usr/bin/env python3
+"""
+Voice-Enabled Chatbot for Manav Rachna University
+==================================================
+
+A comprehensive chatbot system that provides information about MRU using voice recognition,
+natural language processing, and text-to-speech capabilities.
+
+Features:
+- Voice input/output support
+- Comprehensive MRU knowledge base
+- Intent classification
+- Context-aware responses
+- Multi-turn conversation support
+- Emergency contact integration
+"""
+
+import argparse
+import copy
+import json
+import logging
+import re
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Tuple, Optional
+import threading
+import queue
+
+from chatbot_logging import get_logger, interaction_logger, setup_interaction_log, setup_logging, turn_context
+from deadlines import (PLEASE_REPEAT, TURN_BUDGET_S, DeadlineStats, TurnDeadline, listen_limits,
+                       recognize_within)
+from intent_registry import INTENTS, IntentRegistry
+from knowledge_changes import (ChangeSet, delete_path, diff_leaves, diff_root, empty_ancestors, path_section,
+                               removal_order, set_path, subtree_leaves)
+from voice_rendering import (MORE_COMMANDS, MORE_PROMPT, SPEECH_RATE_WPM, paginate, shorten_to, speaking_seconds,
+                             spoken_list, text_sentences)
+
+logger = get_logger()
+interactions = interaction_logger()
+
+# Core libraries
+try:
+    import speech_recognition as sr
+    import pyttsx3
+    import spacy
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    import numpy as np
+    logger.debug("All required libraries imported successfully")
+except ImportError as e:
+    logger.warning("Missing required library: %s. Install with: pip install speechrecognition pyttsx3 "
+                   "spacy scikit-learn numpy, then run: python -m spacy download en_core_web_sm", e)
+
+
+class MRUKnowledgeBase:
+    """Comprehensive knowledge base for Manav Rachna University"""
+    
+    def __init__(self, knowledge: dict = None):
+        # Bumped by every edit; see knowledge_changes.py
+        self.version = 0
+        self._subscribers = []
+        self._edit_lock = threading.RLock()
+        if knowledge is not None:
+            # Prebuilt knowledge, e.g. loaded from an engine snapshot
+            self.knowledge = knowledge
+            return
+        
+        self.knowledge = {
+            "university_info": {
+                "name": "Manav Rachna University",
+                "type": "State Private University",
+                "established": "2014 (evolved from Manav Rachna College of Engineering established in 2004)",
+                "location": "Sector 43, Aravalli Hills, Delhi-Surajkund Road, Faridabad, Haryana 121004",
+                "recognition": "UGC recognized under Section 2(f), NAAC A++ accredited",
+                "motto": "Creating a better human being",
+                "ranking": "Ranked No. 1 for Research and Placement among emerging universities"
+            },
+            
+            "admissions": {
+                "entrance_test": {
+                    "name": "MRNAT (Manav Rachna National Aptitude Test)",
+                    "description": "Entrance cum Scholarship Test for UG and PG programs",
+                    "duration": "90 minutes",
+                    "format": "Online objective-type examination",
+                    "sections_ug": ["Arithmetic & Logical Reasoning (25 MCQs)", "General English (25 MCQs)", "General Awareness (25 MCQs)"],
+                    "sections_pg": ["Arithmetic & Logical Reasoning (15 MCQs)", "Verbal Ability (15 MCQs)", "General Awareness (15 MCQs)", "Domain Specific (30 Questions)"],
+                    "dates_2025": "Phase I: January 18, 2025 | Phase II: April 20, 2025"
+                },
+                "application_process": [
+                    "Visit official website and click 'Apply Now'",
+                    "Fill online application form with accurate information",
+                    "Upload required documents (photo, certificates)",
+                    "Pay application fee of INR 1,200",
+                    "Take MRNAT exam",
+                    "Attend Vision & Values Round (VVR)",
+                    "Physical counseling if selected",
+                    "Fee payment and admission confirmation"
+                ],
+                "scholarships": {
+                    "utkarsh_scheme": "For admissions from 25th January 2025 to 29th April 2025",
+                    "uttam_scheme": "For admissions from 30th April 2025 to 30th June 2025",
+                    "percentage": "Up to 100% tuition fee waiver based on MRNAT performance",
+                    "merit_scholarships": "Available for top performers in each semester"
+                }
+            },
+            
+            "courses": {
+                "undergraduate": {
+                    "engineering": [
+                        "B.Tech Computer Science & Engineering",
+                        "B.Tech Electronics & Communication",
+                        "B.Tech Mechanical Engineering",
+                        "B.Tech Civil Engineering",
+                        "B.Tech Biotechnology",
+                        "B.Tech Robotics and AI (with L&T)",
+                        "B.Tech Cyber Security (with Quick Heal)",
+                        "B.Tech Data Science (with Xebia)",
+                        "B.Tech Cloud Computing (with Microsoft)"
+                    ],
+                    "management": [
+                        "BBA Finance & Accounts",
+                        "BBA Entrepreneurship & Family Business",
+                        "BBA Global Operations Management",
+                        "BBA Health Care Management",
+                        "BBA Business Analytics (with ISDC)",
+                        "BBA Banking & Financial Markets"
+                    ],
+                    "law": [
+                        "BA LLB (Hons)",
+                        "BBA LLB (Hons)",
+                        "BCom LLB (Hons)",
+                        "LLB"
+                    ],
+                    "sciences": [
+                        "B.Sc (Hons) Mathematics",
+                        "B.Sc (Hons) Physics", 
+                        "B.Sc (Hons) Chemistry",
+                        "B.Sc (Hons) Microbiology",
+                        "B.Sc Food Science & Technology"
+                    ],
+                    "other": [
+                        "BCA (with specializations)",
+                        "B.Ed",
+                        "Integrated B.A. B.Ed",
+                        "Integrated B.Sc. B.Ed"
+                    ]
+                },
+                "postgraduate": {
+                    "engineering": [
+                        "M.Tech Computer Engineering",
+                        "M.Tech Electronics & Communication",
+                        "M.Tech Mechanical Engineering",
+                        "M.Tech ECE - Embedded System & VLSI"
+                    ],
+                    "management": [
+                        "MBA (various specializations)",
+                        "MBA Business Analytics (with ISDC)"
+                    ],
+                    "law": [
+                        "LLM",
+                        "LLM Part Time"
+                    ],
+                    "sciences": [
+                        "M.Sc Mathematics",
+                        "M.Sc Physics",
+                        "M.Sc Chemistry"
+                    ]
+                },
+                "doctoral": [
+                    "Ph.D in Engineering",
+                    "Ph.D in Management & Commerce",
+                    "Ph.D in Law",
+                    "Ph.D in Sciences",
+                    "Ph.D in Education"
+                ]
+            },
+            
+            "facilities": {
+                "academic": [
+                    "State-of-the-art laboratories",
+                    "Modern classrooms with smart boards",
+                    "Digital library with 24/7 access",
+                    "Research centers",
+                    "Innovation and incubation center"
+                ],
+                "residential": [
+                    "Separate hostels for boys and girls",
+                    "805 bed capacity",
+                    "24/7 WiFi",
+                    "Hygienic mess with RO water",
+                    "Power backup with generators"
+                ],
+                "sports": [
+                    "Indoor sports arena",
+                    "Shooting range",
+                    "Volleyball courts",
+                    "Soccer ground",
+                    "Squash court",
+                    "Cricket ground",
+                    "Basketball courts",
+                    "Sports academy in Faridabad"
+                ],
+                "other": [
+                    "Multiple cafeterias",
+                    "Medical facilities",
+                    "Transportation services",
+                    "Gym facilities"
+                ]
+            },
+            
+            "placements": {
+                "statistics": {
+                    "highest_package": "60 LPA (KPMG Canada)",
+                    "placements_last_5_years": "5000+",
+                    "recent_highlights": [
+                        "Karan Aditya Ghoshal - 60 LPA (KPMG Canada)",
+                        "Sarthak Rastogi - 55 LPA (Spacetime)",
+                        "Ananya Kamra - 54 LPA (Paloalto)",
+                        "Deepanshu Sharma - 30 LPA (Niagra)",
+                        "Lokdeep Saluja - 23 LPA (Tekion)"
+                    ]
+                },
+                "recruiters": [
+                    "KPMG Canada", "Spacetime", "Paloalto", "Niagra", "Tekion",
+                    "TCS", "IBM", "Infosys", "Wipro", "Accenture", "Amazon",
+                    "Microsoft", "Google", "LinkedIn", "Extramarks",
+                    "NIIT", "Cognizant", "Nokia", "Indigo", "Federal Bank"
+                ]
+            },
+            
+            "contact_info": {
+                "main_numbers": {
+                    "mru": "+91-129-4268500",
+                    "admissions": "+91-129-4259000",
+                    "general_queries": "+91-129-4198200"
+                },
+                "email": "admissions@manavrachna.edu.in",
+                "address": "Sector 43, Aravalli Hills, Delhi-Surajkund Road, Faridabad, Haryana 121004",
+                "city_offices": "Delhi | Guwahati | Indore | Kota | Lucknow | Varanasi | Patna | Hyderabad",
+                "website": "https://manavrachna.edu.in"
+            },
+            
+            "fees": {
+                "application_fee": "INR 1,200",
+                "approximate_annual_fees": {
+                    "btech": "INR 1.82 - 2.44 Lakhs",
+                    "bba": "INR 1.65 Lakhs",
+                    "bsc_hons": "INR 1.06 Lakhs",
+                    "msc": "INR 1.06 Lakhs",
+                    "phd": "INR 1.3 Lakhs",
+                    "bed": "INR 1.16 Lakhs"
+                }
+            },
+            
+            "campus_life": {
+                "clubs": [
+                    "Technical clubs",
+                    "Cultural societies",
+                    "Sports clubs",
+                    "Literary societies",
+                    "Entrepreneurship cell",
+                    "Innovation clubs"
+                ],
+                "events": [
+                    "Annual technical fest",
+                    "Cultural festivals",
+                    "Sports tournaments",
+                    "Industry seminars",
+                    "Research conferences"
+                ]
+            }
+        }
+    
+    def get_info(self, category: str, subcategory: str = None) -> dict:
+        """Retrieve information from knowledge base"""
+        if subcategory:
+            return self.knowledge.get(category, {}).get(subcategory, {})
+        return self.knowledge.get(category, {})
+    
+    def subscribe(self, callback):
+        """Call `callback(changeset)` after every edit, in subscription order"""
+        with self._edit_lock:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback):
+        with self._edit_lock:
+            self._subscribers.remove(callback)
+    
+    def update(self, updates: Dict[str, object], removals: List[str] = ()) -> ChangeSet:
+        """Set values (scalars or whole subtrees) and delete paths as one new version
+        
+        Paths look like "fees.approximate_annual_fees.btech" or
+        "courses.undergraduate.law[2]". Only the edited subtrees are diffed.
+        The edit is all or nothing: if any path is invalid, the knowledge and
+        version are left as they were.
+        """
+        with self._edit_lock:
+            for path in removals:
+                if not subtree_leaves(self.knowledge, path):
+                    raise KeyError(f"No knowledge at {path!r}")
+            roots = {diff_root(path) for path in list(updates) + list(removals)}
+            before = {}
+            for path in roots:
+                before.update(empty_ancestors(self.knowledge, path))
+                before.update(subtree_leaves(self.knowledge, path))
+            staged = self._stage_edit(removals, updates)
+            after = {}
+            for path in roots:
+                after.update(subtree_leaves(staged, path))
+            self._swap_in(staged, roots)
+            return self._publish(diff_leaves(before, after, self.version + 1))
+    
+    def apply_changes(self, changeset: ChangeSet) -> ChangeSet:
+        """Replay a change set made by another knowledge base (e.g. in another worker)"""
+        with self._edit_lock:
+            if changeset.version != self.version + 1:
+                raise ValueError(f"Change set v{changeset.version} does not follow v{self.version}")
+            # Empty containers are leaves too; never share them with the sender
+            updates = {path: copy.deepcopy(changeset.values[path]) for path in changeset.added + changeset.modified}
+            self._swap_in(self._stage_edit(changeset.removed, updates), changeset.paths)
+            return self._publish(changeset)
+    
+    def _stage_edit(self, removals: List[str], updates: Dict[str, object]) -> dict:
+        """Copies of the sections an edit touches, with the edit applied; raises before any live write"""
+        sections = {path_section(path) for path in list(removals) + list(updates)}
+        staged = {section: copy.deepcopy(self.knowledge[section]) for section in sections if section in self.knowledge}
+        for path in removal_order(removals):
+            delete_path(staged, path)
+        for path, value in updates.items():
+            set_path(staged, path, value)
+        return staged
+    
+    def _swap_in(self, staged: dict, paths: List[str]):
+        """Replace the touched sections whole, so readers see each one before or after the edit"""
+        for section in {path_section(path) for path in paths}:
+            if section in staged:
+                self.knowledge[section] = staged[section]
+            else:
+                self.knowledge.pop(section, None)
+    
+    def _publish(self, changeset: ChangeSet) -> ChangeSet:
+        if not changeset:
+            return changeset
+        self.version = changeset.version
+        logger.info("Knowledge base updated", extra={
+            "version": changeset.version, "added": len(changeset.added),
+            "removed": len(changeset.removed), "modified": len(changeset.modified)
+        })
+        for callback in self._subscribers:
+            callback(changeset)
+        return changeset
+
+
+def bound_wildcards(pattern: str, limit: int) -> str:
+    """Rewrite unbounded `.*` / `.+` gaps as `.{0,limit}` / `.{1,limit}`
+    
+    With bounded gaps every start position does at most O(limit) work, so a
+    search stays linear in the input length instead of quadratic.
+    """
+    def bounded(match):
+        low = "0" if match.group(1) == "*" else "1"
+        return f".{{{low},{limit}}}{match.group(2)}"
+    return re.sub(r"(?<!\\)\.([*+])(\??)", bounded, pattern)
+
+
+# Built-in intents, in match order. Handlers are registered on ResponseGenerator;
+# further intents can be declared in code or loaded with INTENTS.load_config().
+INTENTS.declare("greeting", [
+    r"(?i)\b(hi|hello|hey|good\s*(morning|afternoon|evening)|namaste)\b",
+    r"(?i)\b(how\s*are\s*you|what's\s*up)\b"
+])
+INTENTS.declare("admission_info", [
+    r"(?i)\b(admission|admissions|apply|application|entrance|mrnat)\b",
+    r"(?i)\b(how\s*to\s*(apply|get\s*admission))\b",
+    r"(?i)\b(eligibility|requirements|criteria)\b"
+], branches=[
+    ("mrnat", ["mrnat", "entrance"]),
+    ("process", ["process", "apply"]),
+    ("scholarship", ["scholarship"])
+])
+INTENTS.declare("courses", [
+    r"(?i)\b(courses?|programs?|degrees?|btech|mtech|bba|mba|bsc|msc|phd)\b",
+    r"(?i)\b(what\s*(courses|programs).*available)\b",
+    r"(?i)\b(engineering|management|law|science|computer|mechanical)\b"
+], branches=[
+    ("engineering", ["btech", "engineering", "computer", "mechanical"]),
+    ("management", ["bba", "mba", "management", "business"]),
+    ("law", ["law", "llb", "llm", "legal"])
+])
+INTENTS.declare("fees", [
+    r"(?i)\b(fees?|fee\s*structure|cost|tuition|payment|scholarship)\b",
+    r"(?i)\b(how\s*much.*cost|expensive|affordable)\b"
+])
+INTENTS.declare("placements", [
+    r"(?i)\b(placement|placements|job|career|salary|package|recruiter)\b",
+    r"(?i)\b(highest\s*package|companies|employment)\b"
+])
+INTENTS.declare("facilities", [
+    r"(?i)\b(facilities|infrastructure|hostel|library|sports|lab)\b",
+    r"(?i)\b(campus|accommodation|dining|transport)\b"
+], branches=[
+    ("hostel", ["hostel", "accommodation"]),
+    ("sports", ["sports"])
+])
+INTENTS.declare("contact", [
+    r"(?i)\b(contact|phone|email|address|location|visit)\b",
+    r"(?i)\b(how\s*to\s*(contact|reach))\b"
+])
+INTENTS.declare("campus_life", [
+    r"(?i)\b(campus\s*life|student\s*life|clubs|activities|events)\b",
+    r"(?i)\b(extracurricular|cultural|technical\s*fest)\b"
+])
+INTENTS.declare("goodbye", [
+    r"(?i)\b(bye|goodbye|see\s*you|thanks?|thank\s*you)\b",
+    r"(?i)\b(that's\s*all|no\s*more\s*questions)\b"
+])
+
+
+class IntentClassifier:
+    """Classify user intents using keyword matching and pattern recognition
+    
+    Matching engines:
+    - "bounded" (default): stdlib `re` with `.*` gaps capped at `wildcard_limit`
+      characters, which keeps every search linear in the input length
+    - "re2": the RE2 library (pip install google-re2), linear-time by design
+    - "re": the patterns exactly as written, with unbounded gaps
+    
+    Input longer than `max_input_length` characters is truncated before matching.
+    Patterns come from the intent registry unless `intent_patterns` is given.
+    """
+    
+    ENGINES = ("bounded", "re2", "re")
+    
+    def __init__(self, intent_patterns: Dict[str, List[str]] = None, engine: str = "bounded",
+                 max_input_length: Optional[int] = 500, wildcard_limit: int = 60,
+                 registry: IntentRegistry = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown regex engine {engine!r}; choose from {', '.join(self.ENGINES)}")
+        self.engine = engine
+        self.max_input_length = max_input_length
+        self.wildcard_limit = wildcard_limit
+        
+        if intent_patterns is not None:
+            self.intent_patterns = intent_patterns
+        else:
+            self.intent_patterns = (registry or INTENTS).table().intent_patterns
+        self.compiled_patterns = self._compile_patterns()
+    
+    def _compile_patterns(self) -> List[Tuple[str, list]]:
+        """Compile every pattern once for the selected engine"""
+        compile_pattern = re.compile
+        if self.engine == "re2":
+            try:
+                import re2
+                compile_pattern = re2.compile
+            except ImportError:
+                logger.warning("RE2 not installed (pip install google-re2); using bounded patterns instead")
+                self.engine = "bounded"
+        
+        compiled = []
+        for intent, patterns in self.intent_patterns.items():
+            if self.engine == "bounded":
+                patterns = [bound_wildcards(pattern, self.wildcard_limit) for pattern in patterns]
+            compiled.append((intent, [compile_pattern(pattern) for pattern in patterns]))
+        return compiled
+    
+    def classify_intent(self, text: str) -> str:
+        """Classify the intent of user input"""
+        if self.max_input_length is not None:
+            text = text[:self.max_input_length]
+        text = text.lower().strip()
+        
+        for intent, patterns in self.compiled_patterns:
+            for pattern in patterns:
+                if pattern.search(text):
+                    return intent
+        
+        return "general_info"
+
+
+class VoiceHandler:
+    """Handle voice input and output"""
+    
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone()
+        self.tts_engine = pyttsx3.init()
+        
+        # Configure TTS settings
+        self.tts_engine.setProperty('rate', SPEECH_RATE_WPM)  # Speed of speech
+        self.tts_engine.setProperty('volume', 0.8)  # Volume level
+        
+        # Adjust for ambient noise
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source)
+        
+        # Optional audio_preprocess.Preprocessor: 16 kHz mono before upload
+        self.preprocessor = None
+        # Optional audio_cache.TranscriptCache for phrases heard over and over (kiosks)
+        self.transcript_cache = None
+        # Optional tts_pool.SpeechPool: synthesis in worker processes, sentence by sentence
+        self.speech_pool = None
+    
+    def listen(self, timeout: float = 5, deadline: TurnDeadline = None) -> Optional[str]:
+        """Listen for voice input and convert to text
+        
+        With a deadlines.TurnDeadline, the wait for speech, the phrase length
+        and the recognition request are bounded by what is left of the turn.
+        """
+        phrase_time_limit = 10
+        try:
+            logger.debug("Listening")
+            with deadline.stage("listen") if deadline else nullcontext() as allowance:
+                if allowance is not None:
+                    timeout, phrase_time_limit = listen_limits(allowance)
+                with self.microphone as source:
+                    audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            if deadline is not None and len(audio.frame_data) >= 0.95 * phrase_time_limit * audio.sample_rate * audio.sample_width:
+                deadline.degrade("listen", "cut_off")
+            
+            logger.debug("Processing speech")
+            if self.preprocessor is not None:
+                audio = self.preprocessor.prepare(audio)
+            
+            def recognize(allowance: Optional[float]) -> str:
+                # Bounds the recognition HTTP request; None keeps the library default
+                self.recognizer.operation_timeout = allowance
+                try:
+                    if self.transcript_cache is None:
+                        return self.recognizer.recognize_google(audio)
+                    return self._recognize_cached(audio)
+                finally:
+                    self.recognizer.operation_timeout = None
+            
+            text = recognize_within(deadline, recognize, (sr.RequestError,))
+            if text is None:
+                return None
+            logger.info("Speech recognized", extra={"transcript": text})
+            return text
+            
+        except sr.WaitTimeoutError:
+            logger.info("No speech detected within timeout")
+            return None
+        except sr.UnknownValueError:
+            logger.info("Could not understand audio")
+            return None
+    
+    def recalibrate(self, duration: float = 0.5):
+        """Re-measure ambient noise, e.g. between turns as a room fills up"""
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source, duration=duration)
+    
+    def _recognize_cached(self, audio) -> str:
+        """Recognize via the transcript cache, storing confident new transcripts"""
+        from audio_cache import fingerprint, recognize_google_with_confidence
+        key = fingerprint(audio.get_raw_data(), audio.sample_rate, audio.sample_width)
+        text = self.transcript_cache.lookup_fingerprint(key)
+        if text is None:
+            start = time.perf_counter()
+            text, confidence = recognize_google_with_confidence(self.recognizer, audio)
+            self.transcript_cache.store_fingerprint(key, text, confidence, time.perf_counter() - start)
+        return text
+    
+    def speak(self, text: str, voice_id: Optional[str] = None):
+        """Convert text to speech, optionally in a specific TTS voice"""
+        logger.info("Speaking response", extra={"chars": len(text)})
+        if self.speech_pool is not None:
+            try:
+                self.speech_pool.speak("voice", text, voice_id)
+                return
+            except Exception as e:
+                # Sentences the pool already played must not be heard twice
+                text = getattr(e, "unspoken", text)
+                logger.warning("Speech pool failed, speaking the rest inline: %s", e)
+                if not text:
+                    return
+        if voice_id:
+            default_voice = self.tts_engine.getProperty("voice")
+            self.tts_engine.setProperty("voice", voice_id)
+        self.tts_engine.say(text)
+        self.tts_engine.runAndWait()
+        if voice_id:
+            self.tts_engine.setProperty("voice", default_voice)
+
+
+class ResponseGenerator:
+    """Generate contextual responses based on intents and knowledge base"""
+    
+    GREETINGS = [
+        "Hello! Welcome to Manav Rachna University. I'm your virtual assistant.",
+        "Hi there! I'm here to help you with information about MRU.",
+        "Namaste! Welcome to Manav Rachna University. How can I assist you today?"
+    ]
+    
+    GOODBYES = [
+        "Thank you for your interest in Manav Rachna University! Feel free to contact us for any further assistance.",
+        "It was great helping you learn about MRU. Best wishes for your academic journey!",
+        "Thank you for connecting with us. We look forward to welcoming you to the MRU family!"
+    ]
+    
+    def __init__(self, knowledge_base: MRUKnowledgeBase, rng: random.Random = None,
+                 registry: IntentRegistry = None):
+        self.kb = knowledge_base
+        # Greeting/goodbye picks for calls without a session
+        self.rng = rng or random.Random()
+        # Renderers and branch rules, frozen when the registry was last changed
+        self.dispatch = (registry or INTENTS).table()
+        # Rendered text and voice pages per (template key, branch); entries are
+        # dropped when the knowledge sections their intent reads are edited
+        self.render_cache: Dict[Tuple[str, str], str] = {}
+        self.voice_cache: Dict[Tuple[str, str], List[str]] = {}
+        
+    def generate_response(self, intent: str, user_input: str, session: "SessionContext" = None) -> str:
+        """Generate appropriate response based on intent"""
+        return self.generate_keyed_response(intent, user_input, session)[0]
+    
+    def generate_keyed_response(self, intent: str, user_input: str, session: "SessionContext" = None,
+                                cached_only: bool = False,
+                                record_context: bool = True) -> Tuple[str, Tuple[str, str]]:
+        """Generate a response and the (template key, branch) it was rendered from
+        
+        The generator keeps no per-session state: the session (if given)
+        receives the turn context and supplies the random picks. With
+        `cached_only` nothing is rendered (see cached_response); with
+        `record_context` off the caller appends the turn context itself.
+        """
+        rng = self.rng
+        if session is not None:
+            if record_context:
+                session.conversation_context.append({"user": user_input, "intent": intent})
+            rng = session.rng
+        
+        renderers = self.dispatch.renderers
+        template_key = intent if intent in renderers else "general_info"
+        branch = self.select_branch(template_key, user_input, rng)
+        if cached_only:
+            return self.cached_response(template_key, branch)
+        return self.render_response(template_key, branch), (template_key, branch)
+    
+    def cached_response(self, template_key: str, branch: str) -> Tuple[str, Tuple[str, str]]:
+        """Best already-rendered answer: this branch, another branch of the template, or the general answer"""
+        key = (template_key, branch)
+        text = self.render_cache.get(key)
+        if text is not None:
+            return text, key
+        for key, text in list(self.render_cache.items()):
+            if key[0] == template_key:
+                return text, key
+        return self.render_response("general_info", "default"), ("general_info", "default")
+    
+    def select_branch(self, template_key: str, user_input: str, rng: random.Random = None) -> str:
+        """Pick the response variant for a template from the user's wording"""
+        variants = self.dispatch.variants.get(template_key)
+        if variants:
+            return str((rng or self.rng).randrange(variants))
+        
+        text = user_input.lower()
+        for branch, keywords in self.dispatch.branch_rules.get(template_key, ()):
+            if any(keyword in text for keyword in keywords):
+                return branch
+        return "default"
+    
+    def render_response(self, template_key: str, branch: str) -> str:
+        """Full response text for a (template key, branch), rendered once per knowledge version"""
+        key = (template_key, branch)
+        text = self.render_cache.get(key)
+        if text is None:
+            version = self.kb.version
+            text = self.dispatch.renderers[template_key](self, branch)
+            self._keep_rendering(self.render_cache, key, text, version)
+        return text
+    
+    def render_voice(self, template_key: str, branch: str) -> List[str]:
+        """Spoken pages for a (template key, branch): key facts first, the rest for "more"
+        
+        Intents without a voice renderer are converted from their text answer.
+        """
+        key = (template_key, branch)
+        pages = self.voice_cache.get(key)
+        if pages is None:
+            version = self.kb.version
+            voice_renderer = self.dispatch.voice_renderers.get(template_key)
+            if voice_renderer is not None:
+                pages = paginate(voice_renderer(self, branch))
+            else:
+                pages = paginate(text_sentences(self.render_response(template_key, branch)))
+            self._keep_rendering(self.voice_cache, key, pages, version)
+        return list(pages)
+    
+    def _keep_rendering(self, cache: dict, key: Tuple[str, str], value, version: int):
+        """Cache a rendering unless the knowledge base was edited while it was made
+        
+        Edits publish under the knowledge base's edit lock, so checking the
+        version under it means on_knowledge_change can never run between the
+        check and the store and leave pre-edit text cached.
+        """
+        with self.kb._edit_lock:
+            if self.kb.version == version:
+                cache[key] = value
+    
+    def on_knowledge_change(self, changeset: ChangeSet):
+        """Knowledge-base subscriber: forget renderings of intents that read edited sections"""
+        sections = changeset.sections
+        reads = self.dispatch.reads
+        for cache in (self.render_cache, self.voice_cache):
+            for key in list(cache):
+                intent_reads = reads.get(key[0])
+                if intent_reads is None or not intent_reads.isdisjoint(sections):
+                    cache.pop(key, None)
+    
+    def _handle_greeting(self, user_input: str) -> str:
+        return self._render_greeting(self.select_branch("greeting", user_input))
+    
+    def _handle_admissions(self, user_input: str) -> str:
+        return self._render_admissions(self.select_branch("admission_info", user_input))
+    
+    def _handle_courses(self, user_input: str) -> str:
+        return self._render_courses(self.select_branch("courses", user_input))
+    
+    def _handle_fees(self, user_input: str) -> str:
+        return self._render_fees(self.select_branch("fees", user_input))
+    
+    def _handle_placements(self, user_input: str) -> str:
+        return self._render_placements(self.select_branch("placements", user_input))
+    
+    def _handle_facilities(self, user_input: str) -> str:
+        return self._render_facilities(self.select_branch("facilities", user_input))
+    
+    def _handle_contact(self, user_input: str) -> str:
+        return self._render_contact(self.select_branch("contact", user_input))
+    
+    def _handle_campus_life(self, user_input: str) -> str:
+        return self._render_campus_life(self.select_branch("campus_life", user_input))
+    
+    def _handle_goodbye(self, user_input: str) -> str:
+        return self._render_goodbye(self.select_branch("goodbye", user_input))
+    
+    def _handle_general(self, user_input: str) -> str:
+        return self._render_general(self.select_branch("general_info", user_input))
+    
+    @INTENTS.renderer("greeting", variants=len(GREETINGS), reads=())
+    def _render_greeting(self, branch: str) -> str:
+        intro = self.GREETINGS[int(branch)]
+        info = " I can help you with admissions, courses, fees, placements, facilities, and more. What would you like to know?"
+        
+        return intro + info
+    
+    @INTENTS.renderer("admission_info", reads=("admissions", "fees"))
+    def _render_admissions(self, branch: str) -> str:
+        admission_info = self.kb.get_info("admissions")
+        
+        if branch == "mrnat":
+            mrnat = admission_info["entrance_test"]
+            return f"""MRNAT (Manav Rachna National Aptitude Test) is our entrance cum scholarship test. Here are the key details:
+            
+📅 Exam Dates 2025: {mrnat['dates_2025']}
+⏱️ Duration: {mrnat['duration']}
+📝 Format: {mrnat['format']}
+
+For UG programs: {', '.join(mrnat['sections_ug'])}
+For PG programs: {', '.join(mrnat['sections_pg'])}
+
+Students can earn scholarships up to 100% based on their MRNAT performance!"""
+        
+        elif branch == "process":
+            process = admission_info["application_process"]
+            steps = "\n".join([f"{i+1}. {step}" for i, step in enumerate(process)])
+            return f"Here's the admission process for MRU:\n\n{steps}\n\nApplication fee is {self.kb.get_info('fees')['application_fee']}."
+        
+        elif branch == "scholarship":
+            scholarships = admission_info["scholarships"]
+            return f"""MRU offers excellent scholarship opportunities:
+
+🎯 {scholarships['utkarsh_scheme']}
+🎯 {scholarships['uttam_scheme']}
+💰 {scholarships['percentage']}
+🏆 {scholarships['merit_scholarships']}
+
+Scholarships are awarded based on MRNAT performance and academic merit."""
+        
+        else:
+            return """MRU admissions are primarily through MRNAT - our entrance cum scholarship test. Key highlights:
+
+✅ Online application process
+✅ Scholarships up to 100% available
+✅ Multiple intake opportunities
+✅ Comprehensive support throughout
+
+Would you like specific information about MRNAT, application process, or scholarships?"""
+    
+    @INTENTS.renderer("courses", reads=("courses",))
+    def _render_courses(self, branch: str) -> str:
+        courses = self.kb.get_info("courses")
+        
+        if branch == "engineering":
+            eng_courses = courses["undergraduate"]["engineering"]
+            return f"""MRU offers excellent B.Tech programs with industry partnerships:
+
+🔧 Core Engineering:
+{chr(10).join([f"• {course}" for course in eng_courses[:4]])}
+
+🤖 Specialized Programs:
+{chr(10).join([f"• {course}" for course in eng_courses[4:]])}
+
+Our engineering programs feature industry collaborations with companies like L&T, Microsoft, Xebia, and Quick Heal!"""
+        
+        elif branch == "management":
+            mgmt_ug = courses["undergraduate"]["management"]
+            mgmt_pg = courses["postgraduate"]["management"]
+            return f"""MRU Management Programs:
+
+🎓 Undergraduate (BBA):
+{chr(10).join([f"• {course}" for course in mgmt_ug])}
+
+🎓 Postgraduate (MBA):
+{chr(10).join([f"• {course}" for course in mgmt_pg])}
+
+Our management programs include industry partnerships and practical exposure!"""
+        
+        elif branch == "law":
+            law_courses = courses["undergraduate"]["law"] + courses["postgraduate"]["law"]
+            return f"""MRU Law Programs:
+
+⚖️ Undergraduate:
+{chr(10).join([f"• {course}" for course in courses['undergraduate']['law']])}
+
+⚖️ Postgraduate:
+{chr(10).join([f"• {course}" for course in courses['postgraduate']['law']])}
+
+Our law programs are approved by Bar Council of India and focus on practical legal education."""
+        
+        else:
+            return f"""MRU offers 100+ courses across multiple disciplines:
+
+🔧 Engineering: B.Tech, M.Tech programs with industry partnerships
+💼 Management: BBA, MBA with various specializations
+⚖️ Law: BA LLB, BBA LLB, LLM programs
+🔬 Sciences: B.Sc, M.Sc in Mathematics, Physics, Chemistry
+🎓 Education: B.Ed, Integrated programs
+📚 Computer Applications: BCA, MCA
+🔬 Research: Ph.D programs in all disciplines
+
+Which specific area interests you? I can provide detailed information!"""
+    
+    @INTENTS.renderer("fees", reads=("fees",))
+    def _render_fees(self, branch: str) -> str:
+        fees = self.kb.get_info("fees")
+        
+        return f"""MRU Fee Structure (Approximate Annual Fees):
+
+💰 B.Tech: {fees['approximate_annual_fees']['btech']}
+💰 BBA: {fees['approximate_annual_fees']['bba']}
+💰 B.Sc (Hons): {fees['approximate_annual_fees']['bsc_hons']}
+💰 M.Sc: {fees['approximate_annual_fees']['msc']}
+💰 Ph.D: {fees['approximate_annual_fees']['phd']}
+💰 B.Ed: {fees['approximate_annual_fees']['bed']}
+
+📋 Application Fee: {fees['application_fee']}
+
+💡 Great News: Scholarships up to 100% are available based on MRNAT performance!
+🏦 Educational loans available at low interest rates
+💳 Flexible payment options
+
+Would you like information about scholarships or specific course fees?"""
+    
+    @INTENTS.renderer("placements", reads=("placements",))
+    def _render_placements(self, branch: str) -> str:
+        placements = self.kb.get_info("placements")
+        stats = placements["statistics"]
+        
+        recent_highlights = "\n".join([f"• {highlight}" for highlight in stats["recent_highlights"]])
+        
+        return f"""MRU Placement Highlights:
+
+🎯 Highest Package: {stats['highest_package']}
+📈 Total Placements (Last 5 Years): {stats['placements_last_5_years']}
+
+🌟 Recent Top Placements:
+{recent_highlights}
+
+🏢 Top Recruiters include:
+{', '.join(placements['recruiters'][:10])}... and many more!
+
+Our dedicated Career Resource & Career Development Centre (CRCDC) provides:
+✅ 100% placement assistance
+✅ Industry training programs
+✅ Mock interviews and preparation
+✅ Internship opportunities
+✅ Career counseling
+
+MRU is ranked No. 1 for placements among emerging universities!"""
+    
+    @INTENTS.renderer("facilities", reads=("facilities",))
+    def _render_facilities(self, branch: str) -> str:
+        facilities = self.kb.get_info("facilities")
+        
+        if branch == "hostel":
+            hostel_info = facilities["residential"]
+            return f"""MRU Hostel Facilities:
+
+🏠 Accommodation:
+{chr(10).join([f"• {facility}" for facility in hostel_info])}
+
+The hostels provide a safe, comfortable environment for students with modern amenities and a homely atmosphere."""
+        
+        elif branch == "sports":
+            sports_info = facilities["sports"]
+            return f"""MRU Sports Facilities:
+
+🏃‍♂️ Sports Infrastructure:
+{chr(10).join([f"• {facility}" for facility in sports_info])}
+
+MRU has produced 35 Arjuna Awardees and has a dedicated Sports Academy!"""
+        
+        else:
+            all_facilities = []
+            for category, items in facilities.items():
+                all_facilities.extend(items)
+            
+            return f"""MRU World-Class Facilities:
+
+🎓 Academic Facilities:
+{chr(10).join([f"• {facility}" for facility in facilities['academic']])}
+
+🏠 Residential Facilities:
+{chr(10).join([f"• {facility}" for facility in facilities['residential']])}
+
+🏃‍♂️ Sports Facilities:
+{chr(10).join([f"• {facility}" for facility in facilities['sports'][:4]])}
+
+🍽️ Other Amenities:
+{chr(10).join([f"• {facility}" for facility in facilities['other']])}
+
+Our campus provides a comprehensive environment for holistic development!"""
+    
+    @INTENTS.renderer("contact", reads=("contact_info",))
+    def _render_contact(self, branch: str) -> str:
+        contact = self.kb.get_info("contact_info")
+        
+        return f"""Contact Manav Rachna University:
+
+📞 Main Numbers:
+• MRU: {contact['main_numbers']['mru']}
+• Admissions: {contact['main_numbers']['admissions']}
+• General Queries: {contact['main_numbers']['general_queries']}
+
+📧 Email: {contact['email']}
+
+📍 Address: {contact['address']}
+
+🌐 Website: {contact['website']}
+
+🏢 City Offices: {contact['city_offices']}
+
+Feel free to contact us for any queries. Our admission counselors are available to guide you!"""
+    
+    @INTENTS.renderer("campus_life", reads=("campus_life",))
+    def _render_campus_life(self, branch: str) -> str:
+        campus_life = self.kb.get_info("campus_life")
+        
+        return f"""Life at MRU Campus:
+
+🎭 Student Clubs & Societies:
+{chr(10).join([f"• {club}" for club in campus_life['clubs']])}
+
+🎉 Regular Events:
+{chr(10).join([f"• {event}" for event in campus_life['events']])}
+
+MRU believes in holistic development and provides numerous opportunities for students to explore their interests beyond academics. Our vibrant campus life ensures a well-rounded educational experience!
+
+Would you like to know more about any specific activities or facilities?"""
+    
+    @INTENTS.renderer("goodbye", variants=len(GOODBYES), reads=())
+    def _render_goodbye(self, branch: str) -> str:
+        contact_reminder = "\n\nFor admissions: +91-129-4259000 | Email: admissions@manavrachna.edu.in"
+        
+        return self.GOODBYES[int(branch)] + contact_reminder
+    
+    @INTENTS.renderer("general_info", reads=("university_info",))
+    def _render_general(self, branch: str) -> str:
+        university_info = self.kb.get_info("university_info")
+        
+        return f"""About Manav Rachna University:
+
+🎓 {university_info['name']} is a leading {university_info['type']}
+📅 Established: {university_info['established']}
+🏆 Recognition: {university_info['recognition']}
+📍 Location: {university_info['location']}
+🥇 Ranking: {university_info['ranking']}
+
+Mission: "{university_info['motto']}"
+
+I can help you with:
+• Admissions and MRNAT information
+• Course details and specializations
+• Fee structure and scholarships
+• Placement statistics and recruiters
+• Campus facilities and hostel information
+• Contact details and location
+
+What specific information would you like to know about MRU?"""
+    
+    # Voice renderings: sentences in the order they should be spoken
+    
+    @INTENTS.voice_renderer("greeting")
+    def _voice_greeting(self, branch: str) -> List[str]:
+        return [self.GREETINGS[int(branch)], "Ask me about admissions, courses, fees, placements or facilities."]
+    
+    @INTENTS.voice_renderer("admission_info")
+    def _voice_admissions(self, branch: str) -> List[str]:
+        admission_info = self.kb.get_info("admissions")
+        if branch == "mrnat":
+            mrnat = admission_info["entrance_test"]
+            return [
+                f"MRNAT is our entrance cum scholarship test. Dates: {mrnat['dates_2025']}.",
+                f"It is a {mrnat['duration']} {mrnat['format'].lower()}.",
+                "Scores earn scholarships of up to 100%.",
+                f"UG sections: {spoken_list([section.split(' (')[0] for section in mrnat['sections_ug']])}.",
+                f"PG sections: {spoken_list([section.split(' (')[0] for section in mrnat['sections_pg']], 4)}."
+            ]
+        if branch == "process":
+            process = admission_info["application_process"]
+            fee = self.kb.get_info("fees")["application_fee"]
+            return [f"Admission takes {len(process)} steps, and the application fee is {fee}."] + [
+                f"Step {i + 1}: {step}." for i, step in enumerate(process)
+            ]
+        if branch == "scholarship":
+            scholarships = admission_info["scholarships"]
+            return [
+                f"{scholarships['percentage']}.",
+                f"Utkarsh scheme: {scholarships['utkarsh_scheme'].lower()}.",
+                f"Uttam scheme: {scholarships['uttam_scheme'].lower()}.",
+                f"Merit scholarships are {scholarships['merit_scholarships'].lower()}."
+            ]
+        return [
+            "Admission is through MRNAT, our entrance cum scholarship test, with scholarships up to 100%.",
+            "Ask about MRNAT, the application process or scholarships."
+        ]
+    
+    @INTENTS.voice_renderer("courses")
+    def _voice_courses(self, branch: str) -> List[str]:
+        courses = self.kb.get_info("courses")
+        if branch in ("engineering", "management", "law"):
+            programs = courses["undergraduate"][branch] + courses["postgraduate"][branch]
+            return [
+                f"MRU offers {len(programs)} {branch} programs, including {spoken_list(programs)}.",
+                f"The others are {spoken_list(programs[3:], len(programs))}."
+            ]
+        return [
+            "MRU offers over 100 courses in engineering, management, law, sciences, education and computer applications, "
+            "plus Ph.D programs.",
+            "Which area interests you?"
+        ]
+    
+    @INTENTS.voice_renderer("fees")
+    def _voice_fees(self, branch: str) -> List[str]:
+        fees = self.kb.get_info("fees")
+        annual = fees["approximate_annual_fees"]
+        if annual["bsc_hons"] == annual["msc"]:
+            sciences = f"B.Sc Honours and M.Sc are about {annual['bsc_hons']}"
+        else:
+            sciences = f"B.Sc Honours is about {annual['bsc_hons']}, M.Sc {annual['msc']}"
+        return [
+            f"B.Tech costs about {annual['btech']} a year, and BBA about {annual['bba']}.",
+            "Scholarships of up to 100% are available through MRNAT.",
+            f"{sciences}, Ph.D {annual['phd']}, and B.Ed {annual['bed']}.",
+            f"The application fee is {fees['application_fee']}, and education loans are available."
+        ]
+    
+    @INTENTS.voice_renderer("placements")
+    def _voice_placements(self, branch: str) -> List[str]:
+        placements = self.kb.get_info("placements")
+        stats = placements["statistics"]
+        return [
+            f"The highest package is {stats['highest_package']}, with {stats['placements_last_5_years']} placements "
+            "in the last five years.",
+            f"Top recruiters include {spoken_list(placements['recruiters'][5:], 4)}.",
+            f"Recent top offers: {spoken_list(stats['recent_highlights'])}.",
+            "The career centre provides full placement assistance, training and mock interviews."
+        ]
+    
+    @INTENTS.voice_renderer("facilities")
+    def _voice_facilities(self, branch: str) -> List[str]:
+        facilities = self.kb.get_info("facilities")
+        if branch == "hostel":
+            return [f"MRU hostels offer: {spoken_list(facilities['residential'], 5)}."]
+        if branch == "sports":
+            sports = facilities["sports"]
+            return [
+                f"Sports facilities include: {spoken_list(sports)}.",
+                "MRU has produced 35 Arjuna Awardees.",
+                f"The others are: {spoken_list(sports[3:], len(sports))}."
+            ]
+        return [
+            f"The campus has: {spoken_list(facilities['academic'])}.",
+            "There are hostels, sports grounds, cafeterias and medical facilities.",
+            "Ask about hostels or sports for details."
+        ]
+    
+    @INTENTS.voice_renderer("contact")
+    def _voice_contact(self, branch: str) -> List[str]:
+        contact = self.kb.get_info("contact_info")
+        return [
+            f"Call admissions on {contact['main_numbers']['admissions']}, or email {contact['email']}.",
+            f"The campus is at {contact['address']}.",
+            f"The main number is {contact['main_numbers']['mru']}, and general queries go to "
+            f"{contact['main_numbers']['general_queries']}."
+        ]
+    
+    @INTENTS.voice_renderer("campus_life")
+    def _voice_campus_life(self, branch: str) -> List[str]:
+        campus_life = self.kb.get_info("campus_life")
+        return [
+            f"Students join: {spoken_list(campus_life['clubs'])}.",
+            f"Events include: {spoken_list(campus_life['events'])}."
+        ]
+    
+    @INTENTS.voice_renderer("goodbye")
+    def _voice_goodbye(self, branch: str) -> List[str]:
+        return [self.GOODBYES[int(branch)]]
+    
+    @INTENTS.voice_renderer("general_info")
+    def _voice_general(self, branch: str) -> List[str]:
+        university_info = self.kb.get_info("university_info")
+        return [
+            f"{university_info['name']} is a {university_info['type'].lower()} in Faridabad, "
+            f"{university_info['recognition'].split(', ')[-1]}.",
+            "Ask me about admissions, courses, fees, placements, facilities or contact details."
+        ]
+
+
+# Intent names are interned to small integer ids shared by every session
+INTENT_NAMES: List[str] = []
+INTENT_IDS: Dict[str, int] = {}
+_intent_lock = threading.Lock()
+
+
+def intern_intent(intent: str) -> int:
+    """Return the process-wide integer id for an intent name"""
+    intent_id = INTENT_IDS.get(intent)
+    if intent_id is None:
+        with _intent_lock:
+            intent_id = INTENT_IDS.get(intent)
+            if intent_id is None:
+                intent_id = len(INTENT_NAMES)
+                INTENT_NAMES.append(intent)
+                INTENT_IDS[intent] = intent_id
+    return intent_id
+
+
+class InteractionRecord:
+    """Compact record of one turn
+    
+    Stores the interned intent id, the response template key and branch,
+    and a float timestamp. The response text is re-rendered on demand; a
+    response that was not produced from a template is kept verbatim in
+    `branch` with `template_key` set to None.
+    """
+    
+    __slots__ = ("intent_id", "template_key", "branch", "timestamp")
+    
+    def __init__(self, intent_id: int, template_key: Optional[str], branch: str, timestamp: float):
+        self.intent_id = intent_id
+        self.template_key = template_key
+        self.branch = branch
+        self.timestamp = timestamp
+    
+    @property
+    def intent(self) -> str:
+        return INTENT_NAMES[self.intent_id]
+
+
+class ConversationManager:
+    """Manage the conversation flow and context"""
+    
+    def __init__(self, response_generator: "ResponseGenerator" = None):
+        self.conversation_history: List[InteractionRecord] = []
+        self.session_start = datetime.now()
+        self.user_preferences = {}
+        self.response_generator = response_generator
+    
+    def add_interaction(self, user_input: str, bot_response: str, intent: str,
+                        response_key: Tuple[str, str] = None):
+        """Add interaction to conversation history
+        
+        With a response_key (template key, branch) only the key is kept and the
+        text is rebuilt by get_response_text; the raw user input is not stored.
+        """
+        if response_key is not None and self.response_generator is not None:
+            template_key, branch = sys.intern(response_key[0]), sys.intern(response_key[1])
+        else:
+            template_key, branch = None, bot_response
+        self.conversation_history.append(
+            InteractionRecord(intern_intent(intent), template_key, branch, time.time())
+        )
+    
+    def get_response_text(self, record: InteractionRecord) -> str:
+        """Reconstruct the full bot response for a stored interaction"""
+        if record.template_key is None:
+            return record.branch
+        return self.response_generator.render_response(record.template_key, record.branch)
+    
+    def get_conversation_summary(self) -> str:
+        """Generate a summary of the conversation"""
+        if not self.conversation_history:
+            return "No conversation yet."
+        
+        intents = [interaction.intent for interaction in self.conversation_history]
+        intent_counts = {intent: intents.count(intent) for intent in set(intents)}
+        
+        duration = datetime.now() - self.session_start
+        
+        return f"""Conversation Summary:
+Duration: {duration.total_seconds():.0f} seconds
+Total interactions: {len(self.conversation_history)}
+Topics discussed: {', '.join(intent_counts.keys())}
+Most discussed: {max(intent_counts, key=intent_counts.get)}"""
+    
+    def export_state(self) -> dict:
+        """Return the session history as a JSON-serializable dict"""
+        return {
+            "session_start": self.session_start.isoformat(),
+            "user_preferences": dict(self.user_preferences),
+            "conversation_history": [
+                [record.intent, record.template_key, record.branch, record.timestamp]
+                for record in self.conversation_history
+            ]
+        }
+    
+    def restore_state(self, state: dict):
+        """Replace the session history with a previously exported state"""
+        self.session_start = datetime.fromisoformat(state["session_start"])
+        self.user_preferences = dict(state.get("user_preferences", {}))
+        self.conversation_history = [
+            InteractionRecord(intern_intent(intent), template_key, branch, timestamp)
+            for intent, template_key, branch, timestamp in state.get("conversation_history", [])
+        ]
+
+
+class StageTimer:
+    """Wall time of each stage of the current turn, in microseconds
+
+    session_trace.py swaps in subclasses that also measure allocations.
+    """
+    
+    def __init__(self):
+        self.timings = {}
+        self._stage = None
+        self._start = 0.0
+    
+    def start_turn(self):
+        self.timings = {}
+    
+    def begin(self, stage: str):
+        self._stage = stage
+        self._start = time.perf_counter()
+    
+    def end(self):
+        self.timings[self._stage] = (time.perf_counter() - self._start) * 1e6
+
+
+class SessionContext:
+    """Mutable state of one conversation, passed to the engine on every call"""
+    
+    def __init__(self, response_generator: ResponseGenerator = None, session_id: str = None,
+                 rng: random.Random = None):
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        # Source of the greeting/goodbye picks; seed it to make sessions replayable
+        self.rng = rng or random.Random()
+        self.conversation_context = []
+        self.conversation_manager = ConversationManager(response_generator)
+        self.current_language = "en"
+        self.stage_timer = StageTimer()
+        # Optional session_trace.TraceRecorder that captures every turn
+        self.trace_recorder = None
+        # Spoken pages of the last answer still waiting for "more"
+        self.voice_pages: List[str] = []
+        # Pipeline features switched off under load by an slo_controller.SLOController
+        self.disabled_features: frozenset = frozenset()
+    
+    def next_voice_page(self) -> str:
+        """Pop the next held-back spoken page, prompting for "more" while pages remain"""
+        page = self.voice_pages.pop(0)
+        return f"{page} {MORE_PROMPT}" if self.voice_pages else page
+    
+    def export_state(self) -> dict:
+        """Snapshot all per-session state (history and response context)"""
+        return {
+            "conversation": self.conversation_manager.export_state(),
+            "response": {"conversation_context": list(self.conversation_context)}
+        }
+    
+    def restore_state(self, state: dict):
+        """Load per-session state produced by export_state"""
+        self.conversation_manager.restore_state(state["conversation"])
+        self.conversation_context = list(state["response"].get("conversation_context", []))
+
+
+class ChatEngine:
+    """Shared, read-only chatbot components
+    
+    Holds the knowledge base, classifier, templates and indexes, shared by
+    any number of threads. Answering only fills the render caches (guarded
+    against concurrent knowledge edits, see ResponseGenerator._keep_rendering);
+    everything that changes per turn lives in the SessionContext.
+    """
+    
+    # Minimum cosine score for a semantic hit to re-route an unmatched query
+    SEMANTIC_MIN_SCORE = 0.2
+    
+    def __init__(self, knowledge_base: MRUKnowledgeBase = None, intent_classifier: IntentClassifier = None,
+                 semantic_index=None, language_layer=None):
+        self.knowledge_base = knowledge_base or MRUKnowledgeBase()
+        self.intent_classifier = intent_classifier or IntentClassifier()
+        self.response_generator = ResponseGenerator(self.knowledge_base)
+        self.semantic_index = semantic_index
+        # Optional language.LanguageLayer; without it every message is treated as English
+        self.language_layer = language_layer
+        # Optional paraphrase_cache.ParaphraseCache in front of the semantic fallback
+        self.paraphrase_cache = None
+        # Knowledge edits reach derived structures as change sets, not rebuilds
+        self.knowledge_base.subscribe(self.response_generator.on_knowledge_change)
+        if semantic_index is not None:
+            self.knowledge_base.subscribe(semantic_index.on_knowledge_change)
+    
+    def use_paraphrase_cache(self, cache):
+        cache.knowledge_version = self.knowledge_base.version
+        if not cache.key_words:
+            from paraphrase_cache import intent_words
+            cache.key_words = intent_words(self.intent_classifier.intent_patterns,
+                                           self.response_generator.dispatch.branch_rules)
+        self.paraphrase_cache = cache
+        self.knowledge_base.subscribe(cache.on_knowledge_change)
+    
+    def new_session(self, session_id: str = None, rng: random.Random = None) -> SessionContext:
+        return SessionContext(self.response_generator, session_id, rng)
+    
+    def classify(self, user_input: str, disabled: frozenset = frozenset()) -> Tuple[str, str, str]:
+        """Return (intent, language, branch text) for one message
+        
+        The branch text is the input plus, for semantic hits, the matched
+        passage whose wording picks the response branch. With a paraphrase
+        cache, near-duplicates of a recent query that also fell through to
+        the semantic search reuse its (intent, branch text). Optional steps
+        named in `disabled` ("language_layer", "semantic_search") are skipped.
+        """
+        if self.language_layer is not None and "language_layer" not in disabled:
+            intent, language = self.language_layer.classify(user_input)
+        else:
+            intent, language = self.intent_classifier.classify_intent(user_input), "en"
+        
+        if intent == "general_info" and self.semantic_index is not None and "semantic_search" not in disabled:
+            intent, branch_text = self._semantic_match(user_input)
+        else:
+            branch_text = user_input
+        return intent, language, branch_text
+    
+    def _semantic_match(self, user_input: str) -> Tuple[str, str]:
+        """No keyword pattern matched: (intent, branch text) of the closest knowledge-base passage
+        
+        The paraphrase cache sits only here: a lookup costs more than keyword
+        matching but far less than a search.
+        """
+        cache = self.paraphrase_cache
+        sketch = None
+        # An answer found before an edit cleared the cache must not be stored after it
+        version = self.knowledge_base.version
+        if cache is not None:
+            sketch = cache.sketch(user_input)
+            result = cache.lookup_sketch(sketch)
+            if result is not None:
+                return result
+        hits = self.semantic_index.search(user_input, 1)
+        if hits and hits[0].score >= self.SEMANTIC_MIN_SCORE:
+            result = hits[0].intent, f"{user_input} {hits[0].context}"
+        else:
+            result = "general_info", user_input
+        if cache is not None:
+            cache.store_sketch(sketch, result, version)
+        return result
+    
+    def respond(self, session: SessionContext, user_input: str) -> Tuple[str, str]:
+        """Classify, answer and log a single turn; returns (intent, response)"""
+        start = time.perf_counter()
+        timer = session.stage_timer
+        timer.start_turn()
+        
+        timer.begin("classify")
+        intent, session.current_language, branch_text = self.classify(user_input, session.disabled_features)
+        timer.end()
+        
+        timer.begin("generate")
+        response, response_key = self.response_generator.generate_keyed_response(
+            intent, branch_text, session, cached_only="fresh_render" in session.disabled_features)
+        if session.current_language != "en":
+            # Lead with a short answer in the user's language; details stay in English
+            translated = self.language_layer.translate(intent, session.current_language, self.knowledge_base.knowledge)
+            if translated:
+                response = f"{translated}\n\n{response}"
+        timer.end()
+        
+        timer.begin("record")
+        session.conversation_manager.add_interaction(user_input, response, intent, response_key)
+        timer.end()
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        if session.trace_recorder is not None:
+            session.trace_recorder.record(user_input, intent, response_key, timer.timings)
+        
+        logger.debug("Turn answered", extra={"intent": intent, "template": response_key[0], "branch": response_key[1]})
+        if interactions.handlers:
+            interactions.info("turn", extra={
+                "session": session.session_id,
+                "intent": intent,
+                "branch": response_key[1],
+                "language": session.current_language,
+                "chars": len(user_input),
+                "latency_ms": round(latency_ms, 3),
+                "query": " ".join(user_input.lower().split())[:200]
+            })
+        return intent, response
+
+
+class MRUVoiceChatbot:
+    """Main chatbot class: one conversation (text or voice) on top of a ChatEngine"""
+    
+    def __init__(self, voice_enabled: bool = True, knowledge_base: MRUKnowledgeBase = None,
+                 intent_classifier: IntentClassifier = None, semantic_index=None,
+                 language_layer=None, engine: ChatEngine = None):
+        logger.info("Initializing MRU Voice Chatbot")
+        
+        self.voice_enabled = voice_enabled
+        self.engine = engine or ChatEngine(knowledge_base, intent_classifier, semantic_index, language_layer)
+        self.session = self.engine.new_session()
+        # Shortcuts to the shared components and this conversation's history
+        self.knowledge_base = self.engine.knowledge_base
+        self.intent_classifier = self.engine.intent_classifier
+        self.response_generator = self.engine.response_generator
+        self.conversation_manager = self.session.conversation_manager
+        
+        if voice_enabled:
+            try:
+                self.voice_handler = VoiceHandler()
+                logger.info("Voice features enabled")
+            except Exception as e:
+                logger.warning("Voice features disabled due to error: %s", e)
+                self.voice_enabled = False
+        
+        # memory_report.MemoryMonitor; main() starts one so growth is measured from startup
+        self.memory_monitor = None
+        # Latency budget of one voice turn (seconds, None for no limit); see deadlines.py
+        self.turn_budget: Optional[float] = TURN_BUDGET_S
+        self.deadline_stats = DeadlineStats()
+        # Optional slo_controller.SLOController switching features off under load
+        self.slo_controller = None
+        # Answers are printed as well as spoken, so speech can be dropped under load
+        self.text_capable = True
+        
+        logger.info("MRU Chatbot initialized")
+    
+    @property
+    def session_id(self) -> str:
+        return self.session.session_id
+    
+    @property
+    def current_language(self) -> str:
+        return self.session.current_language
+    
+    def new_deadline(self) -> Optional[TurnDeadline]:
+        """Budget for the next turn; text turns wait on the user, so only voice turns get one"""
+        if not self.voice_enabled or not self.turn_budget:
+            return None
+        return TurnDeadline(self.turn_budget, self.deadline_stats)
+    
+    def get_user_input(self, deadline: TurnDeadline = None) -> Optional[str]:
+        """Get user input via voice or text"""
+        if self.voice_enabled:
+            print("\n🎤 Speak your question or type 'text' to switch to text mode:")
+            user_input = self.voice_handler.listen(deadline=deadline)
+            if deadline is not None and ("recognize", "please_repeat") in deadline.degraded:
+                self.provide_response(PLEASE_REPEAT)
+            
+            if user_input and user_input.lower() == "text":
+                self.voice_enabled = False
+                logger.info("Switched to text mode")
+                return input("👤 You: ")
+            
+            return user_input
+        else:
+            return input("👤 You: ")
+    
+    def respond(self, user_input: str) -> Tuple[str, str]:
+        """Answer one turn of this chatbot's conversation; returns (intent, response)"""
+        return self.engine.respond(self.session, user_input)
+    
+    def export_session(self) -> dict:
+        return self.session.export_state()
+    
+    def restore_session(self, state: dict):
+        self.session.restore_state(state)
+    
+    def memory_report(self, sites: int = 10) -> dict:
+        """Deep size per component, RSS and growth since monitoring began (see memory_report.py)"""
+        if self.memory_monitor is None:
+            from memory_report import MemoryMonitor
+            self.memory_monitor = MemoryMonitor(self)
+        return self.memory_monitor.report(sites)
+    
+    def provide_response(self, response: str, spoken: Optional[str] = None, deadline: TurnDeadline = None):
+        """Provide response via voice or text; `spoken` replaces the text when speaking"""
+        print(f"🤖 Assistant: {response}")
+        if self.voice_enabled and not (self.text_capable and "speech" in self.session.disabled_features):
+            voice_id = None
+            if self.current_language != "en":
+                pack = self.engine.language_layer.resources.get(self.current_language)
+                voice_id = pack.voice_id(self.voice_handler.tts_engine) if pack else None
+            spoken = spoken or response
+            with deadline.stage("speak") if deadline else nullcontext() as allowance:
+                if allowance is not None:
+                    spoken = self.fit_speech(spoken, allowance, deadline)
+                if spoken:
+                    start = time.perf_counter()
+                    self.voice_handler.speak(spoken, voice_id)
+                    if self.slo_controller is not None:
+                        # Only the time beyond saying the words counts as latency
+                        self.slo_controller.record(
+                            "speak", (time.perf_counter() - start - speaking_seconds(spoken)) * 1000)
+    
+    def fit_speech(self, spoken: str, seconds: float, deadline: TurnDeadline) -> str:
+        """Cut speech to what can be said in `seconds`; the rest waits for "more", or only prints"""
+        if speaking_seconds(spoken) <= seconds:
+            return spoken
+        head, rest = shorten_to(spoken.replace(MORE_PROMPT, "").strip(), seconds - speaking_seconds(MORE_PROMPT))
+        if not head:
+            deadline.degrade("speak", "text_only")
+            return ""
+        deadline.degrade("speak", "shortened")
+        self.session.voice_pages.insert(0, rest)
+        return f"{head} {MORE_PROMPT}"
+    
+    def voice_response(self, intent: str) -> str:
+        """Compact spoken form of the last answer; later pages wait for 'more'"""
+        record = self.conversation_manager.conversation_history[-1]
+        pages = self.response_generator.render_voice(record.template_key, record.branch)
+        if self.current_language != "en":
+            translated = self.engine.language_layer.translate(intent, self.current_language,
+                                                              self.knowledge_base.knowledge)
+            if translated:
+                pages[0] = f"{translated} {pages[0]}"
+        self.session.voice_pages = pages
+        return self.session.next_voice_page()
+    
+    def handle_special_commands(self, user_input: str) -> bool:
+        """Handle special chatbot commands"""
+        if not user_input:
+            return False
+        
+        command = user_input.lower().strip()
+        
+        if command in ["quit", "exit", "stop", "end"]:
+            response = "Thank you for using MRU Voice Assistant. Have a great day!"
+            self.provide_response(response)
+            return True
+        
+        elif command == "help":
+            help_text = """Available commands:
+• Ask about admissions, courses, fees, placements
+• Say 'voice' to enable voice mode
+• Say 'text' to switch to text mode
+• Say 'more' to hear the rest of a spoken answer
+• Say 'summary' for conversation summary
+• Say 'memory' for a memory usage report
+• Say 'quit' to exit"""
+            self.provide_response(help_text)
+            return False
+        
+        elif command == "voice" and not self.voice_enabled:
+            try:
+                self.voice_handler = VoiceHandler()
+                self.voice_enabled = True
+                self.provide_response("Voice mode enabled! You can now speak your questions.")
+            except Exception as e:
+                self.provide_response(f"Could not enable voice mode: {e}")
+            return False
+        
+        elif command == "summary":
+            summary = self.conversation_manager.get_conversation_summary()
+            self.provide_response(summary)
+            return False
+        
+        elif command == "memory":
+            # Printed only: nobody wants a byte count read aloud
+            from memory_report import format_report
+            print(f"🧠 {format_report(self.memory_report())}")
+            return False
+        
+        return False
+    
+    def reset_session(self):
+        """Start a fresh conversation (e.g. after an idle timeout), keeping replay seeding and tracing"""
+        previous = self.session
+        self.session = self.engine.new_session(rng=previous.rng)
+        self.session.trace_recorder = previous.trace_recorder
+        self.conversation_manager = self.session.conversation_manager
+        logger.info("Session reset", extra={"previous_session": previous.session_id, "session": self.session_id})
+    
+    def handle_input(self, user_input: str, deadline: TurnDeadline = None) -> bool:
+        """Answer one line of user input; returns True when the user asked to quit"""
+        if self.slo_controller is not None:
+            self.session.disabled_features = self.slo_controller.disabled
+        if self.session.voice_pages and user_input.lower().strip() in MORE_COMMANDS:
+            page = self.session.next_voice_page()
+            self.provide_response(page, page, deadline)
+            return False
+        
+        # Handle special commands
+        if self.handle_special_commands(user_input):
+            return True
+        
+        # Classify intent, generate response and log interaction
+        with deadline.stage("generate") if deadline else nullcontext():
+            intent, response = self.respond(user_input)
+        if self.slo_controller is not None:
+            self.slo_controller.observe_turn(self.session.stage_timer.timings)
+        
+        # Provide response; voice mode speaks the compact rendering
+        self.provide_response(response, self.voice_response(intent) if self.voice_enabled else None, deadline)
+        
+        # Ask for follow-up
+        if intent != "goodbye":
+            follow_up = "Is there anything else you'd like to know about MRU?"
+            if not self.voice_enabled:
+                print(f"\n💭 {follow_up}")
+        return False
+    
+    def take_turn(self, user_input: str, deadline: TurnDeadline = None) -> bool:
+        """handle_input, answering errors with an apology instead of ending the conversation"""
+        try:
+            return self.handle_input(user_input, deadline)
+        except Exception as e:
+            logger.exception("Turn failed")
+            self._apologise(e)
+            return False
+    
+    def _apologise(self, error: Exception):
+        self.provide_response(f"Sorry, I encountered an error: {error}. Please try again.")
+    
+    def welcome(self):
+        print("\n" + "="*60)
+        print("🎓 WELCOME TO MANAV RACHNA UNIVERSITY VOICE ASSISTANT 🎓")
+        print("="*60)
+        
+        # Initial greeting
+        welcome_message = """Hello! I'm your virtual assistant for Manav Rachna University. 
+I can help you with information about admissions, courses, fees, placements, facilities, and more.
+
+You can speak naturally or type your questions. Say 'help' for commands or 'quit' to exit.
+
+How can I assist you today?"""
+        
+        self.provide_response(welcome_message)
+    
+    def run(self):
+        """Main chatbot loop: blocks on one input source at a time (see event_loop.py for both)"""
+        self.welcome()
+        
+        while True:
+            # Every record logged during this turn shares one correlation id
+            with turn_context():
+                deadline = self.new_deadline()
+                try:
+                    # Get user input
+                    user_input = self.get_user_input(deadline)
+                    
+                    if user_input and self.take_turn(user_input, deadline):
+                        break
+                    
+                except KeyboardInterrupt:
+                    print("\n\n👋 Chatbot stopped by user. Goodbye!")
+                    break
+                except Exception as e:
+                    # Input failures (listening, preprocessing, the microphone) end the turn, not the chatbot
+                    logger.exception("Reading input failed")
+                    self._apologise(e)
+                finally:
+                    if deadline is not None:
+                        self.deadline_stats.finish_turn(deadline)
+        
+        self.log_reports()
+    
+    def log_reports(self):
+        """Log what the optional components measured over the conversation"""
+        if self.deadline_stats.turns:
+            logger.info("Turn deadlines", extra=self.deadline_stats.report())
+        if self.voice_enabled and self.voice_handler.preprocessor is not None:
+            logger.info("Audio preprocessing", extra=self.voice_handler.preprocessor.report())
+        if self.voice_enabled and self.voice_handler.transcript_cache is not None:
+            logger.info("Transcript cache", extra=self.voice_handler.transcript_cache.report())
+        if self.engine.paraphrase_cache is not None:
+            logger.info("Paraphrase cache", extra=self.engine.paraphrase_cache.report())
+        if self.voice_enabled and self.voice_handler.speech_pool is not None:
+            logger.info("Speech pool", extra=self.voice_handler.speech_pool.report())
+        if self.slo_controller is not None:
+            logger.info("Latency SLO", extra=self.slo_controller.report())
+
+
+def main():
+    """Main function to run the chatbot"""
+    parser = argparse.ArgumentParser(description="Manav Rachna University voice chatbot")
+    parser.add_argument("--log-level", default="INFO", help="DEBUG, INFO, WARNING or ERROR")
+    parser.add_argument("--quiet", action="store_true", help="Production mode: only log warnings and errors")
+    parser.add_argument("--json-logs", action="store_true", help="Emit structured JSON log lines")
+    parser.add_argument("--semantic-index", metavar="PREFIX",
+                        help="Semantic index built with semantic_search.py, used for unmatched queries")
+    parser.add_argument("--interaction-log", metavar="PATH",
+                        help="Append per-turn JSON records to PATH for analytics.py")
+    parser.add_argument("--record-trace", metavar="PATH",
+                        help="Record every turn to a replayable trace (see session_trace.py)")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="Warm-start from an engine snapshot (see snapshot.py); rebuilt from source if stale")
+    parser.add_argument("--intents", metavar="PATH",
+                        help="JSON file declaring extra intents (see intent_registry.py)")
+    parser.add_argument("--preprocess-audio", action="store_true",
+                        help="Downmix, resample to 16 kHz and normalize audio before recognition")
+    parser.add_argument("--transcript-cache", type=int, metavar="SIZE", default=0,
+                        help="Cache transcripts of up to SIZE repeated spoken phrases (kiosk mode)")
+    parser.add_argument("--tts-workers", type=int, metavar="N", default=0,
+                        help="Synthesize speech in N worker processes (see tts_pool.py)")
+    parser.add_argument("--slo", nargs="?", const="", metavar="CONFIG",
+                        help="Degrade optional features when stage p95 latency misses its target "
+                             "(see slo_controller.py; CONFIG is an optional JSON file)")
+    parser.add_argument("--event-loop", action="store_true",
+                        help="Accept typed and spoken input at once, with idle timeouts and housekeeping")
+    parser.add_argument("--idle-timeout", type=float, metavar="SECONDS", default=300.0,
+                        help="With --event-loop, start a fresh session after SECONDS without input; 0 never")
+    parser.add_argument("--turn-budget", type=float, metavar="SECONDS", default=TURN_BUDGET_S,
+                        help="Latency budget of a voice turn, listen to end of speech; 0 for none")
+    parser.add_argument("--paraphrase-cache", type=int, metavar="SIZE", default=0,
+                        help="With --semantic-index, reuse answers of up to SIZE recent query clusters "
+                             "for near-duplicate rephrasings")
+    parser.add_argument("--multilingual", action="store_true",
+                        help="Detect Hindi/Hinglish input and answer with localized resources")
+    parser.add_argument("--memory-trace", action="store_true",
+                        help="Trace allocations so the 'memory' command can show top allocation sites")
+    parser.add_argument("--memory-log", type=float, metavar="SECONDS", default=0,
+                        help="Log per-component memory every SECONDS")
+    args = parser.parse_args()
+    
+    if args.memory_trace:
+        import tracemalloc
+        tracemalloc.start(10)
+    setup_logging(level=args.log_level, quiet=args.quiet, json_output=args.json_logs)
+    if args.interaction_log:
+        setup_interaction_log(args.interaction_log)
+    logger.info("Setting up MRU Voice Chatbot")
+    
+    # Check if voice is available
+    voice_available = True
+    try:
+        import speech_recognition as sr
+        import pyttsx3
+        sr.Microphone()
+    except:
+        voice_available = False
+        logger.warning("Voice features not available. Running in text mode.")
+    
+    # Initialize and run chatbot
+    semantic_index = None
+    if args.semantic_index:
+        from semantic_search import SemanticIndex
+        semantic_index = SemanticIndex.load(args.semantic_index)
+    
+    if args.intents:
+        INTENTS.load_config(args.intents)
+        INTENTS.validate(MRUKnowledgeBase().knowledge)
+    
+    knowledge_base = intent_classifier = None
+    if args.snapshot:
+        from snapshot import load_engine_state
+        state = load_engine_state(args.snapshot)
+        if state is None:
+            logger.warning("Snapshot %s missing or out of date, building from source", args.snapshot)
+        else:
+            knowledge_base = MRUKnowledgeBase(knowledge=state["knowledge"])
+            if not INTENTS.config_entries:
+                # Snapshots hold the built-in intents only; config intents come from the live registry
+                intent_classifier = IntentClassifier(intent_patterns=state["intent_patterns"])
+    intent_classifier = intent_classifier or IntentClassifier()
+    language_layer = None
+    if args.multilingual:
+        from language import LanguageLayer
+        language_layer = LanguageLayer(intent_classifier)
+    
+    chatbot = MRUVoiceChatbot(voice_enabled=voice_available, knowledge_base=knowledge_base,
+                              intent_classifier=intent_classifier, semantic_index=semantic_index,
+                              language_layer=language_layer)
+    if args.preprocess_audio and chatbot.voice_enabled:
+        from audio_preprocess import Preprocessor
+        chatbot.voice_handler.preprocessor = Preprocessor()
+    if args.transcript_cache and chatbot.voice_enabled:
+        from audio_cache import TranscriptCache
+        chatbot.voice_handler.transcript_cache = TranscriptCache(capacity=args.transcript_cache)
+    speech_pool = None
+    if args.tts_workers and chatbot.voice_enabled:
+        from tts_pool import SpeechPool
+        speech_pool = chatbot.voice_handler.speech_pool = SpeechPool(args.tts_workers)
+    chatbot.turn_budget = args.turn_budget or None
+    if args.slo is not None:
+        from slo_controller import SLOController
+        chatbot.slo_controller = SLOController.from_config(args.slo) if args.slo else SLOController()
+    if args.paraphrase_cache and not args.semantic_index:
+        logger.warning("--paraphrase-cache only sits in front of --semantic-index; not using it")
+    elif args.paraphrase_cache:
+        from paraphrase_cache import ParaphraseCache
+        # Near-duplicate lookups cost more than a hashing-embedder search saves
+        near_duplicates = semantic_index.embedder.name.startswith("spacy")
+        chatbot.engine.use_paraphrase_cache(ParaphraseCache(capacity=args.paraphrase_cache,
+                                                            near_duplicates=near_duplicates))
+    if args.record_trace:
+        from session_trace import TraceRecorder
+        TraceRecorder(args.record_trace).attach(chatbot)
+    
+    from memory_report import MemoryMonitor
+    chatbot.memory_monitor = MemoryMonitor(chatbot, trace=args.memory_trace)
+    try:
+        if args.event_loop:
+            # Memory polls become an idle-time housekeeping job instead of a thread
+            from event_loop import EventLoopFrontEnd
+            EventLoopFrontEnd(chatbot, idle_timeout=args.idle_timeout or None,
+                              memory_interval=args.memory_log).run()
+        else:
+            if args.memory_log:
+                chatbot.memory_monitor.start_polling(args.memory_log)
+            chatbot.run()
+    finally:
+        if speech_pool is not None:
+            # Stops the worker processes and frees any unreleased shared-memory audio
+            speech_pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Multi-Device Voice Front-End for MRU Voice Chatbot
+==================================================
+
+Serves several kiosks or microphones from one process instead of one
+full chatbot process per kiosk.
+
+- One ChatEngine (knowledge base, classifier, templates) is shared by all
+  devices; each device keeps its own SessionContext, replaced by a fresh
+  one after a quiet spell so the next visitor starts a new conversation
+- Every device has a capture thread that only listens and queues what it
+  heard, in a small bounded queue (oldest utterance dropped when full)
+- A fixed pool of workers recognizes and answers queued utterances. The
+  scheduler hands work out round-robin over devices with at most one turn
+  in flight per device, so a busy kiosk cannot starve a quiet one and a
+  device's turns are answered in order. `--policy fifo` serves the oldest
+  utterance first instead, for comparison
+- Per-device latency (queue wait, recognize, respond, total) is reported
+
+Sources are pluggable: `MicrophoneSource` wraps a speech_recognition
+microphone by device index; `SimulatedSource` replays queries on a
+schedule with simulated recognition delay, so the whole front-end can be
+exercised without audio hardware.
+
+Usage:
+    python multi_device.py list
+    python multi_device.py simulate --devices 4 --workers 2 --hog
+    python multi_device.py run --mic 0 --mic 2 [--tts-workers 2]
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from chatbot_logging import get_logger
+from load_test import build_scripts, percentile
+from mru_chatbot_system import ChatEngine
+from voice_rendering import MORE_COMMANDS, SPEECH_RATE_WPM
+
+logger = get_logger("multi_device")
+
+
+class SimulatedSource:
+    """Speaks queries at a fixed pace; recognition just takes some time"""
+
+    def __init__(self, queries: List[str], interval: float = 0.5, recognize_delay: float = 0.05,
+                 speak_delay: float = 0.0, jitter: float = 0.2, seed: int = 0, name: str = "simulated"):
+        self.name = name
+        self.queries = deque(queries)
+        self.interval = interval
+        self.recognize_delay = recognize_delay
+        self.speak_delay = speak_delay
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        # Optional tts_pool.SpeechPool shared by all sources
+        self.speech_pool = None
+
+    def capture(self) -> Optional[str]:
+        """Block until the next utterance; None once the script is exhausted"""
+        if not self.queries:
+            return None
+        time.sleep(self.interval * (1 + self._rng.uniform(-self.jitter, self.jitter)))
+        return self.queries.popleft()
+
+    def recognize(self, audio: str) -> Optional[str]:
+        time.sleep(self.recognize_delay)
+        return audio
+
+    def speak(self, text: str):
+        if self.speech_pool is not None:
+            # Synthesized for real, but nothing is played
+            self.speech_pool.speak(self.name, text, play=None)
+        if self.speak_delay:
+            time.sleep(self.speak_delay)
+
+
+class MicrophoneSource:
+    """One physical microphone, with TTS shared across all microphones"""
+
+    # pyttsx3 engines are not thread-safe and cost a driver each: one per process,
+    # unless speech is synthesized by a tts_pool.SpeechPool
+    _tts_engine = None
+    _tts_lock = threading.Lock()
+
+    def __init__(self, device_index: int, listen_timeout: float = 5.0):
+        import speech_recognition as sr
+        self._sr = sr
+        self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone(device_index=device_index)
+        self.listen_timeout = listen_timeout
+        self.stopped = False
+        self.name = f"mic-{device_index}"
+        # Optional audio_preprocess.Preprocessor, as on VoiceHandler
+        self.preprocessor = None
+        # Optional tts_pool.SpeechPool shared by all microphones
+        self.speech_pool = None
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source)
+
+    def capture(self):
+        """Block until someone speaks; None once stopped"""
+        while not self.stopped:
+            try:
+                with self.microphone as source:
+                    return self.recognizer.listen(source, timeout=self.listen_timeout, phrase_time_limit=10)
+            except self._sr.WaitTimeoutError:
+                continue
+        return None
+
+    def recognize(self, audio) -> Optional[str]:
+        if self.preprocessor is not None:
+            audio = self.preprocessor.prepare(audio)
+        try:
+            return self.recognizer.recognize_google(audio)
+        except self._sr.UnknownValueError:
+            return None
+        except self._sr.RequestError as e:
+            logger.warning("Speech recognition service error: %s", e)
+            return None
+
+    def speak(self, text: str):
+        if self.speech_pool is not None:
+            self.speech_pool.speak(self.name, text)
+            return
+        with MicrophoneSource._tts_lock:
+            if MicrophoneSource._tts_engine is None:
+                import pyttsx3
+                MicrophoneSource._tts_engine = pyttsx3.init()
+                MicrophoneSource._tts_engine.setProperty("rate", SPEECH_RATE_WPM)
+            MicrophoneSource._tts_engine.say(text)
+            MicrophoneSource._tts_engine.runAndWait()
+
+
+class Utterance:
+    __slots__ = ("device", "audio", "captured")
+
+    def __init__(self, device: "Device", audio):
+        self.device = device
+        self.audio = audio
+        self.captured = time.perf_counter()
+
+
+class Device:
+    """A kiosk: its audio source, session, pending utterances and latency samples"""
+
+    def __init__(self, name: str, source, engine: ChatEngine, max_pending: int = 4,
+                 session_idle: float = 60.0):
+        self.name = name
+        self.source = source
+        self.engine = engine
+        self.session = engine.new_session(name)
+        self.session_idle = session_idle
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.busy = False
+        self.last_turn = time.perf_counter()
+        self.sessions_started = 1
+        self.turns = 0
+        self.dropped = 0
+        self.unrecognized = 0
+        self.latencies: Dict[str, List[float]] = {"wait": [], "recognize": [], "respond": [], "total": []}
+
+    def turn(self, utterance: Utterance, started: float):
+        """Recognize, answer and speak one utterance (runs on a scheduler worker)"""
+        wait = started - utterance.captured
+        text = self.source.recognize(utterance.audio)
+        recognized = time.perf_counter()
+        if not text:
+            self.unrecognized += 1
+            return
+        if utterance.captured - self.last_turn > self.session_idle:
+            # A quiet kiosk means the previous visitor has left, held-back pages with them
+            self.session = self.engine.new_session(f"{self.name}-{self.sessions_started}")
+            self.sessions_started += 1
+        if self.session.voice_pages and text.lower().strip() in MORE_COMMANDS:
+            self.last_turn = time.perf_counter()
+            self.source.speak(self.session.next_voice_page())
+            return
+        self.engine.respond(self.session, text)
+        answered = time.perf_counter()
+        self.last_turn = answered
+        self.turns += 1
+        for stage, seconds in (("wait", wait), ("recognize", recognized - started),
+                               ("respond", answered - recognized), ("total", answered - utterance.captured)):
+            self.latencies[stage].append(seconds * 1000)
+        # Kiosks always speak the compact voice rendering; the rest waits for "more"
+        record = self.session.conversation_manager.conversation_history[-1]
+        self.session.voice_pages = self.engine.response_generator.render_voice(record.template_key, record.branch)
+        self.source.speak(self.session.next_voice_page())
+
+    def summary(self) -> dict:
+        totals = self.latencies["total"]
+        return {
+            "turns": self.turns,
+            "dropped": self.dropped,
+            "unrecognized": self.unrecognized,
+            "sessions": self.sessions_started,
+            "wait_ms": round(sum(self.latencies["wait"]) / max(len(totals), 1), 2),
+            "p50_ms": round(percentile(totals, 50), 2),
+            "p95_ms": round(percentile(totals, 95), 2),
+            "max_ms": round(max(totals, default=0.0), 2)
+        }
+
+
+class DeviceScheduler:
+    """Fixed worker pool shared by all devices
+
+    Under both policies a device never has two turns in flight. `fair`:
+    devices with queued utterances take turns (round-robin). `fifo`: the
+    oldest queued utterance goes first, which lets a chatty device crowd
+    out the rest.
+    """
+
+    POLICIES = ("fair", "fifo")
+
+    def __init__(self, workers: int = 2, policy: str = "fair"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; choose from {self.POLICIES}")
+        self.policy = policy
+        self._cond = threading.Condition()
+        # Devices with queued utterances and no turn in flight, in round-robin order
+        self._ready = deque()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._worker, name=f"device-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, utterance: Utterance):
+        device = utterance.device
+        with self._cond:
+            if len(device.pending) >= device.max_pending:
+                # The oldest question is the stalest: the speaker has likely moved on
+                device.pending.popleft()
+                device.dropped += 1
+            device.pending.append(utterance)
+            if not device.busy and device not in self._ready:
+                self._ready.append(device)
+                self._cond.notify()
+
+    def _next(self) -> Optional[Utterance]:
+        with self._cond:
+            while True:
+                if self._ready:
+                    if self.policy == "fifo":
+                        device = min(self._ready, key=lambda ready: ready.pending[0].captured)
+                        self._ready.remove(device)
+                    else:
+                        device = self._ready.popleft()
+                    device.busy = True
+                    return device.pending.popleft()
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def _done(self, device: Device):
+        with self._cond:
+            device.busy = False
+            if device.pending:
+                self._ready.append(device)
+                self._cond.notify()
+
+    def _worker(self):
+        while True:
+            utterance = self._next()
+            if utterance is None:
+                return
+            try:
+                utterance.device.turn(utterance, time.perf_counter())
+            except Exception:
+                logger.exception("Turn failed", extra={"device": utterance.device.name})
+            finally:
+                self._done(utterance.device)
+
+    def close(self):
+        """Finish queued work, then stop the workers"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+
+class MultiDeviceFrontEnd:
+    """Capture loops for every device feeding one scheduler and one engine"""
+
+    def __init__(self, engine: ChatEngine = None, workers: int = 2, policy: str = "fair",
+                 max_pending: int = 4, session_idle: float = 60.0):
+        self.engine = engine or ChatEngine()
+        self.scheduler = DeviceScheduler(workers, policy)
+        self.max_pending = max_pending
+        self.session_idle = session_idle
+        self.devices: List[Device] = []
+
+    def add_device(self, name: str, source) -> Device:
+        device = Device(name, source, self.engine, self.max_pending, self.session_idle)
+        self.devices.append(device)
+        return device
+
+    def _capture_loop(self, device: Device):
+        while True:
+            audio = device.source.capture()
+            if audio is None:
+                return
+            self.scheduler.submit(Utterance(device, audio))
+
+    def run(self):
+        """Serve every device until all sources are exhausted (or stopped)"""
+        logger.info("Serving devices", extra={"devices": len(self.devices), "policy": self.scheduler.policy})
+        threads = [threading.Thread(target=self._capture_loop, args=(device,), name=f"capture-{device.name}",
+                                    daemon=True) for device in self.devices]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            for device in self.devices:
+                device.source.stopped = True
+        self.scheduler.close()
+
+    def report(self) -> Dict[str, dict]:
+        return {device.name: device.summary() for device in self.devices}
+
+
+def print_report(report: Dict[str, dict]):
+    print(f"\n{'device':<10} {'turns':>6} {'dropped':>8} {'wait ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, stats in report.items():
+        print(f"{name:<10} {stats['turns']:>6} {stats['dropped']:>8} {stats['wait_ms']:>9.1f} "
+              f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+
+
+def simulate(devices: int, workers: int, policy: str, turns: int, interval: float,
+             recognize_delay: float, hog: bool, seed: int = 7, speech_pool=None) -> Dict[str, dict]:
+    """Drive simulated kiosks through the front-end; `hog` makes kiosk-0 talk 10x faster
+
+    With a tts_pool.SpeechPool every answer is also synthesized (not played).
+    """
+    queries = [query for script in build_scripts(seed=seed) for query in script]
+    rng = random.Random(seed)
+    front_end = MultiDeviceFrontEnd(workers=workers, policy=policy)
+    for index in range(devices):
+        hogging = hog and index == 0
+        script = [rng.choice(queries) for _ in range(turns * 10 if hogging else turns)]
+        source = SimulatedSource(script, interval / 10 if hogging else interval, recognize_delay, seed=seed + index,
+                                 name=f"kiosk-{index}")
+        source.speech_pool = speech_pool
+        front_end.add_device(source.name, source)
+    front_end.run()
+    return front_end.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve several kiosks/microphones from one process")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List microphones known to speech_recognition")
+
+    sim_parser = sub.add_parser("simulate", help="Simulated kiosks with per-device latency report")
+    sim_parser.add_argument("--devices", type=int, default=4)
+    sim_parser.add_argument("--turns", type=int, default=20, help="Utterances per device")
+    sim_parser.add_argument("--interval", type=float, default=0.2, help="Seconds between utterances")
+    sim_parser.add_argument("--recognize-delay", type=float, default=0.05, help="Simulated recognition seconds")
+    sim_parser.add_argument("--hog", action="store_true", help="kiosk-0 speaks 10x as often as the others")
+
+    run_parser = sub.add_parser("run", help="Serve real microphones")
+    run_parser.add_argument("--mic", type=int, action="append", required=True, help="Microphone device index")
+    run_parser.add_argument("--preprocess-audio", action="store_true")
+
+    for command_parser in (sim_parser, run_parser):
+        command_parser.add_argument("--workers", type=int, default=2)
+        command_parser.add_argument("--policy", choices=DeviceScheduler.POLICIES, default="fair")
+        command_parser.add_argument("--tts-workers", type=int, default=0,
+                                    help="Synthesize speech in a pool of N processes instead of one shared engine")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        import speech_recognition as sr
+        for index, name in enumerate(sr.Microphone.list_microphone_names()):
+            print(f"• {index}: {name}")
+        return
+
+    speech_pool = None
+    if args.tts_workers:
+        from tts_pool import SpeechPool
+        speech_pool = SpeechPool(args.tts_workers, backend="simulated" if args.command == "simulate" else "pyttsx3")
+
+    if args.command == "simulate":
+        print(f"📊 {args.devices} simulated kiosks, {args.workers} workers, {args.policy} scheduling"
+              + (", kiosk-0 hogging" if args.hog else "")
+              + (f", {args.tts_workers} TTS processes" if speech_pool else ""))
+        print_report(simulate(args.devices, args.workers, args.policy, args.turns, args.interval,
+                              args.recognize_delay, args.hog, speech_pool=speech_pool))
+    else:
+        front_end = MultiDeviceFrontEnd(workers=args.workers, policy=args.policy)
+        for index in args.mic:
+            source = MicrophoneSource(index)
+            if args.preprocess_audio:
+                from audio_preprocess import Preprocessor
+                source.preprocessor = Preprocessor()
+            source.speech_pool = speech_pool
+            front_end.add_device(source.name, source)
+        print(f"🎤 Listening on {len(args.mic)} microphones (Ctrl+C to stop)")
+        front_end.run()
+        print_report(front_end.report())
+    if speech_pool is not None:
+        speech_pool.close()
+        report = speech_pool.report()
+        print(f"\n🔊 Speech: {report['jobs']} sentences, queue wait p95 {report['wait_ms_p95']:.1f} ms, "
+              f"synthesis p95 {report['synthesis_ms_p95']:.1f} ms, {report['realtime_factor']:.1f}x realtime")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Paraphrase Cache for MRU Voice Chatbot
+======================================
+
+"what's the fee for btech", "btech fees?" and "fees for b.tech" are the
+same question. Exact-match caching misses them, so each one that no intent
+pattern matches pays for a semantic search. This cache reuses the resolved
+answer (intent, branch text) of recent such queries: by default for exact
+repeats after normalization, and optionally for near-duplicate clusters.
+
+- Sketch: normalized words (stop words dropped, "b.tech" -> "btech") ->
+  character trigram shingles -> MinHash signature. Word order, small typos
+  and filler words barely move the signature. A MinHash of a union is the
+  elementwise minimum of the parts, so signatures are memoized per word
+  and a query costs one `min` over its words' rows
+- LSH: the signature is cut into bands; a query is only compared with
+  clusters that share at least one whole band, so a lookup touches a
+  handful of candidates however large the cache is. A candidate is
+  accepted when the estimated Jaccard similarity to the query that
+  founded the cluster reaches `min_similarity`
+- Intent words: both queries must contain exactly the same words that
+  intent patterns and branch rules key on ("bba", "library", "mtech",
+  "hostel"), so "mtech hostel fees" never reuses the B.Tech answer however
+  similar the rest of the wording is
+- LRU eviction at a fixed number of clusters; cleared on knowledge-base
+  edits, since semantic-fallback answers depend on the knowledge
+- Metrics: hit rate, exact vs near-duplicate hits, candidates compared
+- Sits in front of the semantic fallback only, so without --semantic-index
+  it does nothing. An exact lookup (the normalized words) costs ~10 µs
+  against ~90 µs for a hashing-embedder search; on the intent corpus 18.6%
+  of fallback queries repeat, which about breaks even (97 vs 96 µs mean),
+  so it pays off where questions repeat more (kiosks) or with spaCy
+  vectors, which embed a query in milliseconds
+- A near-duplicate lookup adds the MinHash sketch and LSH probe (~60-100
+  µs in all), more than a hashing-embedder search saves, so
+  `near_duplicates` is only switched on for spaCy-vector indexes
+- `min_similarity` 0.8 comes from `evaluate --sweep --near-duplicates`:
+  about a quarter of fallback queries hit and ~98% of hits agree with the
+  search; at 0.6 agreement drops to ~88%
+- An answer is only stored if the knowledge version it was computed at is
+  still the cache's, so a search racing an edit cannot outlive the clear
+
+`evaluate` streams the corpus queries that reach the semantic fallback
+through a cache and checks every hit against what the search would have
+answered, and against
+the corpus labels (a reused answer can be right where the pipeline, e.g.
+on a typo, is wrong).
+
+Usage:
+    python mru_chatbot_system.py --semantic-index PREFIX --paraphrase-cache 512
+    python paraphrase_cache.py evaluate [--semantic-index PREFIX]
+    python paraphrase_cache.py evaluate --near-duplicates [--min-similarity 0.8] [--bands 16 --rows 4]
+    python paraphrase_cache.py evaluate --near-duplicates --sweep
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from chatbot_logging import get_logger
+from semantic_search import DEFAULT_INDEX_PREFIX, STOP_WORDS, SemanticIndex
+
+logger = get_logger("paraphrase_cache")
+
+SHINGLE_SIZE = 3
+# Bound on memoized word signatures (the vocabulary of a kiosk is small)
+MAX_WORDS = 50_000
+
+Sketch = Tuple[str, np.ndarray]
+
+
+_POSSESSIVE = re.compile(r"['\u2019]s\b")
+_INNER_DOT = re.compile(r"(?<=\w)\.(?=\w)")
+_WORD = re.compile(r"\w\w+")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercased content words with plural s dropped: b.tech -> btech, what's -> what"""
+    words = []
+    for word in _WORD.findall(_INNER_DOT.sub("", _POSSESSIVE.sub("", text.lower()))):
+        if len(word) > 3 and word[-1] == "s" and word[-2] != "s":
+            word = word[:-1]
+        if word not in STOP_WORDS:
+            words.append(word)
+    return words
+
+
+def intent_words(intent_patterns: Dict[str, List[str]],
+                 branch_rules: Dict[str, List[Tuple[str, List[str]]]]) -> frozenset:
+    """Normalized words the intent patterns and branch rules match on"""
+    words = set()
+    for patterns in intent_patterns.values():
+        for pattern in patterns:
+            # Drop flags and escapes ("(?i)", "\b", "\s") so only literal words remain
+            words.update(normalize(re.sub(r"\(\?\w+\)|\\\w", " ", pattern)))
+    for rules in branch_rules.values():
+        for _, keywords in rules:
+            for keyword in keywords:
+                words.update(normalize(keyword))
+    return frozenset(words)
+
+
+def shingles(word: str) -> List[int]:
+    """Hashed character trigrams of a word, padded so short words still count"""
+    padded = f" {word} "
+    grams = {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+    return [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+
+
+class ParaphraseCache:
+    """LRU cache of resolved answers keyed by normalized words, optionally by MinHash/LSH clusters"""
+
+    def __init__(self, capacity: int = 512, min_similarity: float = 0.8, bands: int = 16,
+                 rows: int = 4, seed: int = 7, key_words: frozenset = frozenset(),
+                 near_duplicates: bool = False):
+        self.capacity = capacity
+        self.min_similarity = min_similarity
+        self.near_duplicates = near_duplicates
+        # Knowledge-base version the cached answers were computed at
+        self.knowledge_version = 0
+        # Intent words (see intent_words) a hit must share exactly with the cluster's founder
+        self.key_words = key_words
+        self.bands = bands
+        self.rows = rows
+        # One multiply-shift hash per signature position: high 32 bits of (a * x + b) mod 2**64
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 1 << 63, bands * rows, dtype=np.uint64) | np.uint64(1))[:, None]
+        self._b = rng.integers(0, 1 << 63, bands * rows, dtype=np.uint64)[:, None]
+        self._word_signatures: Dict[str, np.ndarray] = {}
+        # Signatures live in one array so comparing candidates is a single vectorized ==
+        self.signatures = np.zeros((capacity, bands * rows), dtype=np.uint32)
+        self.clusters: "OrderedDict[int, dict]" = OrderedDict()  # slot -> cluster, oldest first
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self._buckets: Dict[Tuple[int, bytes], set] = {}
+        self._exact: Dict[str, int] = {}
+        # The engine is shared by every session thread
+        self._lock = threading.Lock()
+        self.metrics = {"lookups": 0, "hits": 0, "exact_hits": 0, "misses": 0, "unsketchable": 0,
+                        "candidates_compared": 0, "stored": 0, "evictions": 0, "invalidations": 0,
+                        "stale_stores": 0}
+
+    def sketch(self, text: str) -> Optional[Sketch]:
+        """(normalized key, MinHash signature or None), or None for text without content words"""
+        words = normalize(text)
+        if not words:
+            return None
+        if not self.near_duplicates:
+            return " ".join(sorted(words)), None
+        signature = np.minimum.reduce([self._word_signature(word) for word in set(words)])
+        return " ".join(sorted(words)), signature
+
+    def _word_signature(self, word: str) -> np.ndarray:
+        signature = self._word_signatures.get(word)
+        if signature is None:
+            if len(self._word_signatures) >= MAX_WORDS:
+                self._word_signatures.clear()
+            values = np.array(shingles(word), dtype=np.uint64)[None, :]
+            signature = ((self._a * values + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+            self._word_signatures[word] = signature
+        return signature
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        raw, width = signature.tobytes(), self.rows * signature.itemsize
+        return [(band, raw[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    def lookup(self, text: str):
+        return self.lookup_sketch(self.sketch(text))
+
+    def lookup_sketch(self, sketch: Optional[Sketch]):
+        """Answer of the closest cluster at or above min_similarity, else None"""
+        with self._lock:
+            self.metrics["lookups"] += 1
+            if sketch is None:
+                self.metrics["unsketchable"] += 1
+                self.metrics["misses"] += 1
+                return None
+            key, signature = sketch
+            slot, similarity = self._exact.get(key), 1.0
+            if slot is None and signature is not None:
+                slot, similarity = self._nearest(signature, frozenset(key.split()) & self.key_words)
+            if slot is None or similarity < self.min_similarity:
+                self.metrics["misses"] += 1
+                return None
+
+            cluster = self.clusters[slot]
+            self.clusters.move_to_end(slot)
+            cluster["hits"] += 1
+            if key != cluster["key"] and len(cluster["members"]) < 5:
+                cluster["members"].add(key)
+            self.metrics["hits"] += 1
+            if similarity == 1.0 and key == cluster["key"]:
+                self.metrics["exact_hits"] += 1
+            logger.debug("Paraphrase cache hit", extra={"similarity": round(similarity, 3)})
+            return cluster["value"]
+
+    def _nearest(self, signature: np.ndarray, words: frozenset) -> Tuple[Optional[int], float]:
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        candidates = [slot for slot in candidates if self.clusters[slot]["intent_words"] == words]
+        if not candidates:
+            return None, 0.0
+        self.metrics["candidates_compared"] += len(candidates)
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        agreement = (self.signatures[slots] == signature).sum(axis=1)
+        best = int(np.argmax(agreement))
+        return int(slots[best]), float(agreement[best]) / len(signature)
+
+    def store(self, text: str, value, knowledge_version: Optional[int] = None):
+        self.store_sketch(self.sketch(text), value, knowledge_version)
+
+    def store_sketch(self, sketch: Optional[Sketch], value, knowledge_version: Optional[int] = None):
+        """Found a new cluster whose answer is value
+
+        `knowledge_version` is the knowledge-base version read before the
+        answer was computed; if an edit has cleared the cache since, the
+        answer may be stale and is dropped.
+        """
+        if sketch is None:
+            return
+        key, signature = sketch
+        with self._lock:
+            if knowledge_version is not None and knowledge_version != self.knowledge_version:
+                self.metrics["stale_stores"] += 1
+                return
+            if key in self._exact:
+                return
+            if not self.free_slots:
+                self._evict(*self.clusters.popitem(last=False))
+            slot = self.free_slots.pop()
+            band_keys = self._band_keys(signature) if signature is not None else []
+            if signature is not None:
+                self.signatures[slot] = signature
+            self.clusters[slot] = {"key": key, "bands": band_keys, "value": value, "hits": 0, "members": set(),
+                                   "intent_words": frozenset(key.split()) & self.key_words}
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, set()).add(slot)
+            self._exact[key] = slot
+            self.metrics["stored"] += 1
+
+    def _evict(self, slot: int, cluster: dict):
+        for band_key in cluster["bands"]:
+            bucket = self._buckets[band_key]
+            bucket.discard(slot)
+            if not bucket:
+                del self._buckets[band_key]
+        del self._exact[cluster["key"]]
+        self.free_slots.append(slot)
+        self.metrics["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.clusters.clear()
+        self._buckets.clear()
+        self._exact.clear()
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+
+    def on_knowledge_change(self, changeset):
+        """Knowledge-base subscriber: cached answers may point at edited passages"""
+        with self._lock:
+            self._clear()
+            self.knowledge_version = changeset.version
+            self.metrics["invalidations"] += 1
+
+    def hit_rate(self) -> float:
+        return self.metrics["hits"] / self.metrics["lookups"] if self.metrics["lookups"] else 0.0
+
+    def report(self) -> dict:
+        return dict(self.metrics, hit_rate=round(self.hit_rate(), 4), size=len(self.clusters))
+
+
+def evaluate(records: List[dict], cache: ParaphraseCache, engine, seed: int = 1) -> dict:
+    """Stream the corpus (shuffled) through the cache, checking every hit against the semantic search
+
+    Only queries no intent pattern matches are streamed, as in the engine.
+    A hit agrees when the reused answer selects the same intent and
+    response branch the search picks for that exact query. Label accuracy
+    of the hits is reported for both, on the same queries, and so is the
+    mean cost of a fallback query with the cache (lookup, plus search and
+    store on a miss) and without it (search).
+    """
+    generator = engine.response_generator
+    classify_intent = engine.intent_classifier.classify_intent
+    stream = [record for record in records if classify_intent(record["text"]) == "general_info"]
+    random.Random(seed).shuffle(stream)
+
+    def resolve(intent: str, branch_text: str) -> Tuple[str, str]:
+        template_key = intent if intent in generator.dispatch.renderers else "general_info"
+        if generator.dispatch.variants.get(template_key):
+            return template_key, "variant"
+        return template_key, generator.select_branch(template_key, branch_text)
+
+    results = {"queries": len(stream), "correct_hits": 0, "wrong_intent": 0, "wrong_branch": 0,
+               "hit_label_accuracy": 0, "search_label_accuracy": 0}
+    lookup_us, search_us, cached_us, wrong = [], [], [], []
+    for record in stream:
+        text = record["text"]
+        start = time.perf_counter()
+        sketch = cache.sketch(text)
+        cached = cache.lookup_sketch(sketch)
+        lookup_us.append((time.perf_counter() - start) * 1e6)
+
+        start = time.perf_counter()
+        fresh = engine._semantic_match(text)
+        search_us.append((time.perf_counter() - start) * 1e6)
+        if cached is None:
+            start = time.perf_counter()
+            cache.store_sketch(sketch, fresh)
+            cached_us.append(lookup_us[-1] + search_us[-1] + (time.perf_counter() - start) * 1e6)
+            continue
+        cached_us.append(lookup_us[-1])
+        expected, reused = resolve(*fresh), resolve(*cached)
+        results["hit_label_accuracy"] += cached[0] in record["labels"]
+        results["search_label_accuracy"] += fresh[0] in record["labels"]
+        if reused == expected:
+            results["correct_hits"] += 1
+        else:
+            results["wrong_intent" if reused[0] != expected[0] else "wrong_branch"] += 1
+            if len(wrong) < 8:
+                wrong.append((text, cached[1][:60], expected, reused))
+
+    hits = results["correct_hits"] + results["wrong_intent"] + results["wrong_branch"]
+    results["hit_precision"] = round(results["correct_hits"] / hits, 4) if hits else 1.0
+    for key in ("hit_label_accuracy", "search_label_accuracy"):
+        results[key] = round(results[key] / hits, 4) if hits else 1.0
+    results["lookup_us_p50"] = round(float(np.percentile(lookup_us, 50)), 1)
+    results["lookup_us_p95"] = round(float(np.percentile(lookup_us, 95)), 1)
+    results["search_us_p50"] = round(float(np.percentile(search_us, 50)), 1)
+    results["mean_us_with_cache"] = round(float(np.mean(cached_us)), 1)
+    results["mean_us_without_cache"] = round(float(np.mean(search_us)), 1)
+    results["cache"] = cache.report()
+    results["wrong_examples"] = wrong
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paraphrase cache tools")
+    parser.add_argument("command", choices=["evaluate"])
+    parser.add_argument("--corpus", default="intent_corpus.v1.jsonl")
+    parser.add_argument("--capacity", type=int, default=512)
+    parser.add_argument("--min-similarity", type=float, default=0.8)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--near-duplicates", action="store_true", help="Also reuse answers of MinHash/LSH clusters")
+    parser.add_argument("--sweep", action="store_true",
+                        help="With --near-duplicates, compare several similarity thresholds")
+    parser.add_argument("--semantic-index", metavar="PREFIX", default=DEFAULT_INDEX_PREFIX,
+                        help="Index of the semantic fallback the cache sits in front of")
+    args = parser.parse_args()
+
+    from evaluate_intents import load_corpus
+    from mru_chatbot_system import ChatEngine
+
+    engine = ChatEngine(semantic_index=SemanticIndex.load(args.semantic_index))
+    _, records = load_corpus(args.corpus)
+    key_words = intent_words(engine.intent_classifier.intent_patterns,
+                             engine.response_generator.dispatch.branch_rules)
+
+    thresholds = [0.4, 0.5, 0.6, 0.7, 0.8, 0.9] if args.sweep and args.near_duplicates else [args.min_similarity]
+    mode = f"near duplicates, {args.bands}x{args.rows} bands" if args.near_duplicates else "exact repeats"
+    print(f"📊 Paraphrase cache on {args.corpus} ({len(records)} queries, {mode}, capacity {args.capacity}), "
+          f"queries no intent pattern matches\n")
+    print(f"{'similarity':>10} {'hit rate':>9} {'agreement':>10} {'wrong intent':>13} {'wrong branch':>13} "
+          f"{'label acc':>10} {'(search)':>10} {'lookup p50':>11} {'search p50':>11} {'mean cached':>12} "
+          f"{'(uncached)':>11}")
+    for threshold in thresholds:
+        cache = ParaphraseCache(args.capacity, threshold, args.bands, args.rows, key_words=key_words,
+                                near_duplicates=args.near_duplicates)
+        results = evaluate(records, cache, engine)
+        label = f"{threshold:.2f}" if args.near_duplicates else "exact"
+        print(f"{label:>10} {results['cache']['hit_rate']:>9.1%} {results['hit_precision']:>10.1%} "
+              f"{results['wrong_intent']:>13} {results['wrong_branch']:>13} {results['hit_label_accuracy']:>10.1%} "
+              f"{results['search_label_accuracy']:>10.1%} {results['lookup_us_p50']:>8.1f} µs "
+              f"{results['search_us_p50']:>8.1f} µs {results['mean_us_with_cache']:>9.1f} µs "
+              f"{results['mean_us_without_cache']:>8.1f} µs")
+    if not args.sweep:
+        print(f"\n• cache {results['cache']}")
+        for text, founder, expected, reused in results["wrong_examples"]:
+            print(f"• {text!r} grouped with {founder!r}: {reused} instead of {expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Semantic Knowledge-Base Search for MRU Voice Chatbot
+====================================================
+
+Embeds every knowledge-base passage once and answers queries with a
+vectorized top-k dot product, so questions like "Where will I stay?" find
+the hostel facts even though no keyword pattern mentions them.
+
+- Passage vectors are L2-normalized float32 rows saved as a `.npy` file
+- Workers open the file with `numpy.load(mmap_mode="r")`: the matrix lives
+  in the OS page cache once and is shared read-only by every process
+- Embeddings come from spaCy word vectors (a model with vectors, such as
+  en_core_web_md) or, when none is installed, from a small local
+  feature-hashing embedder over words and character trigrams
+- Knowledge-base edits are applied in place (`on_knowledge_change`): only
+  added and modified passages are re-embedded, and the first edit copies
+  the shared mapping into a private array for that process
+
+Usage:
+    python semantic_search.py build [--prefix mru_kb_index]
+    python semantic_search.py query "Where will I stay?" [--k 3]
+"""
+
+import argparse
+import json
+import re
+import threading
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from chatbot_logging import get_logger
+from knowledge_changes import ChangeSet, leaf_paths, parse_path
+
+logger = get_logger("semantic_search")
+
+DEFAULT_INDEX_PREFIX = "mru_kb_index"
+
+# Plain-language words students use for each knowledge-base section. They are
+# embedded with every passage of the section so lexical embedders can bridge
+# "stay" -> hostel or "jobs" -> placements.
+SECTION_GLOSSES = {
+    "university_info": "about university overview history recognition ranking",
+    "admissions": "admission apply join entrance exam application",
+    "entrance_test": "mrnat entrance exam test paper syllabus",
+    "application_process": "how to apply steps application form",
+    "scholarships": "scholarship discount waiver financial aid",
+    "courses": "courses programs degrees study",
+    "facilities": "facilities campus infrastructure",
+    "academic": "labs library classrooms study research",
+    "residential": "hostel accommodation stay live living room rooms housing dorm mess food",
+    "sports": "sports games play ground gym fitness",
+    "placements": "placements jobs careers salary package recruiters companies hiring",
+    "contact_info": "contact phone call email address reach visit location",
+    "fees": "fees cost price tuition money pay expensive",
+    "campus_life": "campus life clubs societies events fun activities fest"
+}
+
+# Knowledge-base section -> chatbot intent that answers it
+SECTION_INTENTS = {
+    "university_info": "general_info",
+    "admissions": "admission_info",
+    "courses": "courses",
+    "facilities": "facilities",
+    "placements": "placements",
+    "contact_info": "contact",
+    "fees": "fees",
+    "campus_life": "campus_life"
+}
+
+STOP_WORDS = {
+    "a", "an", "the", "is", "are", "am", "be", "do", "does", "did", "i", "me", "my",
+    "we", "you", "your", "it", "of", "to", "in", "on", "for", "at", "and", "or",
+    "what", "where", "when", "how", "which", "who", "will", "can", "could", "would",
+    "there", "any", "about", "tell", "please", "with", "from", "this", "that"
+}
+
+
+class SearchHit:
+    """One search result"""
+
+    __slots__ = ("path", "text", "score")
+
+    def __init__(self, path: str, text: str, score: float):
+        self.path = path
+        self.text = text
+        self.score = score
+
+    @property
+    def section(self) -> str:
+        return self.path.split(".", 1)[0].split("[", 1)[0]
+
+    @property
+    def intent(self) -> str:
+        return SECTION_INTENTS.get(self.section, "general_info")
+
+    @property
+    def context(self) -> str:
+        """Passage text with its section glosses, as it was embedded"""
+        return passage_context(self.path, self.text)
+
+    def __repr__(self):
+        return f"SearchHit({self.path!r}, score={self.score:.3f})"
+
+
+def knowledge_passages(knowledge: dict) -> List[Tuple[str, str]]:
+    """Flatten the knowledge base into (path, passage text) pairs"""
+    return [(path, passage_text(path, value)) for path, value in leaf_paths(knowledge).items()
+            if not isinstance(value, (dict, list))]
+
+
+def passage_text(path: str, value) -> str:
+    """'fees.approximate_annual_fees.btech' -> 'fees approximate annual fees btech: <value>'"""
+    label = " ".join(key.replace("_", " ") for key in parse_path(path) if isinstance(key, str))
+    return f"{label}: {value}"
+
+
+def passage_gloss(path: str) -> str:
+    """Section glosses for every level of a passage path"""
+    keys = [part.split("[", 1)[0] for part in path.split(".")]
+    return " ".join(SECTION_GLOSSES[key] for key in keys if key in SECTION_GLOSSES)
+
+
+def passage_context(path: str, text: str) -> str:
+    """What actually gets embedded for a passage: glosses plus the passage text"""
+    return f"{passage_gloss(path)} {text}"
+
+
+class HashingEmbedder:
+    """Dependency-free embedder: hashed word unigrams and character trigrams
+
+    Uses CRC32 rather than hash() so vectors are identical in every process.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOP_WORDS]
+        features = [f"w:{w}" for w in words]
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # Word features count double: they carry most of the meaning
+                weight = 2.0 if feature[0] == "w" else 1.0
+                matrix[row, zlib.crc32(feature.encode("utf-8")) % self.dim] += weight
+        return matrix
+
+
+class SpacyEmbedder:
+    """Averaged spaCy word vectors (needs a model that ships vectors)"""
+
+    def __init__(self, model: str = "en_core_web_md"):
+        import spacy
+        self.nlp = spacy.load(model, disable=["parser", "ner", "tagger", "lemmatizer"])
+        if self.nlp.vocab.vectors.shape[0] == 0:
+            raise ValueError(f"spaCy model {model} has no word vectors")
+        self.name = f"spacy:{model}"
+        self.dim = self.nlp.vocab.vectors.shape[1]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.array([doc.vector for doc in self.nlp.pipe(texts)], dtype=np.float32)
+
+
+def make_embedder(name: Optional[str] = None):
+    """Embedder by name ("hashing" or "spacy:<model>"); best available by default"""
+    if name == "hashing":
+        return HashingEmbedder()
+    model = name.split(":", 1)[1] if name and name.startswith("spacy:") else "en_core_web_md"
+    try:
+        return SpacyEmbedder(model)
+    except (ImportError, OSError, ValueError) as e:
+        if name:
+            raise
+        logger.info("spaCy vectors unavailable (%s); using hashing embedder", e)
+        return HashingEmbedder()
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def build_index(knowledge: dict, prefix: str = DEFAULT_INDEX_PREFIX, embedder=None) -> int:
+    """Embed all passages and write `<prefix>.npy` plus `<prefix>.json`; returns passage count"""
+    embedder = embedder or make_embedder()
+    passages = knowledge_passages(knowledge)
+    vectors = normalize_rows(embedder.embed([passage_context(path, text) for path, text in passages]))
+
+    np.save(f"{prefix}.npy", vectors)
+    with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "embedder": embedder.name,
+            "dim": int(vectors.shape[1]),
+            "paths": [path for path, _ in passages],
+            "texts": [text for _, text in passages]
+        }, f, ensure_ascii=False)
+    return len(passages)
+
+
+class SemanticIndex:
+    """Memory-mapped passage index answering top-k queries"""
+
+    def __init__(self, vectors: np.ndarray, paths: List[str], texts: List[str], embedder):
+        self.vectors = vectors
+        self.paths = paths
+        self.texts = texts
+        self.embedder = embedder
+        # Guards swapping in updated rows; searches take a consistent snapshot
+        self._lock = threading.Lock()
+        # Path -> row, built on the first knowledge-base edit
+        self._rows: Optional[dict] = None
+
+    @classmethod
+    def load(cls, prefix: str = DEFAULT_INDEX_PREFIX) -> "SemanticIndex":
+        with open(f"{prefix}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        # mmap_mode="r": pages are shared with every other process mapping the file
+        vectors = np.load(f"{prefix}.npy", mmap_mode="r")
+        return cls(vectors, meta["paths"], meta["texts"], make_embedder(meta["embedder"]))
+
+    def search_batch(self, queries: List[str], k: int = 3) -> List[List[SearchHit]]:
+        """Top-k passages for each query, from a single matrix product"""
+        if not queries:
+            return []
+        with self._lock:
+            vectors, paths, texts = self.vectors, self.paths, self.texts
+        query_vectors = normalize_rows(self.embedder.embed(queries))
+        scores = query_vectors @ vectors.T
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in queries]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[row, candidates])]
+            results.append([
+                SearchHit(paths[i], texts[i], float(scores[row, i])) for i in ordered
+            ])
+        return results
+
+    def on_knowledge_change(self, changeset: ChangeSet):
+        """Knowledge-base subscriber: re-embed modified passages, drop removed ones, append added ones"""
+        # Empty sections are leaves with nothing to embed; a passage emptied into one is dropped
+        emptied = {path for path in changeset.modified + changeset.added
+                   if isinstance(changeset.values[path], (dict, list))}
+        changed = [path for path in changeset.modified + changeset.added if path not in emptied]
+        embedded = {}
+        if changed:
+            texts = [passage_text(path, changeset.values[path]) for path in changed]
+            rows = normalize_rows(self.embedder.embed([passage_context(path, text)
+                                                       for path, text in zip(changed, texts)]))
+            embedded = {path: (text, row) for path, text, row in zip(changed, texts, rows)}
+
+        with self._lock:
+            if self._rows is None:
+                self._rows = {path: i for i, path in enumerate(self.paths)}
+            rows = self._rows
+            vectors, paths, texts = self.vectors, self.paths, self.texts
+            if not vectors.flags.writeable:
+                # First edit in this process: stop sharing the read-only mapping
+                vectors = np.array(vectors, dtype=np.float32)
+            # Modified rows are overwritten in place; a search racing the copy
+            # of one row sees at most that passage's old or new score
+            for path in changeset.modified:
+                if path in rows and path not in emptied:
+                    texts[rows[path]], vectors[rows[path]] = embedded[path]
+            removed = sorted((rows[path] for path in changeset.removed + sorted(emptied) if path in rows),
+                             reverse=True)
+            added = [path for path in changed if path not in rows]
+            if removed or added:
+                # Row numbers shift: build new containers and swap them in together
+                vectors = np.delete(vectors, removed, axis=0)
+                paths, texts = list(paths), list(texts)
+                for i in removed:
+                    del paths[i], texts[i]
+                vectors = np.vstack([vectors] + [embedded[path][1][None, :] for path in added])
+                paths.extend(added)
+                texts.extend(embedded[path][0] for path in added)
+                self._rows = {path: i for i, path in enumerate(paths)}
+            self.vectors, self.paths, self.texts = vectors, paths, texts
+        logger.info("Semantic index updated", extra={
+            "version": changeset.version, "reembedded": len(changed), "removed": len(removed),
+            "passages": len(paths)
+        })
+
+    def search(self, query: str, k: int = 3) -> List[SearchHit]:
+        return self.search_batch([query], k)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the semantic knowledge-base index")
+    parser.add_argument("command", choices=["build", "query"])
+    parser.add_argument("text", nargs="*", help="Query text")
+    parser.add_argument("--prefix", default=DEFAULT_INDEX_PREFIX)
+    parser.add_argument("--embedder", default=None, help='"hashing" or "spacy:<model>"')
+    parser.add_argument("--k", type=int, default=3)
+    # Intermixed: options may also follow the query words
+    args = parser.parse_intermixed_args()
+
+    if args.command == "build":
+        from mru_chatbot_system import MRUKnowledgeBase
+        count = build_index(MRUKnowledgeBase().knowledge, args.prefix, make_embedder(args.embedder))
+        print(f"✅ Indexed {count} passages into {args.prefix}.npy")
+    else:
+        index = SemanticIndex.load(args.prefix)
+        for hit in index.search(" ".join(args.text), args.k):
+            print(f"{hit.score:.3f}  [{hit.intent}] {hit.path}: {hit.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Shared Session Storage for MRU Voice Chatbot
+============================================
+
+Pluggable session backends that let several worker processes serve the same
+user. Per-session state (conversation history and response context) is kept
+out of process memory so that consecutive turns may land on different workers.
+
+Backends:
+- InMemorySessionStore: single-process baseline, same API as the shared stores
+- SQLiteSessionStore: local SQLite database in WAL mode, safe across forked workers
+
+Every stored session carries a version number. Writers use optimistic
+concurrency: a save only succeeds if the version is still the one that was
+loaded, otherwise the turn is replayed on top of the newer state.
+
+Only the last MAX_STORED_TURNS turns of history and response context are
+stored, so loading and saving a long-running session costs the same at
+turn 3000 as at turn 50.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Turns of conversation history and response context kept per stored session
+MAX_STORED_TURNS = 50
+
+
+class SessionConflictError(Exception):
+    """Raised when a session was modified by another worker since it was loaded"""
+
+
+class SessionStore:
+    """Interface for session backends"""
+
+    def load(self, session_id: str) -> Tuple[Optional[dict], int]:
+        """Return (state, version); state is None and version 0 for new sessions"""
+        raise NotImplementedError
+
+    def save(self, session_id: str, state: dict, expected_version: int) -> int:
+        """Store state if the session is still at expected_version; return the new version"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        """Forget a session"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store (no sharing between workers)"""
+
+    def __init__(self):
+        self._sessions: Dict[str, Tuple[dict, int]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Tuple[Optional[dict], int]:
+        with self._lock:
+            return self._sessions.get(session_id, (None, 0))
+
+    def save(self, session_id: str, state: dict, expected_version: int) -> int:
+        with self._lock:
+            _, current_version = self._sessions.get(session_id, (None, 0))
+            if current_version != expected_version:
+                raise SessionConflictError(
+                    f"Session {session_id} is at version {current_version}, expected {expected_version}"
+                )
+            self._sessions[session_id] = (state, current_version + 1)
+            return current_version + 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store backed by a local SQLite database in WAL mode
+
+    Connections are opened lazily per process and per thread, so a store
+    created before forking can be used directly by every pre-forked worker.
+    """
+
+    SCHEMA = """CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )"""
+
+    def __init__(self, path: str = "mru_sessions.db", busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        # Create the schema and switch to WAL once, up front
+        connection = self._connect()
+        connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        connection.execute(self.SCHEMA)
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling process and thread"""
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            # Never reuse a connection inherited across fork()
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    def load(self, session_id: str) -> Tuple[Optional[dict], int]:
+        row = self.connection.execute(
+            "SELECT state, version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None, 0
+        return json.loads(row[0]), row[1]
+
+    def save(self, session_id: str, state: dict, expected_version: int) -> int:
+        payload = json.dumps(state, separators=(",", ":"))
+        now = time.time()
+
+        if expected_version == 0:
+            try:
+                self.connection.execute(
+                    "INSERT INTO sessions (session_id, version, state, updated_at) VALUES (?, 1, ?, ?)",
+                    (session_id, payload, now)
+                )
+            except sqlite3.IntegrityError:
+                raise SessionConflictError(f"Session {session_id} was created by another worker")
+            return 1
+
+        cursor = self.connection.execute(
+            "UPDATE sessions SET version = version + 1, state = ?, updated_at = ? "
+            "WHERE session_id = ? AND version = ?",
+            (payload, now, session_id, expected_version)
+        )
+        if cursor.rowcount != 1:
+            raise SessionConflictError(f"Session {session_id} changed since version {expected_version}")
+        return expected_version + 1
+
+    def delete(self, session_id: str):
+        self.connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local = threading.local()
+
+
+def new_session_state() -> dict:
+    """State of a session that has not had any turns yet"""
+    from mru_chatbot_system import SessionContext
+    return SessionContext().export_state()
+
+
+def trim_state(state: dict, max_turns: int = MAX_STORED_TURNS) -> dict:
+    """Keep only the last max_turns records of a SessionContext.export_state() dict"""
+    state["conversation"]["conversation_history"] = state["conversation"]["conversation_history"][-max_turns:]
+    state["response"]["conversation_context"] = state["response"]["conversation_context"][-max_turns:]
+    return state
+
+
+def process_turn(engine, store: SessionStore, session_id: str, user_input: str,
+                 max_retries: int = 5, max_turns: int = MAX_STORED_TURNS) -> Tuple[str, str]:
+    """Run one turn for session_id against shared state; returns (intent, response)
+
+    The session is loaded from the store, answered by the shared ChatEngine
+    and written back with its last `max_turns` turns. If another worker
+    saved the same session in the meantime, the turn is replayed on top of
+    the fresher state. Nothing is kept on the engine, so any number of
+    threads may call this at once.
+
+    A replayed turn runs `engine.respond` again, including its side effects:
+    the interaction log gets one record per attempt (analytics counts
+    conflicted turns more than once) and the paraphrase cache sees the
+    query again (a no-op store of the same answer).
+    """
+    for attempt in range(max_retries + 1):
+        state, version = store.load(session_id)
+        session = engine.new_session(session_id)
+        if state is not None:
+            session.restore_state(state)
+
+        intent, response = engine.respond(session, user_input)
+
+        try:
+            store.save(session_id, trim_state(session.export_state(), max_turns), version)
+            return intent, response
+        except SessionConflictError:
+            if attempt == max_retries:
+                raise
+            time.sleep(0.001 * (attempt + 1))
+
+
+def run_prefork(worker_main: Callable[[int], None], num_workers: int) -> List[int]:
+    """Minimal pre-fork launcher: fork num_workers children and wait for them
+
+    worker_main(worker_index) runs in each child. Returns the exit codes.
+    Anything built before calling this (e.g. the chatbot engine) is shared
+    copy-on-write with the workers.
+    """
+    pids = []
+    for index in range(num_workers):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                worker_main(index)
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        pids.append(pid)
+
+    exit_codes = []
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        exit_codes.append(os.waitstatus_to_exitcode(status))
+    return exit_codes
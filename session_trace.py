@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Session Record and Replay for MRU Voice Chatbot
+===============================================
+
+Reproduces production turns offline:
+
+- Record mode writes one compact JSON line per turn (input, intent,
+  response key and per-stage timings) after a header that carries the
+  seed of the greeting/goodbye picks
+- Replay mode pushes a trace back through a fresh chatbot with the same
+  seed, checks that every turn takes the same path, and can profile it:
+  cProfile statistics, collapsed stacks for flame-graph tools
+  (flamegraph.pl, speedscope, inferno) and per-stage tracemalloc reports
+
+Usage:
+    python mru_chatbot_system.py --record-trace session.trace.jsonl
+    python session_trace.py record session.trace.jsonl < queries.txt
+    python session_trace.py replay session.trace.jsonl --profile --stacks session.folded --allocations
+"""
+
+import argparse
+import cProfile
+import gzip
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from mru_chatbot_system import IntentClassifier, MRUVoiceChatbot, StageTimer
+
+TRACE_FORMAT = "mru-trace"
+TRACE_VERSION = 1
+
+
+def open_trace(path: str, mode: str = "r"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TraceRecorder:
+    """Appends every turn of one chatbot to a trace file"""
+
+    def __init__(self, path: str, seed: Optional[int] = None):
+        self.path = path
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.file = None
+        self.started = 0.0
+
+    def attach(self, chatbot: MRUVoiceChatbot) -> "TraceRecorder":
+        """Seed the chatbot's response picks, write the header and start recording"""
+        chatbot.session.rng = random.Random(self.seed)
+        chatbot.session.trace_recorder = self
+        self.started = time.time()
+        self.file = open_trace(self.path, "w")
+        self._write({
+            "format": TRACE_FORMAT,
+            "version": TRACE_VERSION,
+            "seed": self.seed,
+            "session": chatbot.session_id,
+            "started": round(self.started, 3),
+            "multilingual": chatbot.engine.language_layer is not None,
+            "semantic_index": chatbot.engine.semantic_index is not None
+        })
+        return self
+
+    def record(self, user_input: str, intent: str, response_key: Tuple[str, str], timings: Dict[str, float]):
+        self._write({
+            "dt": round(time.time() - self.started, 3),
+            "in": user_input,
+            "intent": intent,
+            "key": list(response_key),
+            "us": {stage: round(micros, 1) for stage, micros in timings.items()}
+        })
+
+    def _write(self, entry: dict):
+        self.file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+        # Flushed per turn: the trace must survive the crash we are chasing
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def load_trace(path: str) -> Tuple[dict, List[dict]]:
+    """Return (header, turns) of a recorded trace"""
+    with open_trace(path) as f:
+        header = json.loads(f.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not an MRU session trace")
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')}")
+        turns = [json.loads(line) for line in f if line.strip()]
+    return header, turns
+
+
+def replay_chatbot(header: dict, semantic_index_prefix: Optional[str] = None) -> MRUVoiceChatbot:
+    """Fresh text-only chatbot configured and seeded like the recorded one"""
+    semantic_index = None
+    if header.get("semantic_index"):
+        if semantic_index_prefix:
+            from semantic_search import SemanticIndex
+            semantic_index = SemanticIndex.load(semantic_index_prefix)
+        else:
+            print("⚠️ Trace used a semantic index; pass --semantic-index to reproduce it")
+
+    intent_classifier = IntentClassifier()
+    language_layer = None
+    if header.get("multilingual"):
+        from language import LanguageLayer
+        language_layer = LanguageLayer(intent_classifier)
+
+    chatbot = MRUVoiceChatbot(voice_enabled=False, intent_classifier=intent_classifier,
+                              semantic_index=semantic_index, language_layer=language_layer)
+    chatbot.session.rng = random.Random(header["seed"])
+    return chatbot
+
+
+def replay(chatbot: MRUVoiceChatbot, turns: List[dict]) -> List[dict]:
+    """Run the recorded inputs in order; returns turns whose path differs from the trace"""
+    divergences = []
+    for index, turn in enumerate(turns):
+        intent, _ = chatbot.respond(turn["in"])
+        record = chatbot.conversation_manager.conversation_history[-1]
+        response_key = [record.template_key, record.branch]
+        if intent != turn["intent"] or response_key != turn["key"]:
+            divergences.append({
+                "turn": index,
+                "input": turn["in"],
+                "recorded": [turn["intent"]] + turn["key"],
+                "replayed": [intent] + response_key
+            })
+    return divergences
+
+
+class AllocationStageTimer(StageTimer):
+    """Stage timer that also accumulates tracemalloc deltas per stage"""
+
+    def __init__(self):
+        super().__init__()
+        self.totals = defaultdict(lambda: {"calls": 0, "us": 0.0, "net_bytes": 0, "peak_bytes": 0})
+        self._memory = 0
+
+    def begin(self, stage: str):
+        tracemalloc.reset_peak()
+        self._memory = tracemalloc.get_traced_memory()[0]
+        super().begin(stage)
+
+    def end(self):
+        super().end()
+        current, peak = tracemalloc.get_traced_memory()
+        totals = self.totals[self._stage]
+        totals["calls"] += 1
+        totals["us"] += self.timings[self._stage]
+        totals["net_bytes"] += current - self._memory
+        totals["peak_bytes"] = max(totals["peak_bytes"], peak - self._memory)
+
+
+class CollapsedStackProfiler:
+    """Deterministic profiler producing `frame;frame;frame microseconds` lines
+
+    Every call and return is seen (via sys.setprofile), so each stack gets
+    its exact self time. Absolute numbers carry the tracing overhead; the
+    proportions are what a flame graph shows.
+    """
+
+    def __init__(self):
+        self.stacks: Dict[str, float] = defaultdict(float)
+        self._names: List[str] = []
+        self._starts: List[float] = []
+        self._child_time: List[float] = []
+
+    @staticmethod
+    def _frame_name(frame, event: str, arg) -> str:
+        if event == "c_call":
+            module = getattr(arg, "__module__", None) or "builtins"
+            return f"{module}.{getattr(arg, '__qualname__', arg.__name__)}"
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _callback(self, frame, event: str, arg):
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            self._names.append(self._frame_name(frame, event, arg))
+            self._starts.append(now)
+            self._child_time.append(0.0)
+        elif self._names:
+            # return, c_return or c_exception
+            elapsed = now - self._starts.pop()
+            self.stacks[";".join(self._names)] += elapsed - self._child_time.pop()
+            self._names.pop()
+            if self._child_time:
+                self._child_time[-1] += elapsed
+
+    def __enter__(self):
+        sys.setprofile(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+        self._names.clear()
+        self._starts.clear()
+        self._child_time.clear()
+
+    def write(self, path: str) -> int:
+        """Write collapsed stacks (integer microseconds); returns the number of stacks"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+        return len(self.stacks)
+
+
+def print_stage_timings(turns: List[dict]):
+    stages = defaultdict(list)
+    for turn in turns:
+        for stage, micros in turn.get("us", {}).items():
+            stages[stage].append(micros)
+    for stage, samples in stages.items():
+        samples.sort()
+        print(f"• {stage:<10} p50 {samples[len(samples) // 2]:8.1f} µs   max {samples[-1]:8.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay MRU chatbot sessions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = sub.add_parser("record", help="Record a session from queries on stdin, one per line")
+    record_parser.add_argument("trace")
+    record_parser.add_argument("--seed", type=int, default=None)
+
+    replay_parser = sub.add_parser("replay", help="Replay a trace, optionally under the profilers")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--semantic-index", metavar="PREFIX")
+    replay_parser.add_argument("--repeat", type=int, default=1, help="Replay the trace N times when profiling")
+    replay_parser.add_argument("--profile", action="store_true", help="Print cProfile statistics")
+    replay_parser.add_argument("--profile-out", metavar="PATH", help="Also dump raw cProfile data to PATH")
+    replay_parser.add_argument("--stacks", metavar="PATH", help="Write collapsed stacks to PATH")
+    replay_parser.add_argument("--allocations", action="store_true", help="Per-stage tracemalloc report")
+    replay_parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        chatbot = MRUVoiceChatbot(voice_enabled=False)
+        recorder = TraceRecorder(args.trace, args.seed).attach(chatbot)
+        count = 0
+        for line in sys.stdin:
+            if line.strip():
+                chatbot.respond(line.strip())
+                count += 1
+        recorder.close()
+        print(f"✅ Recorded {count} turns to {args.trace} (seed {recorder.seed})")
+        return
+
+    header, turns = load_trace(args.trace)
+    print(f"📼 {len(turns)} turns from session {header['session']} (seed {header['seed']})")
+    print("\n⏱️ Recorded stage timings")
+    print_stage_timings(turns)
+
+    divergences = replay(replay_chatbot(header, args.semantic_index), turns)
+    if divergences:
+        print(f"\n❌ {len(divergences)} turns took a different path on replay:")
+        for item in divergences[:args.top]:
+            print(f"• turn {item['turn']}: {item['recorded']} -> {item['replayed']}  {item['input']!r}")
+    else:
+        print("\n✅ Replay reproduced every recorded intent and response key")
+
+    def prepare_replays():
+        # Chatbots are built up front so start-up cost stays out of the profiles
+        chatbots = [replay_chatbot(header, args.semantic_index) for _ in range(args.repeat)]
+
+        def run_replays():
+            for chatbot in chatbots:
+                replay(chatbot, turns)
+        return run_replays
+
+    if args.profile or args.profile_out:
+        run = prepare_replays()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        run()
+        profiler.disable()
+        if args.profile_out:
+            profiler.dump_stats(args.profile_out)
+            print(f"\n💾 cProfile data written to {args.profile_out}")
+        if args.profile:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(args.top)
+            print("\n🔬 cProfile (cumulative)")
+            print(output.getvalue())
+
+    if args.stacks:
+        run = prepare_replays()
+        with CollapsedStackProfiler() as stack_profiler:
+            run()
+        count = stack_profiler.write(args.stacks)
+        print(f"\n🔥 {count} collapsed stacks written to {args.stacks}")
+
+    if args.allocations:
+        tracemalloc.start(25)
+        chatbot = replay_chatbot(header, args.semantic_index)
+        timer = chatbot.session.stage_timer = AllocationStageTimer()
+        before = tracemalloc.take_snapshot()
+        for _ in range(args.repeat):
+            replay(chatbot, turns)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        print("\n🧠 Allocations per stage")
+        for stage, totals in timer.totals.items():
+            print(f"• {stage:<10} {totals['calls']:6d} calls  net {totals['net_bytes'] / totals['calls']:9.1f} B/turn"
+                  f"  peak {totals['peak_bytes'] / 1024:8.1f} KiB")
+        print("\n📍 Top allocation sites still held after replay")
+        for stat in after.compare_to(before, "lineno")[:args.top]:
+            print(f"• {stat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Latency SLO Controller for MRU Voice Chatbot
+============================================
+
+Under heavy load a slightly plainer answer now beats a rich answer late.
+The controller watches rolling p95 latency per stage and switches optional
+pipeline features off, one degradation level at a time:
+
+    full -> lean_nlp -> cached_templates -> text_only
+
+- lean_nlp: no language detection/translation and no semantic retrieval
+  for unmatched queries (keyword intents only)
+- cached_templates: answers come only from the render cache, never
+  rendered afresh (e.g. right after a knowledge-base edit); an uncached
+  branch falls back to another cached branch of the same intent, or to
+  the general answer (as admission control does when shedding)
+- text_only: clients that show text stop speaking answers
+- Levels are cumulative and configurable (a JSON file: targets, levels)
+- Stages: classify and generate (from the turn's stage timer) and speak,
+  measured as time beyond the estimated speaking time, so long answers do
+  not count as slow ones
+- Any stage's p95 over its target steps down one level. All stages under
+  `recover_ratio` of their targets steps back up. Windows restart at every
+  transition so each decision sees only the current level, and a step up
+  that is undone at once doubles the wait before the next one, so a
+  sustained overload does not flap between two levels
+- A stage the current level switched off (speak at text_only) reports
+  nothing, which is not the same as healthy. Once the wait to step up is
+  over, one turn in `probe_every` runs with the level above's features
+  instead, and the step up needs the last `min_samples` probe samples of
+  such a stage under `recover_ratio` too. Probe samples never step down
+- Every transition is logged; level, transitions and time per level are
+  in `report()`
+
+Usage:
+    python mru_chatbot_system.py --slo [CONFIG.json]
+    python slo_controller.py simulate [--turns 900] [--peak-load 4]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from chatbot_logging import get_logger
+from load_test import percentile
+
+logger = get_logger("slo")
+
+FEATURES = ("language_layer", "semantic_search", "fresh_render", "speech")
+
+# p95 targets per stage, milliseconds
+SLO_TARGETS_MS = {"classify": 50.0, "generate": 25.0, "speak": 1000.0}
+
+# Each level also disables everything the levels before it did
+DEFAULT_LEVELS = [
+    {"name": "full", "disable": []},
+    {"name": "lean_nlp", "disable": ["language_layer", "semantic_search"]},
+    {"name": "cached_templates", "disable": ["fresh_render"]},
+    {"name": "text_only", "disable": ["speech"]},
+]
+
+
+class DegradationLevel:
+    __slots__ = ("index", "name", "disabled")
+
+    def __init__(self, index: int, name: str, disabled: frozenset):
+        self.index = index
+        self.name = name
+        self.disabled = disabled
+
+
+class SLOController:
+    """Rolling p95 per stage driving a ladder of degradation levels"""
+
+    def __init__(self, targets_ms: Dict[str, float] = None, levels: Sequence[dict] = None,
+                 window: int = 100, min_samples: int = 20, recover_ratio: float = 0.7,
+                 recover_samples: int = 50, max_recover_samples: int = 400, probe_every: int = 4):
+        self.targets_ms = dict(SLO_TARGETS_MS if targets_ms is None else targets_ms)
+        self.levels = self._build_levels(DEFAULT_LEVELS if levels is None else levels)
+        self.window = window
+        self.min_samples = min_samples
+        self.recover_ratio = recover_ratio
+        self.recover_samples = recover_samples
+        self.max_recover_samples = max_recover_samples
+        self.probe_every = probe_every
+        self.level = self.levels[0]
+        # Turns to wait at each level before stepping up from it; doubled when a step up fails
+        self.recover_after = [recover_samples] * len(self.levels)
+        self.samples: Dict[str, deque] = {stage: deque(maxlen=window) for stage in self.targets_ms}
+        # Turns observed at the current level
+        self.turns_at_level = 0
+        self.transitions: List[dict] = []
+        self.step_downs = 0
+        self.step_ups = 0
+        self.seconds_at_level = {level.name: 0.0 for level in self.levels}
+        self._level_since = time.monotonic()
+        # Whether the current level was reached by stepping up
+        self._stepped_up = False
+        # Stages that had samples at the previous level
+        self._sampled_stages = frozenset()
+        # Stages with no samples at this level only because it switched them off
+        self.probing = frozenset()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_levels(levels: Sequence[dict]) -> List[DegradationLevel]:
+        built, disabled = [], frozenset()
+        for index, level in enumerate(levels):
+            unknown = set(level.get("disable", ())) - set(FEATURES)
+            if unknown:
+                raise ValueError(f"Level {level['name']!r} disables unknown features {sorted(unknown)}; "
+                                 f"choose from {FEATURES}")
+            disabled = disabled | frozenset(level.get("disable", ()))
+            built.append(DegradationLevel(index, level["name"], disabled))
+        if not built:
+            raise ValueError("At least one degradation level is required")
+        return built
+
+    @classmethod
+    def from_config(cls, path: str) -> "SLOController":
+        """Controller from a JSON file with optional targets_ms, levels, window, ... keys"""
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    @property
+    def disabled(self) -> frozenset:
+        """Features to switch off for the next turn; a probe turn uses the level above's set"""
+        if self.probing and self.turns_at_level % self.probe_every == 0:
+            return self.levels[self.level.index - 1].disabled
+        return self.level.disabled
+
+    def record(self, stage: str, ms: float):
+        samples = self.samples.get(stage)
+        if samples is not None:
+            with self._lock:
+                samples.append(ms)
+
+    def observe_turn(self, timings_us: Dict[str, float]):
+        """Record a turn's stage timings (StageTimer microseconds) and adjust the level"""
+        with self._lock:
+            for stage, us in timings_us.items():
+                samples = self.samples.get(stage)
+                if samples is not None:
+                    samples.append(us / 1000)
+            self.turns_at_level += 1
+            self._evaluate()
+
+    def p95(self) -> Dict[str, Optional[float]]:
+        """Rolling p95 per stage; None until a stage has min_samples at the current level"""
+        return {stage: percentile(list(samples), 95) if len(samples) >= self.min_samples else None
+                for stage, samples in self.samples.items()}
+
+    def _evaluate(self):
+        if self._stepped_up and self.turns_at_level == self.recover_samples:
+            # The last step up held: the next one from below needs only the normal wait
+            self.recover_after[self.level.index + 1] = self.recover_samples
+        p95 = self.p95()
+        for stage, value in p95.items():
+            # Probe samples measure the level above, not this one
+            if stage not in self.probing and value is not None and value > self.targets_ms[stage]:
+                if self.level.index + 1 < len(self.levels):
+                    self._transition(self.level.index + 1, stage, value)
+                return
+        if self.level.index == 0 or self.turns_at_level < self.recover_after[self.level.index]:
+            return
+        if not self.probing:
+            self.probing = frozenset(stage for stage in self._sampled_stages if not self.samples[stage])
+        for stage in self.probing:
+            recent = list(self.samples[stage])[-self.min_samples:]
+            p95[stage] = percentile(recent, 95) if len(recent) == self.min_samples else None
+            if p95[stage] is None:
+                return
+        if all(value is None or value < self.targets_ms[stage] * self.recover_ratio for stage, value in p95.items()):
+            self._transition(self.level.index - 1, None, None)
+
+    def _transition(self, index: int, stage: Optional[str], p95_ms: Optional[float]):
+        previous = self.level
+        stepping_down = index > previous.index
+        if stepping_down and self._stepped_up and self.turns_at_level < self.recover_samples:
+            # The step up from this level did not hold: wait longer before the next try
+            self.recover_after[index] = min(self.recover_after[index] * 2, self.max_recover_samples)
+        self._stepped_up = not stepping_down
+
+        now = time.monotonic()
+        self.seconds_at_level[previous.name] += now - self._level_since
+        self._level_since = now
+        self.level = self.levels[index]
+        self.turns_at_level = 0
+        self._sampled_stages = frozenset(stage for stage, samples in self.samples.items() if samples)
+        self.probing = frozenset()
+        for samples in self.samples.values():
+            samples.clear()
+
+        transition = {"from": previous.name, "to": self.level.name, "at": time.time(),
+                      "disabled": sorted(self.level.disabled)}
+        if stepping_down:
+            self.step_downs += 1
+            transition.update(stage=stage, p95_ms=round(p95_ms, 2), target_ms=self.targets_ms[stage])
+            logger.warning("Latency SLO missed, degrading", extra=transition)
+        else:
+            self.step_ups += 1
+            logger.info("Latency back within SLO, restoring", extra=transition)
+        self.transitions.append(transition)
+
+    def report(self) -> dict:
+        with self._lock:
+            seconds = dict(self.seconds_at_level)
+            seconds[self.level.name] += time.monotonic() - self._level_since
+            return {
+                "level": self.level.index,
+                "level_name": self.level.name,
+                "disabled": sorted(self.level.disabled),
+                "probing": sorted(self.probing),
+                "p95_ms": {stage: None if value is None else round(value, 2) for stage, value in self.p95().items()},
+                "targets_ms": dict(self.targets_ms),
+                "step_downs": self.step_downs,
+                "step_ups": self.step_ups,
+                "seconds_at_level": {name: round(value, 1) for name, value in seconds.items()},
+                "recent_transitions": self.transitions[-10:],
+            }
+
+
+# Simulated stage costs (ms at load 1) and the feature that each optional part needs
+_SIMULATED_COSTS = {
+    "classify": [(2.0, None), (4.0, "language_layer"), (10.0, "semantic_search")],
+    "generate": [(1.0, None), (6.0, "fresh_render")],
+    "speak": [(300.0, "speech")],
+}
+
+
+def simulate(turns: int, peak_load: float, seed: int = 3, controller: SLOController = None) -> dict:
+    """Steady load, a spike to `peak_load` for the middle third, then steady again
+
+    Stage latencies are drawn from a cost model in which disabled features
+    cost nothing, so the run shows the controller stepping down during the
+    spike and back up after it.
+    """
+    controller = controller or SLOController()
+    rng = random.Random(seed)
+    timeline = []
+    for turn in range(turns):
+        load = peak_load if turns // 3 <= turn < 2 * turns // 3 else 1.0
+        disabled = controller.disabled
+        timings = {}
+        for stage, parts in _SIMULATED_COSTS.items():
+            cost = sum(ms for ms, feature in parts if feature not in disabled)
+            if stage == "speak" and "speech" in disabled:
+                continue
+            timings[stage] = cost * load * rng.lognormvariate(0.0, 0.35)
+        if "speak" in timings:
+            controller.record("speak", timings.pop("speak"))
+        controller.observe_turn({stage: ms * 1000 for stage, ms in timings.items()})
+        timeline.append(controller.level.index)
+    report = controller.report()
+    report["turns_at_level"] = {level.name: timeline.count(level.index) for level in controller.levels}
+    report["timeline"] = timeline
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency SLO controller tools")
+    parser.add_argument("command", choices=["simulate"])
+    parser.add_argument("--turns", type=int, default=900)
+    parser.add_argument("--peak-load", type=float, default=4.0, help="Latency multiplier during the spike")
+    parser.add_argument("--config", metavar="PATH", help="Controller configuration (JSON)")
+    args = parser.parse_args()
+
+    controller = SLOController.from_config(args.config) if args.config else SLOController()
+    report = simulate(args.turns, args.peak_load, controller=controller)
+    print(f"📊 {args.turns} simulated turns, load x{args.peak_load:g} for the middle third: "
+          f"{report['step_downs']} step downs, {report['step_ups']} step ups\n")
+    for name, count in report["turns_at_level"].items():
+        print(f"• {name:<18} {count:>5} turns")
+    print("\nLevel changes:")
+    timeline = report["timeline"]
+    for turn, level in enumerate(timeline):
+        if turn == 0 or level != timeline[turn - 1]:
+            print(f"• turn {turn:>5}  {controller.levels[level].name}")
+
+
+if __name__ == "__main__":
+    main()
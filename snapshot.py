@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Warm-Start Engine Snapshots for MRU Voice Chatbot
+=================================================
+
+Serializes the initialized, immutable engine state (knowledge base and
+intent patterns) into a single versioned file. Workers load it with one
+memory-mapped read instead of rebuilding everything from source, and fall
+back to a normal build when the snapshot was produced by different code.
+
+File layout:
+    8 bytes   magic  b"MRUSNAP1"
+    4 bytes   format version (big-endian)
+    32 bytes  SHA-256 of the source modules that built the state
+    rest      pickled engine state
+
+Usage:
+    python snapshot.py compile [--output mru_engine.snap]
+    python mru_chatbot_system.py --snapshot mru_engine.snap
+    python snapshot.py bench   [--output mru_engine.snap]
+"""
+
+import argparse
+import functools
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import intent_registry
+import mru_chatbot_system
+from chatbot_logging import get_logger
+from intent_registry import INTENTS
+from mru_chatbot_system import IntentClassifier, MRUKnowledgeBase, MRUVoiceChatbot
+
+MAGIC = b"MRUSNAP1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">8sI32s")
+DEFAULT_SNAPSHOT_PATH = "mru_engine.snap"
+
+logger = get_logger("snapshot")
+
+# Modules whose code determines the engine state; any edit invalidates snapshots
+SOURCE_MODULES = [mru_chatbot_system, intent_registry]
+
+
+@functools.lru_cache(maxsize=1)
+def source_fingerprint() -> bytes:
+    """Digest of the source code that the snapshot state was built from"""
+    digest = hashlib.sha256()
+    for module in SOURCE_MODULES:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def build_engine_state() -> dict:
+    """Build the immutable engine components from source"""
+    return {
+        "knowledge": MRUKnowledgeBase().knowledge,
+        "intent_patterns": IntentClassifier().intent_patterns
+    }
+
+
+def compile_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """Write a snapshot of the freshly built engine; returns its size in bytes"""
+    payload = pickle.dumps(build_engine_state(), protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, source_fingerprint()))
+        f.write(payload)
+    # Atomic replace so running workers never see a half-written file
+    os.replace(tmp_path, path)
+    return HEADER.size + len(payload)
+
+
+def load_engine_state(path: str = DEFAULT_SNAPSHOT_PATH) -> Optional[dict]:
+    """Load engine state from a snapshot, or None if missing or stale"""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < HEADER.size:
+                return None
+            magic, version, fingerprint = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC or version != FORMAT_VERSION or fingerprint != source_fingerprint():
+                return None
+            with memoryview(mapped) as view:
+                return pickle.loads(view[HEADER.size:])
+    except (OSError, ValueError, pickle.UnpicklingError):
+        return None
+
+
+def load_chatbot(path: str = DEFAULT_SNAPSHOT_PATH, voice_enabled: bool = False) -> MRUVoiceChatbot:
+    """Chatbot built from a snapshot when it matches this code, from source otherwise"""
+    state = load_engine_state(path)
+    if state is not None and INTENTS.config_entries:
+        # Snapshots hold the built-in intents only; config intents come from the live registry
+        state["intent_patterns"] = INTENTS.table().intent_patterns
+    if state is None:
+        logger.warning("Snapshot %s missing or out of date, building from source", path)
+        return MRUVoiceChatbot(voice_enabled=voice_enabled)
+    return MRUVoiceChatbot(
+        voice_enabled=voice_enabled,
+        knowledge_base=MRUKnowledgeBase(knowledge=state["knowledge"]),
+        intent_classifier=IntentClassifier(intent_patterns=state["intent_patterns"])
+    )
+
+
+# Fallback start time for first_answer when not spawned by bench
+_IMPORTED_AT = time.time()
+
+
+def first_answer(path: Optional[str]):
+    """Start cold, answer one query, print seconds since process spawn (bench) or since import"""
+    chatbot = load_chatbot(path) if path else MRUVoiceChatbot(voice_enabled=False)
+    chatbot.respond("How much are the fees?")
+    started = float(os.environ.get("MRU_BENCH_T0", _IMPORTED_AT))
+    print(f"FIRST_ANSWER {time.time() - started:.6f}")
+
+
+def bench(path: str, runs: int = 5):
+    """Compare cold start to first answered query with and without a snapshot"""
+    compile_snapshot(path)
+
+    def cold_start(args):
+        samples = []
+        for _ in range(runs):
+            # Measured from process spawn, so interpreter and import time count too
+            env = dict(os.environ, MRU_BENCH_T0=repr(time.time()))
+            output = subprocess.run([sys.executable, __file__, "--first-answer", *args],
+                                    capture_output=True, text=True, env=env, check=True).stdout
+            samples.append(float(output.split("FIRST_ANSWER")[1].split()[0]))
+        return min(samples)
+
+    source = cold_start([])
+    snapshot = cold_start(["--output", path])
+    print(f"• Snapshot size: {os.path.getsize(path)} bytes")
+    print(f"• Cold start to first answer (build from source): {source * 1000:.1f} ms")
+    print(f"• Cold start to first answer (snapshot):          {snapshot * 1000:.1f} ms")
+
+    iterations = 200
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build_engine_state()
+    built = (time.perf_counter() - start) / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        load_engine_state(path)
+    loaded = (time.perf_counter() - start) / iterations
+    print(f"• Engine state build: {built * 1e6:.1f} µs | snapshot load: {loaded * 1e6:.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile or benchmark MRU engine snapshots")
+    parser.add_argument("command", nargs="?", choices=["compile", "bench"])
+    parser.add_argument("--output", default=None, help=f"Snapshot path (default {DEFAULT_SNAPSHOT_PATH})")
+    # Child process of bench: one cold start
+    parser.add_argument("--first-answer", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.first_answer:
+        first_answer(args.output)
+    elif args.command is None:
+        parser.error("a command is required (compile or bench)")
+    elif args.command == "compile":
+        path = args.output or DEFAULT_SNAPSHOT_PATH
+        size = compile_snapshot(path)
+        print(f"✅ Wrote {path} ({size} bytes, format v{FORMAT_VERSION})")
+    else:
+        bench(args.output or DEFAULT_SNAPSHOT_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Process-Pool Speech Synthesis for MRU Voice Chatbot
+===================================================
+
+pyttsx3 engines are not thread-safe, so every speaking session used to
+queue on one engine. This pool synthesizes in parallel instead:
+
+- Worker processes, each holding its own TTS engine, render text to PCM
+  buffers instead of playing it
+- Buffers come back through shared memory: a worker writes the audio into
+  a fresh `multiprocessing.shared_memory` block and returns only its name,
+  so no audio is pickled. The caller plays it and releases the block
+- Answers are split into sentences and queued by sentence position: every
+  session's first sentence is synthesized before anyone's second, so a
+  new answer starts playing while long answers finish in the background
+- A failure mid-answer raises SpeechPoolError carrying the sentences not
+  yet played, so a fallback voice can finish the answer without repeating it
+- Queue wait and synthesis time are metered per sentence, together with
+  seconds of audio produced per wall-clock second, the figure that should
+  grow with the number of workers
+
+The `simulated` backend renders voice-like tones instead of speech (no
+TTS driver needed), at a CPU cost proportional to the text length.
+
+Usage:
+    python mru_chatbot_system.py --tts-workers 4
+    python multi_device.py run --mic 0 --mic 2 --tts-workers 2
+    python tts_pool.py benchmark [--sessions 8] [--workers 1 2 4]
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, List, Optional, Tuple
+
+from chatbot_logging import get_logger
+from load_test import percentile
+from voice_rendering import SPEECH_RATE_WPM, speaking_seconds, split_sentences
+
+logger = get_logger("tts_pool")
+
+BACKENDS = ("pyttsx3", "simulated")
+
+SIMULATED_SAMPLE_RATE = 16000
+
+# Synthesis of one worker process: text and optional voice id -> (pcm, sample rate, sample width, channels)
+_synthesizer: Optional[Callable[[str, Optional[str]], Tuple[bytes, int, int, int]]] = None
+
+
+class Pyttsx3Synthesizer:
+    """Renders to a temporary WAV file with pyttsx3's save_to_file, then reads the PCM back"""
+
+    def __init__(self, rate: int = SPEECH_RATE_WPM, volume: float = 0.8):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty("rate", rate)
+        self.engine.setProperty("volume", volume)
+        self.default_voice = self.engine.getProperty("voice")
+
+    def __call__(self, text: str, voice_id: Optional[str] = None) -> Tuple[bytes, int, int, int]:
+        self.engine.setProperty("voice", voice_id or self.default_voice)
+        fd, path = tempfile.mkstemp(suffix=".wav", prefix="tts-")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            with wave.open(path, "rb") as f:
+                return f.readframes(f.getnframes()), f.getframerate(), f.getsampwidth(), f.getnchannels()
+        finally:
+            os.unlink(path)
+
+
+class SimulatedSynthesizer:
+    """Voice-like tones lasting as long as the text would take to say"""
+
+    def __init__(self, rate: int = SPEECH_RATE_WPM, volume: float = 0.8):
+        self.rate = rate
+        self.volume = volume
+
+    def __call__(self, text: str, voice_id: Optional[str] = None) -> Tuple[bytes, int, int, int]:
+        import numpy as np
+        from audio_cache import synthesize_phrase
+
+        words = text.split() or [""]
+        samples_per_word = int(speaking_seconds(text, self.rate) / len(words) * SIMULATED_SAMPLE_RATE)
+        signal = np.concatenate([synthesize_phrase(word, 0, SIMULATED_SAMPLE_RATE)[:samples_per_word]
+                                 for word in words])
+        pcm = (np.clip(signal * self.volume, -1, 0.9999) * 32768).astype("<i2")
+        return pcm.tobytes(), SIMULATED_SAMPLE_RATE, 2, 1
+
+
+def _init_worker(backend: str, rate: int, volume: float):
+    global _synthesizer
+    _synthesizer = (Pyttsx3Synthesizer if backend == "pyttsx3" else SimulatedSynthesizer)(rate, volume)
+
+
+def _synthesize(text: str, voice_id: Optional[str]) -> Tuple[str, int, int, int, int, float]:
+    """Runs in a worker: synthesize into a new shared-memory block and return its name"""
+    start = time.perf_counter()
+    pcm, sample_rate, sample_width, channels = _synthesizer(text, voice_id)
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(pcm)))
+    block.buf[:len(pcm)] = pcm
+    block.close()
+    return block.name, len(pcm), sample_rate, sample_width, channels, time.perf_counter() - start
+
+
+class SpeechPoolError(RuntimeError):
+    """Synthesis or playback failed; `unspoken` is the text from the first sentence not fully played"""
+
+    def __init__(self, message: str, unspoken: str):
+        super().__init__(message)
+        self.unspoken = unspoken
+
+
+class SpeechBuffer:
+    """Synthesized audio of one sentence, still in the shared-memory block the worker wrote"""
+
+    __slots__ = ("session_id", "index", "text", "sample_rate", "sample_width", "channels", "pcm", "_block", "_pool")
+
+    def __init__(self, session_id: str, index: int, text: str, block: shared_memory.SharedMemory, size: int,
+                 sample_rate: int, sample_width: int, channels: int, pool: "SpeechPool"):
+        self.session_id = session_id
+        self.index = index
+        self.text = text
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self._block = block
+        self._pool = pool
+        # Zero-copy view of the PCM frames
+        self.pcm = block.buf[:size]
+
+    @property
+    def seconds(self) -> float:
+        return len(self.pcm) / (self.sample_rate * self.sample_width * self.channels)
+
+    def release(self):
+        """Free the shared-memory block; the buffer is unusable afterwards"""
+        if self._block is None:
+            return
+        self.pcm.release()
+        self._block.close()
+        self._block.unlink()
+        self._block = None
+        self._pool._released(self)
+
+
+class SpeechJob:
+    __slots__ = ("session_id", "index", "text", "voice_id", "submitted", "future")
+
+    def __init__(self, session_id: str, index: int, text: str, voice_id: Optional[str]):
+        self.session_id = session_id
+        self.index = index
+        self.text = text
+        self.voice_id = voice_id
+        self.submitted = time.perf_counter()
+        self.future: Future = Future()
+
+
+_pyaudio = None
+_pyaudio_lock = threading.Lock()
+
+
+def play_buffer(buffer: SpeechBuffer, output_device_index: Optional[int] = None):
+    """Play a buffer on an output device through PyAudio (installed with speech_recognition's microphone support)"""
+    global _pyaudio
+    import pyaudio
+    with _pyaudio_lock:
+        if _pyaudio is None:
+            _pyaudio = pyaudio.PyAudio()
+        stream = _pyaudio.open(format=_pyaudio.get_format_from_width(buffer.sample_width),
+                               channels=buffer.channels, rate=buffer.sample_rate, output=True,
+                               output_device_index=output_device_index)
+    try:
+        stream.write(bytes(buffer.pcm))
+    finally:
+        stream.stop_stream()
+        stream.close()
+
+
+class SpeechPool:
+    """Worker processes with one TTS engine each, fed sentence jobs in position order"""
+
+    def __init__(self, workers: Optional[int] = None, backend: str = "pyttsx3", rate: int = SPEECH_RATE_WPM,
+                 volume: float = 0.8):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown TTS backend {backend!r}; choose from {BACKENDS}")
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        # Workers must share our resource tracker: a block a worker created and we
+        # unlinked must not be "cleaned up" again when the worker exits
+        resource_tracker.ensure_running()
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(backend, rate, volume))
+        self._cond = threading.Condition()
+        # (sentence index, submission order, job): first sentences of all sessions go first
+        self._queue: List[Tuple[int, int, SpeechJob]] = []
+        self._order = itertools.count()
+        self._in_flight = 0
+        self._closed = False
+        self._live_buffers = set()
+        self.reset_metrics()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="tts-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def reset_metrics(self):
+        self.jobs = 0
+        self.failures = 0
+        self.chars = 0
+        self.audio_seconds = 0.0
+        self.wait_ms: List[float] = []
+        self.synthesis_ms: List[float] = []
+        self.first_sentence_ms: List[float] = []
+        self._first_submit: Optional[float] = None
+        self._last_finish: Optional[float] = None
+
+    def submit(self, session_id: str, text: str, voice_id: Optional[str] = None) -> List[Future]:
+        """Queue text sentence by sentence; the futures resolve to SpeechBuffers, in sentence order"""
+        jobs = [SpeechJob(session_id, index, sentence, voice_id)
+                for index, sentence in enumerate(split_sentences(text))]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SpeechPool is closed")
+            if self._first_submit is None:
+                self._first_submit = time.perf_counter()
+            for job in jobs:
+                heapq.heappush(self._queue, (job.index, next(self._order), job))
+            self._cond.notify()
+        return [job.future for job in jobs]
+
+    def speak(self, session_id: str, text: str, voice_id: Optional[str] = None,
+              play: Optional[Callable[[SpeechBuffer], None]] = play_buffer):
+        """Synthesize and play text; a sentence plays as soon as it (and the ones before it) are ready
+
+        Raises SpeechPoolError, with the unplayed rest of the text, if a
+        sentence cannot be synthesized or played.
+        """
+        sentences = split_sentences(text)
+        try:
+            futures = self.submit(session_id, text, voice_id)
+        except Exception as e:
+            raise SpeechPoolError(str(e), " ".join(sentences)) from e
+        played = 0
+        try:
+            for future in futures:
+                buffer = future.result()
+                try:
+                    if play is not None:
+                        play(buffer)
+                finally:
+                    buffer.release()
+                played += 1
+        except Exception as e:
+            raise SpeechPoolError(str(e), " ".join(sentences[played:])) from e
+        finally:
+            # After a playback error, still free whatever the rest of the answer produced
+            for future in futures:
+                future.add_done_callback(self._release_result)
+
+    @staticmethod
+    def _release_result(future: Future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().release()
+
+    def _dispatch(self):
+        """Hand jobs to workers only as workers free up, so the queue order decides what runs next"""
+        while True:
+            with self._cond:
+                while not self._closed and (not self._queue or self._in_flight >= self.workers):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+                self._in_flight += 1
+            dispatched = time.perf_counter()
+            try:
+                result = self._executor.submit(_synthesize, job.text, job.voice_id)
+            except Exception as e:
+                self._finish(job, dispatched, None, e)
+                continue
+            result.add_done_callback(lambda result, job=job, dispatched=dispatched:
+                                     self._finish(job, dispatched, result, None))
+
+    def _finish(self, job: SpeechJob, dispatched: float, result: Optional[Future], error: Optional[Exception]):
+        if error is None:
+            error = result.exception()
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+            self._last_finish = time.perf_counter()
+            self.jobs += 1
+            self.wait_ms.append((dispatched - job.submitted) * 1000)
+            if error is not None:
+                self.failures += 1
+        if error is not None:
+            logger.warning("Speech synthesis failed", extra={"session_id": job.session_id, "error": str(error)})
+            job.future.set_exception(error)
+            return
+        name, size, sample_rate, sample_width, channels, seconds = result.result()
+        buffer = SpeechBuffer(job.session_id, job.index, job.text, shared_memory.SharedMemory(name=name), size,
+                              sample_rate, sample_width, channels, self)
+        with self._cond:
+            self._live_buffers.add(buffer)
+            self.chars += len(job.text)
+            self.audio_seconds += buffer.seconds
+            self.synthesis_ms.append(seconds * 1000)
+            if job.index == 0:
+                self.first_sentence_ms.append((self._last_finish - job.submitted) * 1000)
+        job.future.set_result(buffer)
+
+    def _released(self, buffer: SpeechBuffer):
+        with self._cond:
+            self._live_buffers.discard(buffer)
+
+    def report(self) -> dict:
+        with self._cond:
+            elapsed = (self._last_finish or 0.0) - (self._first_submit or 0.0)
+            return {
+                "workers": self.workers,
+                "backend": self.backend,
+                "jobs": self.jobs,
+                "failures": self.failures,
+                "queued": len(self._queue),
+                "wait_ms_p50": round(percentile(self.wait_ms, 50), 2),
+                "wait_ms_p95": round(percentile(self.wait_ms, 95), 2),
+                "synthesis_ms_p50": round(percentile(self.synthesis_ms, 50), 2),
+                "synthesis_ms_p95": round(percentile(self.synthesis_ms, 95), 2),
+                "first_sentence_ms_p95": round(percentile(self.first_sentence_ms, 95), 2),
+                "audio_seconds": round(self.audio_seconds, 2),
+                "chars_per_s": round(self.chars / elapsed, 1) if elapsed > 0 else 0.0,
+                # Seconds of speech produced per wall-clock second; above 1 the pool outpaces playback
+                "realtime_factor": round(self.audio_seconds / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+
+    def close(self):
+        """Drop queued jobs, stop the workers and free buffers nobody released"""
+        with self._cond:
+            self._closed = True
+            dropped, self._queue = self._queue, []
+            self._cond.notify_all()
+        for _, _, job in dropped:
+            job.future.cancel()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        for buffer in list(self._live_buffers):
+            buffer.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def benchmark(sessions: int, answers: int, workers: int, backend: str = "simulated") -> dict:
+    """Concurrent sessions each speaking voice-rendered answers through a pool of `workers`"""
+    from mru_chatbot_system import MRUKnowledgeBase, ResponseGenerator
+    from voice_rendering import branches
+
+    generator = ResponseGenerator(MRUKnowledgeBase())
+    texts = [" ".join(generator.render_voice(key, branch)[:2])
+             for key in generator.dispatch.renderers for branch in branches(generator, key)]
+    with SpeechPool(workers, backend) as pool:
+        # Start the workers before timing: engine start-up is not synthesis
+        pool.speak("warm-up", " ".join(f"Warm up {i}." for i in range(pool.workers)), play=None)
+        pool.reset_metrics()
+
+        def session(index: int):
+            for turn in range(answers):
+                pool.speak(f"session-{index}", texts[(index * answers + turn) % len(texts)], play=None)
+
+        threads = [threading.Thread(target=session, args=(index,)) for index in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return pool.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process-pool speech synthesis")
+    parser.add_argument("command", choices=["benchmark"])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--answers", type=int, default=5, help="Answers spoken per session")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--backend", choices=BACKENDS, default="simulated")
+    args = parser.parse_args()
+
+    print(f"📊 {args.sessions} sessions x {args.answers} answers, {args.backend} synthesis "
+          f"({os.cpu_count()} CPUs)\n")
+    print(f"{'workers':>8} {'wait p50':>10} {'wait p95':>10} {'synth p50':>10} {'1st p95':>10} "
+          f"{'chars/s':>10} {'realtime':>9}")
+    for workers in args.workers:
+        report = benchmark(args.sessions, args.answers, workers, args.backend)
+        print(f"{workers:>8} {report['wait_ms_p50']:>8.1f}ms {report['wait_ms_p95']:>8.1f}ms "
+              f"{report['synthesis_ms_p50']:>8.1f}ms {report['first_sentence_ms_p95']:>8.1f}ms "
+              f"{report['chars_per_s']:>10.0f} {report['realtime_factor']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
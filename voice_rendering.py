@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Voice Rendering for MRU Voice Chatbot
+=====================================
+
+Text answers are written for a screen: emoji headings, "•" bullet lists
+and long recruiter or facility lists. Read aloud they take a minute or
+more. Voice mode speaks a compact rendering instead:
+
+- Key facts first: each intent can register a voice renderer
+  (`@INTENTS.voice_renderer`) that returns sentences in priority order;
+  intents without one (e.g. config-file intents) fall back to a generic
+  conversion of the text answer
+- Lists are capped ("A, B, C and 5 more") and symbols, emoji and URLs
+  are stripped or spelled out
+- Sentences are grouped into short pages: the first is spoken, the rest
+  wait for the user to say "more"
+
+Speaking time is estimated from the word count at the TTS rate the
+VoiceHandler configures.
+
+Usage:
+    python voice_rendering.py report
+"""
+
+import argparse
+import re
+from typing import List, Sequence, Tuple
+
+# Words per minute; VoiceHandler sets the same pyttsx3 rate
+SPEECH_RATE_WPM = 150
+
+# Characters spoken per page before the rest is held back for "more"
+PAGE_CHARS = 200
+
+MORE_PROMPT = "Say more to hear the rest."
+MORE_COMMANDS = ("more", "say more", "tell me more")
+
+# Bullets, arrows, technical symbols, dingbats, emoji and their joiners/selectors
+_SYMBOLS = re.compile("[\u2022\u2190-\u21ff\u2300-\u23ff\u2500-\u27bf\u2b00-\u2bff\ufe0f\u200d\U0001f000-\U0001faff]")
+_URL = re.compile(r"https?://(www\.)?")
+_SPOKEN = [
+    (re.compile(r"(\d)\s+-\s+(\d)"), r"\1 to \2"),
+    (re.compile(r"\bINR\s*"), "rupees "),
+    (re.compile(r"\bLPA\b"), "lakhs per annum"),
+    (re.compile(r"(\d)\+(?=\s|$)"), r"\1 plus"),
+    (re.compile(r"(\d)%"), r"\1 percent"),
+    (re.compile(r"\s*&\s*"), " and "),
+    (re.compile(r"\s*\|\s*"), ", "),
+]
+_WORD = re.compile(r"[\w']+")
+_SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+
+
+def speakable(text: str) -> str:
+    """Strip symbols and spell out the shorthand a TTS engine would stumble over"""
+    text = _URL.sub("", _SYMBOLS.sub("", text))
+    for pattern, replacement in _SPOKEN:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+
+def spoken_list(items: Sequence[str], cap: int = 3) -> str:
+    """'A, B and C', or 'A, B, C and 4 more' past the cap"""
+    items = list(items)
+    if len(items) > cap:
+        return f"{', '.join(items[:cap])} and {len(items) - cap} more"
+    if len(items) <= 1:
+        return "".join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def text_sentences(text: str, cap: int = 3) -> List[str]:
+    """Generic voice rendering of a text answer: one sentence per line, bullet runs as capped lists"""
+    sentences, bullets = [], []
+
+    def flush_bullets():
+        if bullets:
+            sentences.append(spoken_list(bullets, cap) + ".")
+            bullets.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("•") or re.match(r"\d+\.\s", line):
+            bullets.append(re.sub(r"^(•|\d+\.)\s*", "", line))
+            continue
+        flush_bullets()
+        line = _SYMBOLS.sub("", line).strip()
+        if line:
+            sentences.append(line if line[-1] in ".?!:" else line + ".")
+    flush_bullets()
+    return sentences
+
+
+def paginate(sentences: Sequence[str], page_chars: int = PAGE_CHARS) -> List[str]:
+    """Group speakable sentences into pages of roughly page_chars"""
+    pages, current = [], ""
+    for sentence in sentences:
+        sentence = speakable(sentence)
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) > page_chars:
+            pages.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current or not pages:
+        pages.append(current)
+    return pages
+
+
+def speaking_seconds(text: str, wpm: int = SPEECH_RATE_WPM) -> float:
+    """Estimated time to speak text; symbols the engine reads by name are not counted"""
+    return len(_WORD.findall(_SYMBOLS.sub("", text))) * 60.0 / wpm
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+def shorten_to(text: str, seconds: float, wpm: int = SPEECH_RATE_WPM) -> Tuple[str, str]:
+    """Split text into the leading sentences that can be spoken within seconds, and the rest"""
+    sentences = split_sentences(text)
+    spoken, used = [], 0.0
+    for sentence in sentences:
+        used += speaking_seconds(sentence, wpm)
+        if used > seconds:
+            break
+        spoken.append(sentence)
+    return " ".join(spoken), " ".join(sentences[len(spoken):])
+
+
+def branches(generator, template_key: str) -> List[str]:
+    variants = generator.dispatch.variants.get(template_key)
+    if variants:
+        return [str(i) for i in range(variants)]
+    return [branch for branch, _ in generator.dispatch.branch_rules.get(template_key, ())] + ["default"]
+
+
+def report():
+    """Text vs voice speaking time for every intent and branch"""
+    from mru_chatbot_system import MRUKnowledgeBase, ResponseGenerator
+
+    generator = ResponseGenerator(MRUKnowledgeBase())
+    print(f"📊 Estimated speaking time at {SPEECH_RATE_WPM} wpm (seconds)\n")
+    print(f"{'intent/branch':<28} {'text':>7} {'voice':>7} {'all pages':>10} {'pages':>6} {'saved':>7}")
+    totals = {}
+    for template_key in generator.dispatch.renderers:
+        for branch in branches(generator, template_key):
+            text = speaking_seconds(generator.render_response(template_key, branch))
+            pages = generator.render_voice(template_key, branch)
+            first = speaking_seconds(pages[0])
+            everything = sum(speaking_seconds(page) for page in pages)
+            print(f"{template_key + '/' + branch:<28} {text:7.1f} {first:7.1f} {everything:10.1f} {len(pages):6d} "
+                  f"{1 - first / text if text else 0:7.0%}")
+            intent_totals = totals.setdefault(template_key, [0.0, 0.0])
+            intent_totals[0] += text
+            intent_totals[1] += first
+
+    print("\n• Per intent (first spoken page vs full text):")
+    for template_key, (text, first) in totals.items():
+        print(f"  {template_key:<16} {text:6.1f}s -> {first:5.1f}s  ({1 - first / text if text else 0:.0%} shorter)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact voice renderings of chatbot answers")
+    parser.add_argument("command", choices=["report"])
+    parser.parse_args()
+    report()
+
+
+if __name__ == "__main__":
+    main()